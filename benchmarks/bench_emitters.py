@@ -0,0 +1,71 @@
+"""Compares the default output generation (via Pydantic models) with the native one.
+
+Usage: uv run python benchmarks/bench_emitters.py [-r REPEAT] [YANG_FILE [PYDANTIFY_ARGS...]]
+
+Pass `-j` as a pydantify argument to compare the JSON schema output.
+
+Runs pydantify in a fresh process per build and reports the median wall time of the whole run
+and of the model generation alone (as logged by the plugin).
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+DEFAULT_MODEL = (
+    Path(__file__).parents[1] / "tests/examples/openconfig/openconfig-interfaces.yang"
+)
+GENERATION_TIME = re.compile(r"Output model generated in ([0-9.]+)s")
+
+
+def build(args: List[str]) -> Tuple[float, float]:
+    """Returns the total and the generation time of a single build."""
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-m", "pydantify", f"-o={out_dir}", *args],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total = time.perf_counter() - start
+    match = GENERATION_TIME.search(result.stdout)
+    return total, float(match.group(1)) if match else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("input_file", nargs="?", default=str(DEFAULT_MODEL))
+    parser.add_argument("pydantify_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    results = dict()
+    for variant, extra_args in (("default", []), ("native", ["--native"])):
+        runs = [
+            build([*extra_args, *args.pydantify_args, args.input_file])
+            for _ in range(args.repeat)
+        ]
+        results[variant] = (
+            statistics.median(r[0] for r in runs),
+            statistics.median(r[1] for r in runs),
+        )
+        print(
+            f"{variant:>18}: total {results[variant][0]:.3f}s, "
+            f"generation {results[variant][1]:.3f}s"
+        )
+    baseline, native = results["default"], results["native"]
+    print(
+        f"{'speedup':>18}: total {baseline[0] / native[0]:.1f}x, "
+        f"generation {baseline[1] / native[1]:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measures the node tree and Pydantic models built for each data type (`-d config`, `-d state`).
+
+Usage: uv run python benchmarks/data_type.py [-r REPEAT] [--input FILE] [--native]
+
+Parses the YANG module (openconfig-interfaces by default) once, then builds the node tree and the
+output models for the full, config-only and state-only output in-process, and reports the number
+of nodes built, the median build time and the peak of memory traced while building.
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from pydantify.compiler import _isolated_state, _load_modules
+from pydantify.models import ModelRoot, Node, TypeResolver
+
+DEFAULT_INPUT = (
+    Path(__file__).parents[1] / "tests/examples/openconfig/openconfig-interfaces.yang"
+)
+DATA_TYPES = {"full": None, "config": "config", "state": "state"}
+
+
+def builder(
+    input_file: Path, data_type: str | None, native: bool
+) -> Callable[[], ModelRoot]:
+    """Returns a function building the output of a parsed module."""
+    from pydantify.emitters import PythonEmitter
+
+    _, modules = _load_modules(input_file, [input_file.parent], [])
+
+    def build() -> ModelRoot:
+        Node.data_type = data_type  # type: ignore[assignment]
+        Node._name_count = dict()
+        Node._included = dict()
+        Node._shared_nodes = dict()
+        TypeResolver.reset()
+        root = ModelRoot(modules[0])
+        if native:
+            PythonEmitter(root).emit()
+        else:
+            root.to_pydantic_model()
+        return root
+
+    return build
+
+
+def measure(build: Callable[[], ModelRoot], repeat: int) -> Tuple[int, float, int]:
+    """Returns the nodes built, the median build time and the median traced peak in bytes."""
+    times = []
+    peaks = []
+    nodes = 0
+    for _ in range(repeat):
+        gc.collect()  # Drop the nodes of the previous build
+        start = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - start)
+        gc.collect()
+        nodes = sum(isinstance(o, Node) for o in gc.get_objects())
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        build()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return nodes, statistics.median(times), int(statistics.median(peaks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument(
+        "--native", action="store_true", help="Build the native Python output."
+    )
+    args = parser.parse_args()
+
+    results: Dict[str, Tuple[int, float, int]] = dict()
+    for name, data_type in DATA_TYPES.items():
+        with _isolated_state():
+            build = builder(args.input.absolute(), data_type, args.native)
+            results[name] = measure(build, args.repeat)
+    print(f"{'data type':>10} {'nodes':>7} {'time':>11} {'peak':>11}")
+    for name, (nodes, duration, peak) in results.items():
+        print(f"{name:>10} {nodes:>7} {duration * 1000:9.1f}ms {peak / 1024:8.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compares the import time of generated models with and without deferred validator building.
+
+Usage: uv run python benchmarks/import_time.py [-r REPEAT] [--input FILE] [--variant VARIANT]
+
+Generates the models of a YANG module (openconfig-interfaces by default) once per variant, then
+imports them in fresh processes and measures the time of the import, of validating the first
+instance (which builds the validators of deferred models) and of `warm_up()`.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).parents[1]
+DEFAULT_INPUT = ROOT / "tests/examples/openconfig/openconfig-interfaces.yang"
+VARIANTS = {
+    "default": [],
+    "default-deferred": ["--defer-build"],
+    "native": ["--native"],
+    "native-deferred": ["--native", "--defer-build"],
+}
+PROBE = """
+import json, sys, time
+from pydantic import BaseModel, ConfigDict, Field, RootModel  # Not part of the measured import
+start = time.perf_counter()
+from models import out
+imported = time.perf_counter()
+out.Model.model_validate({})
+validated = time.perf_counter()
+warm_up = 0.0
+if hasattr(out, "warm_up"):
+    start_warm_up = time.perf_counter()
+    out.warm_up(background=False)
+    warm_up = time.perf_counter() - start_warm_up
+print(json.dumps({"import": imported - start, "first validation": validated - imported, "warm_up": warm_up}))
+"""
+METRICS = ("import", "first validation", "warm_up")
+
+
+def generate(input_file: Path, directory: Path, args: List[str]) -> None:
+    """Generates the models into `directory/models/out.py`."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pydantify",
+            f"-o={directory / 'models'}",
+            *args,
+            str(input_file),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def measure(directory: Path, repeat: int) -> Dict[str, float]:
+    """Returns the median of each metric over `repeat` fresh processes."""
+    runs = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", PROBE],
+                cwd=directory,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return {metric: statistics.median(r[metric] for r in runs) for metric in METRICS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument(
+        "--variant",
+        action="append",
+        choices=VARIANTS.keys(),
+        help="Output variant to compare, can be repeated. Defaults to all.",
+    )
+    args = parser.parse_args()
+
+    print(f"{'variant':>18} " + " ".join(f"{m:>17}" for m in METRICS))
+    for variant in args.variant or list(VARIANTS.keys()):
+        with tempfile.TemporaryDirectory() as directory:
+            generate(args.input, Path(directory), VARIANTS[variant])
+            result = measure(Path(directory), args.repeat)
+        print(
+            f"{variant:>18} " + " ".join(f"{result[m] * 1000:15.1f}ms" for m in METRICS)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Measures the throughput of the streaming NETCONF XML serializer and parser.
+
+Usage: uv run python benchmarks/netconf_xml.py [-r REPEAT] [-n INTERFACES] [-s SUBINTERFACES]
+
+Generates the models of openconfig-interfaces, builds a configuration with many interfaces and
+subinterfaces, and reports the median time, list entries and bytes per second of writing it with
+`model_write_xml`, of building an element tree with `model_dump_xml` and of reading it back with
+`model_validate_xml`, and of `model_dump_json(exclude_defaults=True, by_alias=True)` and
+`model_validate_json` for reference.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Tuple
+
+import pydantify
+from pydantify.utility.netconf import (
+    model_dump_xml,
+    model_validate_xml,
+    model_write_xml,
+)
+
+INPUT = (
+    Path(__file__).parents[1] / "tests/examples/openconfig/openconfig-interfaces.yang"
+)
+
+
+def load_models() -> ModuleType:
+    """Generates and imports the native models of openconfig-interfaces."""
+    module = ModuleType("openconfig_interfaces")
+    sys.modules[module.__name__] = module
+    exec(pydantify.compile(INPUT, native=True), module.__dict__)
+    return module
+
+
+def build_config(models: ModuleType, interfaces: int, subinterfaces: int) -> Any:
+    """Returns a `Model` with `interfaces` interfaces of `subinterfaces` subinterfaces each."""
+    return models.Model.model_validate(
+        {
+            "openconfig-interfaces:interfaces": {
+                "interface": [
+                    {
+                        "name": f"Ethernet{i}",
+                        "config": {
+                            "name": f"Ethernet{i}",
+                            "type": "ethernetCsmacd",
+                            "description": f"Uplink {i}",
+                            "mtu": 9000,
+                            "enabled": i % 2 == 0,
+                        },
+                        "subinterfaces": {
+                            "subinterface": [
+                                {
+                                    "index": s,
+                                    "config": {"index": s, "description": f"VLAN {s}"},
+                                }
+                                for s in range(1, subinterfaces + 1)
+                            ]
+                        },
+                    }
+                    for i in range(interfaces)
+                ]
+            }
+        }
+    )
+
+
+def measure(serialize: Callable[[], Any], repeat: int) -> float:
+    """Returns the median time of `serialize`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-n", "--interfaces", type=int, default=2000)
+    parser.add_argument("-s", "--subinterfaces", type=int, default=10)
+    args = parser.parse_args()
+
+    model = build_config(load_models(), args.interfaces, args.subinterfaces)
+    entries = args.interfaces * (1 + args.subinterfaces)
+    output = BytesIO()
+    model_write_xml(model, output)
+    xml = output.getvalue()
+    json = model.model_dump_json(exclude_defaults=True, by_alias=True)
+    xml_size = len(xml)
+    json_size = len(json)
+
+    def write_file() -> None:
+        with open(os.devnull, "wb") as output:
+            model_write_xml(model, output)
+
+    serializers: Dict[str, Tuple[Callable[[], Any], int]] = {
+        "model_write_xml": (lambda: model_write_xml(model, BytesIO()), xml_size),
+        "model_write_xml (file)": (write_file, xml_size),
+        "model_dump_xml": (lambda: model_dump_xml(model), xml_size),
+        "model_dump_json": (
+            lambda: model.model_dump_json(exclude_defaults=True, by_alias=True),
+            json_size,
+        ),
+        "model_validate_xml": (
+            lambda: model_validate_xml(type(model), xml),
+            xml_size,
+        ),
+        "model_validate_json": (
+            lambda: type(model).model_validate_json(json),
+            json_size,
+        ),
+    }
+    print(f"{entries} list entries, {xml_size / 1e6:.1f}MB of XML")
+    print(f"{'method':>24} {'time':>11} {'entries/s':>11} {'MB/s':>7}")
+    for name, (serialize, size) in serializers.items():
+        duration = measure(serialize, args.repeat)
+        print(
+            f"{name:>24} {duration * 1000:9.1f}ms {entries / duration:11.0f}"
+            f" {size / duration / 1e6:7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Load-tests pushing generated models to a fleet of fake RESTCONF devices.
+
+Usage: uv run python benchmarks/restconf_push.py [-d DEVICES] [-j JOBS] [-w WORKERS] [-p PER_DEVICE] [-l LATENCY]
+
+Starts fake devices in a separate process, each an HTTP server answering every request with 204
+after `LATENCY` milliseconds, and pushes a small openconfig-interfaces configuration to them with
+`RestconfClient.push`, one `PATCH` per job. Reports the requests per second overall and per second
+of the run, to show whether the rate is sustained, and the median and 99th percentile latency.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from types import ModuleType
+from typing import Any, List, Tuple
+
+import pydantify
+from pydantify.utility import RestconfClient, RestconfJob
+
+INPUT = (
+    Path(__file__).parents[1] / "tests/examples/openconfig/openconfig-interfaces.yang"
+)
+
+
+class DeviceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_PATCH(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_):
+        pass
+
+
+def serve_devices(devices: int, latency: float, ports: Any) -> None:
+    """Serves `devices` fake devices and sends their ports to `ports`, until terminated."""
+    DeviceHandler.latency = latency
+    servers = [
+        ThreadingHTTPServer(("127.0.0.1", 0), DeviceHandler) for _ in range(devices)
+    ]
+    for server in servers:
+        server.daemon_threads = True
+        Thread(target=server.serve_forever, daemon=True).start()
+    ports.put([server.server_address[1] for server in servers])
+    while True:
+        time.sleep(3600)
+
+
+def build_config() -> Any:
+    """Returns a `Model` with a single interface, as pushed to each device."""
+    module = ModuleType("openconfig_interfaces")
+    sys.modules[module.__name__] = module
+    exec(pydantify.compile(INPUT, native=True), module.__dict__)
+    return module.Model.model_validate(
+        {
+            "openconfig-interfaces:interfaces": {
+                "interface": [
+                    {
+                        "name": "Ethernet1",
+                        "config": {
+                            "name": "Ethernet1",
+                            "type": "ethernetCsmacd",
+                            "description": "Uplink",
+                            "mtu": 9000,
+                        },
+                    }
+                ]
+            }
+        }
+    )
+
+
+async def push(
+    client: RestconfClient, jobs: List[RestconfJob], per_device: int
+) -> Tuple[List[float], List[float]]:
+    """Pushes `jobs` and returns the time each one completed at and the latency of each."""
+    completed = []
+    latencies = []
+    async for result in client.push(jobs, per_device=per_device):
+        if result.response is None or not result.response.ok:
+            raise RuntimeError(f"{result.job.url}: {result.error or result.response}")
+        completed.append(time.perf_counter())
+        latencies.append(result.response.elapsed.total_seconds())
+    return completed, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-d", "--devices", type=int, default=50)
+    parser.add_argument("-j", "--jobs", type=int, default=20000)
+    parser.add_argument("-w", "--workers", type=int, default=64)
+    parser.add_argument("-p", "--per-device", type=int, default=2)
+    parser.add_argument("-l", "--latency", type=float, default=5, help="milliseconds")
+    args = parser.parse_args()
+
+    ports = multiprocessing.Queue()
+    devices = multiprocessing.Process(
+        target=serve_devices,
+        args=(args.devices, args.latency / 1000, ports),
+        daemon=True,
+    )
+    devices.start()
+    urls = [f"http://127.0.0.1:{port}" for port in ports.get()]
+    model = build_config()
+    jobs = [
+        RestconfJob(urls[i % len(urls)], "openconfig-interfaces:interfaces", model)
+        for i in range(args.jobs)
+    ]
+
+    try:
+        with RestconfClient(
+            workers=args.workers, connections_per_host=args.per_device, retries=0
+        ) as client:
+            start = time.perf_counter()
+            completed, latencies = asyncio.run(push(client, jobs, args.per_device))
+            duration = time.perf_counter() - start
+    finally:
+        devices.terminate()
+
+    per_second = [0] * (int(duration) + 1)
+    for moment in completed:
+        per_second[int(moment - start)] += 1
+    full_seconds = per_second[:-1] or per_second
+    print(
+        f"{args.jobs} requests to {args.devices} devices in {duration:.1f}s:"
+        f" {args.jobs / duration:.0f} requests/s"
+    )
+    print(
+        f"requests/s per second: min {min(full_seconds)},"
+        f" median {statistics.median(full_seconds):.0f}, max {max(full_seconds)}"
+    )
+    print(
+        f"latency: median {statistics.median(latencies) * 1000:.1f}ms,"
+        f" p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
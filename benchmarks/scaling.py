@@ -0,0 +1,131 @@
+"""Measures how generation time and output size grow with the number of YANG data nodes.
+
+Usage: uv run python benchmarks/scaling.py [--sizes N,N,...] [--variant VARIANT] [-o RESULTS] [SHAPE OPTIONS]
+
+Builds synthetic modules (see `synthetic.py`) of increasing size and records the time of every
+build phase and the output size. For each phase, the exponent k of `time ~ nodes^k` is fitted
+over the sizes; phases with k clearly above 1 scale super-linearly. Larger sizes of a variant are
+skipped once a build exceeds `--timeout`. Results are written as JSON and CSV for plotting.
+"""
+
+import argparse
+import csv
+import json
+import math
+import tempfile
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Any, Dict, List
+
+from suite import VARIANTS, Case, measure
+from synthetic import Shape, write_module
+
+DEFAULT_SIZES = "100,300,1000,3000,10000,30000,100000"
+PHASES = [
+    "pyang parse",
+    "pyang validate",
+    "node tree",
+    "create_model",
+    "json schema",
+    "datamodel-code-generator",
+    "format",
+    "native emit",
+    "generate",
+]
+SUPER_LINEAR = 1.15
+
+
+def fit_exponent(points: List[tuple]) -> float:
+    """Returns the slope of the least squares line through the points in log-log space."""
+    logs = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(logs) < 2:
+        return float("nan")
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    var_x = sum((x - mean_x) ** 2 for x, _ in logs)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in logs)
+    return cov / var_x if var_x > 0 else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--variant",
+        action="append",
+        choices=VARIANTS.keys(),
+        help="Output variant to build, can be repeated. Defaults to default and native.",
+    )
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument(
+        "-o", "--output", type=Path, default=Path("scaling.json"), help="JSON results."
+    )
+    for field in fields(Shape):
+        if field.name == "containers":
+            continue
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=int if isinstance(field.default, bool) else type(field.default),
+            default=field.default,
+        )
+    args = parser.parse_args()
+    shape = Shape(**{k: v for k, v in vars(args).items() if k in asdict(Shape())})
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    rows: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for variant in args.variant or ["default", "native"]:
+            for size in sizes:
+                file = write_module(Path(directory), size, shape)
+                nodes = shape.with_nodes(size).nodes()
+                try:
+                    result = measure(
+                        Case(file.stem, file), VARIANTS[variant], args.timeout
+                    )
+                except TimeoutError:
+                    print(
+                        f"{variant:>12} {nodes:>7} nodes: over {args.timeout}s, skipping larger sizes"
+                    )
+                    break
+                rows.append(
+                    {
+                        "variant": variant,
+                        "nodes": nodes,
+                        "wall": result.wall,
+                        "peak_rss": result.peak_rss,
+                        "output_bytes": result.output_bytes,
+                        **{p: result.phases.get(p, 0.0) for p in PHASES},
+                    }
+                )
+                print(
+                    f"{variant:>12} {nodes:>7} nodes: wall {result.wall:8.3f}s, "
+                    f"generate {result.generate:8.3f}s, output {result.output_bytes / 1024:8.0f} KiB"
+                )
+
+    exponents: Dict[str, Dict[str, float]] = dict()
+    for variant in {row["variant"] for row in rows}:
+        variant_rows = [row for row in rows if row["variant"] == variant]
+        exponents[variant] = {
+            metric: fit_exponent([(r["nodes"], r[metric]) for r in variant_rows])
+            for metric in ["wall", "output_bytes", *PHASES]
+            if any(r[metric] > 0 for r in variant_rows)
+        }
+        print(f"\n{variant}: time ~ nodes^k")
+        for metric, k in exponents[variant].items():
+            flag = "  <- super-linear" if k > SUPER_LINEAR else ""
+            print(f"{metric:>26}: k = {k:5.2f}{flag}")
+
+    args.output.write_text(
+        json.dumps(
+            {"shape": asdict(shape), "results": rows, "exponents": exponents}, indent=2
+        )
+    )
+    with open(args.output.with_suffix(".csv"), "w", newline="") as fd:
+        writer = csv.DictWriter(fd, fieldnames=list(rows[0].keys()) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nWrote {args.output} and {args.output.with_suffix('.csv')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Times end-to-end generation of the bundled examples and synthetic models, with a regression gate.
+
+Usage: uv run python benchmarks/suite.py [-r REPEAT] [-k PATTERN] [--history FILE] [--check PERCENT]
+
+Every build runs in a fresh process and is measured by wall time, generation time (from the
+`--profile` report) and peak resident memory. The median of the repeated builds is appended to a
+JSON history. With `--check`, the script exits with 1 if a case got more than PERCENT slower than
+the median of the last `--baseline` runs in the history (before appending the current run).
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from synthetic import write_module
+
+from pydantify.build import ModuleGraph, scan_file
+
+ROOT = Path(__file__).parents[1]
+EXAMPLES = ROOT / "tests/examples"
+DEFAULT_HISTORY = Path(__file__).parent / "history.json"
+VARIANTS = {
+    "default": [],
+    "native": ["--native"],
+    "json": ["-j"],
+    "json-native": ["-j", "--native"],
+}
+METRICS = ("wall", "generate", "peak_rss")
+
+
+class Case(NamedTuple):
+    name: str
+    input_file: Path
+
+
+class Measurement(NamedTuple):
+    wall: float
+    """Seconds from process start to exit."""
+    generate: float
+    """Seconds spent generating the output (excluding startup, imports and pyang)."""
+    peak_rss: int
+    """Peak resident memory in bytes."""
+    phases: Dict[str, float]
+    """Total seconds per phase, from the `--profile` report."""
+    output_bytes: int
+    """Size of the output file."""
+
+
+def example_cases() -> List[Case]:
+    """Returns one case per example, compiling the module with the most imports."""
+    cases = []
+    for directory in sorted(p for p in EXAMPLES.iterdir() if p.is_dir()):
+        infos = [scan_file(f) for f in sorted(directory.glob("*.yang"))]
+        entries = ModuleGraph(i for i in infos if i is not None).entry_modules()
+        if entries:
+            cases.append(Case(directory.name, entries[0].file))
+    return cases
+
+
+def synthetic_cases(sizes: List[int], directory: Path) -> List[Case]:
+    return [Case(f"synthetic-{n}", write_module(directory, n)) for n in sizes]
+
+
+def measure(
+    case: Case, args: List[str], timeout: Optional[float] = None
+) -> Measurement:
+    """Builds a case once in a fresh process. Raises `TimeoutError` if it takes longer than `timeout`."""
+    with tempfile.TemporaryDirectory() as out_dir:
+        report_file = Path(out_dir) / "profile.json"
+        command = [
+            sys.executable,
+            "-m",
+            "pydantify",
+            f"-o={out_dir}",
+            f"--profile={report_file}",
+            *args,
+            str(case.input_file),
+        ]
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        timer = threading.Timer(timeout, process.kill) if timeout else None
+        if timer is not None:
+            timer.start()
+        assert process.stdout is not None
+        output = process.stdout.read()
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if timer is not None:
+            timer.cancel()
+            if timeout is not None and wall >= timeout:
+                raise TimeoutError(f"Building {case.name} took over {timeout}s.")
+        if process.returncode != 0 or not report_file.exists():
+            raise RuntimeError(f"Building {case.name} failed:\n{output.decode()}")
+        report = json.loads(report_file.read_text())
+        output_bytes = sum(
+            f.stat().st_size for f in Path(out_dir).glob("out.*") if f.is_file()
+        )
+    generate = report["phases"].get("generate", {}).get("total", float("nan"))
+    # ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    phases = {name: phase["total"] for name, phase in report["phases"].items()}
+    return Measurement(wall, generate, usage.ru_maxrss * scale, phases, output_bytes)
+
+
+def run(cases: List[Case], variants: List[str], repeat: int) -> Dict[str, Any]:
+    """Returns the median wall and generation time and the highest peak memory per case."""
+    results: Dict[str, Any] = dict()
+    for case in cases:
+        for variant in variants:
+            runs = [measure(case, VARIANTS[variant]) for _ in range(repeat)]
+            key = f"{case.name}/{variant}"
+            results[key] = {
+                "wall": statistics.median(r.wall for r in runs),
+                "generate": statistics.median(r.generate for r in runs),
+                "peak_rss": max(r.peak_rss for r in runs),
+            }
+            print(
+                f"{key:>40}: wall {results[key]['wall']:7.3f}s, "
+                f"generate {results[key]['generate']:7.3f}s, "
+                f"peak {results[key]['peak_rss'] / 2**20:7.1f} MiB"
+            )
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline(
+    history: List[Dict[str, Any]], key: str, metric: str, runs: int
+) -> Optional[float]:
+    """Returns the median of `metric` over the last `runs` recorded results of a case."""
+    values = [
+        entry["results"][key][metric]
+        for entry in history
+        if key in entry["results"] and entry["machine"] == platform.node()
+    ][-runs:]
+    return statistics.median(values) if values else None
+
+
+def check(
+    history: List[Dict[str, Any]],
+    results: Dict[str, Any],
+    metric: str,
+    percent: float,
+    runs: int,
+) -> List[str]:
+    """Returns a message for each case that got more than `percent` worse than its baseline."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline(history, key, metric, runs)
+        if reference is None or reference == 0:
+            continue
+        change = (result[metric] / reference - 1) * 100
+        if change > percent:
+            regressions.append(
+                f"{key}: {metric} {result[metric]:.3f} vs. {reference:.3f} (+{change:.1f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument(
+        "-k", "--filter", help="Only run cases whose name matches this regex."
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        choices=VARIANTS.keys(),
+        help="Output variant to build, can be repeated. Defaults to default and native.",
+    )
+    parser.add_argument(
+        "--synthetic",
+        default="100,1000",
+        help="Comma separated sizes (data nodes) of synthetic models. Empty for none.",
+    )
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="Do not append the results to the history.",
+    )
+    parser.add_argument(
+        "--check",
+        type=float,
+        metavar="PERCENT",
+        help="Fail if a case got more than PERCENT slower than its baseline.",
+    )
+    parser.add_argument("--metric", choices=METRICS, default="wall")
+    parser.add_argument(
+        "--baseline",
+        type=int,
+        default=5,
+        help="Number of recorded runs (of this machine) the baseline is the median of.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        sizes = [int(s) for s in args.synthetic.split(",") if s.strip()]
+        cases = example_cases() + synthetic_cases(sizes, Path(synthetic_dir))
+        if args.filter:
+            cases = [c for c in cases if re.search(args.filter, c.name)]
+        results = run(cases, args.variant or ["default", "native"], args.repeat)
+
+    history: List[Dict[str, Any]] = (
+        json.loads(args.history.read_text()) if args.history.exists() else []
+    )
+    regressions = (
+        check(history, results, args.metric, args.check, args.baseline)
+        if args.check is not None
+        else []
+    )
+    if not args.no_record:
+        history.append(
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "machine": platform.node(),
+                "python": platform.python_version(),
+                "repeat": args.repeat,
+                "results": results,
+            }
+        )
+        args.history.write_text(json.dumps(history, indent=2))
+
+    if regressions:
+        print(f"Regressions of more than {args.check}%:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
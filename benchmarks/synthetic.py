@@ -0,0 +1,207 @@
+"""Writes synthetic YANG modules of controllable size and shape, to measure how pydantify scales.
+
+Usage: uv run python benchmarks/synthetic.py [-o OUTPUT_DIR] [SHAPE OPTIONS] NODES [NODES...]
+
+Every module has `containers` top-level containers, each nesting `depth` levels deep. The
+innermost container holds plain leaves, a leaf of a typedef chain, a leaf of a union typedef, a
+list with `keys` key leaves, a leafref to the next container's subtree and the leaves of one of
+the shared groupings, each used by `grouping_reuse` containers. Given a number of data nodes, the
+number of containers is chosen to match it; the other options set the shape.
+"""
+
+import argparse
+import math
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import List
+
+LEAF_TYPES = ["string", "int32", "boolean", "uint8", "decimal64"]
+UNION_MEMBER_TYPES = [
+    "int8",
+    "string",
+    "boolean",
+    "uint32",
+    "decimal64 { fraction-digits 2; }",
+    "enumeration { enum up; enum down; }",
+    "int64",
+    "binary",
+]
+
+
+@dataclass(frozen=True)
+class Shape:
+    containers: int = 10
+    """Number of top-level containers."""
+    depth: int = 2
+    """Nesting levels of every top-level container, including itself."""
+    leaves: int = 5
+    """Plain leaves in the innermost container."""
+    keys: int = 1
+    """Key leaves of the list in the innermost container. 0 for no list."""
+    union_members: int = 3
+    """Member types of the union typedef. 0 for no union leaf."""
+    typedef_chain: int = 3
+    """Length of the chain of typedefs deriving from each other. 0 for no typedef leaf."""
+    grouping_leaves: int = 3
+    """Leaves of each grouping. 0 for no groupings."""
+    grouping_reuse: int = 5
+    """Number of containers using the same grouping."""
+    leafrefs: bool = True
+    """Whether each container references a leaf of the next one."""
+
+    def nodes_per_container(self) -> int:
+        nodes = self.depth + self.leaves + self.grouping_leaves
+        nodes += 1 if self.keys > 0 else 0  # The list
+        nodes += self.keys + (1 if self.keys > 0 else 0)  # Its keys and a value
+        nodes += 1 if self.union_members > 0 else 0
+        nodes += 1 if self.typedef_chain > 0 else 0
+        nodes += 1 if self.leafrefs and self.containers > 1 and self.leaves > 0 else 0
+        return nodes
+
+    def nodes(self) -> int:
+        """Returns the number of data nodes of the module."""
+        return self.containers * self.nodes_per_container()
+
+    def with_nodes(self, nodes: int) -> "Shape":
+        """Returns the shape with as many containers as needed for about `nodes` data nodes."""
+        containers = max(2, round(nodes / self.nodes_per_container()))
+        return replace(self, containers=containers)
+
+
+def type_statement(yang_type: str) -> str:
+    return f"type {yang_type}" if yang_type.endswith("}") else f"type {yang_type};"
+
+
+def typedefs(shape: Shape) -> List[str]:
+    lines = []
+    for i in range(shape.typedef_chain):
+        base = "string { length 1..64; }" if i == 0 else f"chain-{i - 1}"
+        lines += [f"  typedef chain-{i} {{", f"    {type_statement(base)}", "  }"]
+    if shape.union_members > 0:
+        lines += ["  typedef union-type {", "    type union {"]
+        for i in range(shape.union_members):
+            member = UNION_MEMBER_TYPES[i % len(UNION_MEMBER_TYPES)]
+            lines.append(f"      {type_statement(member)}")
+        lines += ["    }", "  }"]
+    return lines
+
+
+def groupings(shape: Shape) -> List[str]:
+    if shape.grouping_leaves == 0:
+        return []
+    lines = []
+    for g in range(math.ceil(shape.containers / shape.grouping_reuse)):
+        lines.append(f"  grouping group-{g} {{")
+        for i in range(shape.grouping_leaves):
+            lines += leaf(f"group-{g}-leaf-{i}", g + i, "    ")
+        lines.append("  }")
+    return lines
+
+
+def leaf(name: str, index: int, indent: str) -> List[str]:
+    yang_type = LEAF_TYPES[index % len(LEAF_TYPES)]
+    if yang_type == "decimal64":
+        return [
+            f"{indent}leaf {name} {{",
+            f"{indent}  type decimal64 {{ fraction-digits 2; }}",
+            f"{indent}}}",
+        ]
+    return [f"{indent}leaf {name} {{ type {yang_type}; }}"]
+
+
+def leaf_path(shape: Shape, container: int) -> str:
+    """Returns the absolute path of the first plain leaf of a container."""
+    levels = [f"c-{container}"] + [f"level-{d}" for d in range(1, shape.depth)]
+    return "".join(f"/syn:{level}" for level in [*levels, "leaf-0"])
+
+
+def container(shape: Shape, c: int) -> List[str]:
+    lines = []
+    indent = "  "
+    for d in range(shape.depth):
+        lines.append(
+            f"{indent}container {'c-' + str(c) if d == 0 else f'level-{d}'} {{"
+        )
+        indent += "  "
+
+    for i in range(shape.leaves):
+        lines += leaf(f"leaf-{i}", c + i, indent)
+    if shape.typedef_chain > 0:
+        lines.append(
+            f"{indent}leaf chained {{ type chain-{shape.typedef_chain - 1}; }}"
+        )
+    if shape.union_members > 0:
+        lines.append(f"{indent}leaf union {{ type union-type; }}")
+    if shape.leafrefs and shape.containers > 1 and shape.leaves > 0:
+        target = leaf_path(shape, (c + 1) % shape.containers)
+        lines += [
+            f"{indent}leaf reference {{",
+            f'{indent}  type leafref {{ path "{target}"; }}',
+            f"{indent}}}",
+        ]
+    if shape.keys > 0:
+        keys = [f"key-{k}" for k in range(shape.keys)]
+        lines.append(f"{indent}list entry {{")
+        lines.append(f'{indent}  key "{" ".join(keys)}";')
+        for k, key in enumerate(keys):
+            lines += leaf(key, k, f"{indent}  ")
+        lines.append(f"{indent}  leaf value {{ type string; }}")
+        lines.append(f"{indent}}}")
+    if shape.grouping_leaves > 0:
+        lines.append(f"{indent}uses group-{c // shape.grouping_reuse};")
+
+    for d in range(shape.depth):
+        indent = indent[:-2]
+        lines.append(f"{indent}}}")
+    return lines
+
+
+def module_text(name: str, shape: Shape) -> str:
+    """Returns the YANG module of the given shape."""
+    lines = [
+        f"module {name} {{",
+        "  yang-version 1.1;",
+        f'  namespace "urn:pydantify:synthetic:{name}";',
+        "  prefix syn;",
+        *typedefs(shape),
+        *groupings(shape),
+    ]
+    for c in range(shape.containers):
+        lines += container(shape, c)
+    lines += ["}", ""]
+    return "\n".join(lines)
+
+
+def write_module(output_dir: Path, nodes: int, shape: Shape = Shape()) -> Path:
+    """Writes a module with about `nodes` data nodes to `output_dir`. Returns its file."""
+    name = f"synthetic-{nodes}"
+    file = output_dir / f"{name}.yang"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    file.write_text(module_text(name, shape.with_nodes(nodes)))
+    return file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output-dir", default=".")
+    for field in fields(Shape):
+        if field.name == "containers":
+            continue
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=int if isinstance(field.default, bool) else type(field.default),
+            default=field.default,
+        )
+    parser.add_argument("nodes", type=int, nargs="+")
+    args = parser.parse_args()
+
+    shape = Shape(
+        **{k: v for k, v in vars(args).items() if k in asdict(Shape()).keys()}
+    )
+    for nodes in args.nodes:
+        file = write_module(Path(args.output_dir), nodes, shape)
+        print(f"{file}: {shape.with_nodes(nodes).nodes()} data nodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+from .compiler import compile
+from .exceptions import CompilationError
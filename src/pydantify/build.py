@@ -0,0 +1,467 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from argparse import ArgumentParser
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Optional, Set
+
+from .exceptions import CompilationError
+from .options import add_compile_options
+
+if TYPE_CHECKING:
+    from .watch import WatchTarget
+
+logger = logging.getLogger("pydantify")
+
+DATA_KEYWORDS = {
+    "container",
+    "list",
+    "leaf",
+    "leaf-list",
+    "choice",
+    "anydata",
+    "anyxml",
+    "uses",
+}
+"""Top-level statements that add data nodes to a module's own tree."""
+
+
+@dataclass
+class ModuleInfo:
+    """Header information of a YANG file, as needed to plan a build."""
+
+    name: str
+    file: Path
+    submodule: bool = False
+    revision: str = ""
+    imports: List[str] = field(default_factory=list)
+    includes: List[str] = field(default_factory=list)
+    has_data: bool = False
+
+
+@dataclass
+class BuildOptions:
+    output_dir: Path
+    search_paths: List[Path] = field(default_factory=list)
+    json_schema: bool = False
+    native: bool = False
+    standalone: bool = False
+    data_type: Literal["config", "state"] | None = None
+    strip_namespace: bool = False
+    share_groupings: bool = False
+    serialization_plans: bool = False
+    trim_path: Optional[List[str]] = None
+    defer_build: bool = False
+    shared_types: bool = False
+    package: bool = False
+    cache_dir: Optional[Path] = None
+
+    def compile_options(self) -> Dict[str, Any]:
+        """Returns the keyword arguments of `pydantify.compiler._compile()`."""
+        return dict(
+            search_paths=self.search_paths,
+            trim_path=self.trim_path,
+            data_type=self.data_type,
+            strip_namespace=self.strip_namespace,
+            share_groupings=self.share_groupings,
+            serialization_plans=self.serialization_plans,
+            defer_build=self.defer_build,
+            standalone=self.standalone,
+            json_schema=self.json_schema,
+            native=self.native,
+            shared_types=self.shared_types,
+            package=self.package,
+            cache_dir=self.cache_dir,
+        )
+
+
+@dataclass
+class BuildResult:
+    module: str
+    input_file: Path
+    output_file: Optional[Path] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    sources: Set[Path] = field(default_factory=set)
+    """All YANG files the module depends on, empty if it failed to compile."""
+    type_modules: Dict[str, Path] = field(default_factory=dict)
+    """Modules whose shared type module the output imports, with their YANG file."""
+
+
+def scan_file(file: Path) -> Optional[ModuleInfo]:
+    """Parses a YANG file (without validating it) and returns its header information."""
+    from pyang.context import Context
+    from pyang.repository import Repository
+    from pyang.yang_parser import YangParser
+
+    class NoRepository(Repository):
+        def get_modules_and_revisions(self, ctx):
+            return []
+
+    ctx = Context(NoRepository())
+    try:
+        stm = YangParser().parse(ctx, str(file), file.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f'Skipping "{file}": {e}')
+        return None
+    if stm is None or stm.keyword not in ("module", "submodule"):
+        logger.warning(f'Skipping "{file}": not a YANG module.')
+        return None
+    revisions = sorted((s.arg for s in stm.search("revision")), reverse=True)
+    return ModuleInfo(
+        name=stm.arg,
+        file=file,
+        submodule=stm.keyword == "submodule",
+        revision=revisions[0] if revisions else "",
+        imports=[s.arg for s in stm.search("import")],
+        includes=[s.arg for s in stm.search("include")],
+        has_data=any(s.keyword in DATA_KEYWORDS for s in stm.substmts),
+    )
+
+
+class ModuleGraph:
+    """Import and include dependencies between the modules of a catalog."""
+
+    def __init__(self, infos: Iterable[ModuleInfo]):
+        """Keeps the newest revision of each module.
+
+        :raises CompilationError: If different files define the newest revision of a module.
+        """
+        self.modules: Dict[str, ModuleInfo] = dict()
+        duplicates: Dict[str, List[Path]] = dict()
+        for info in infos:
+            known = self.modules.get(info.name, None)
+            if known is None or info.revision > known.revision:
+                self.modules[info.name] = info
+                duplicates.pop(info.name, None)
+            elif (
+                info.revision == known.revision
+                and info.file.read_bytes() != known.file.read_bytes()
+            ):
+                duplicates.setdefault(info.name, [known.file]).append(info.file)
+        if duplicates:
+            raise CompilationError(
+                "Several files define the same revision of a module:",
+                [
+                    f'"{name}": ' + ", ".join(f'"{file}"' for file in files)
+                    for name, files in sorted(duplicates.items())
+                ],
+            )
+
+    def dependencies(self, name: str) -> Set[str]:
+        """Returns all modules `name` depends on, directly or transitively."""
+        seen: Set[str] = set()
+        pending = [name]
+        while pending:
+            info = self.modules.get(pending.pop(), None)
+            if info is None:
+                continue
+            for dependency in (*info.imports, *info.includes):
+                if dependency not in seen:
+                    seen.add(dependency)
+                    pending.append(dependency)
+        seen.discard(name)
+        return seen
+
+    def missing(self) -> Set[str]:
+        """Returns the imported or included modules not found in the catalog."""
+        return {
+            dependency
+            for info in self.modules.values()
+            for dependency in (*info.imports, *info.includes)
+            if dependency not in self.modules
+        }
+
+    def entry_modules(self) -> List[ModuleInfo]:
+        """Returns the modules defining data nodes, those with the most dependencies first."""
+        entries = [
+            info
+            for info in self.modules.values()
+            if not info.submodule
+            and (
+                info.has_data
+                or any(
+                    self.modules[sub].has_data
+                    for sub in info.includes
+                    if sub in self.modules
+                )
+            )
+        ]
+        # Start long compilations first, so they don't end up alone on the last worker
+        return sorted(
+            entries, key=lambda info: (-len(self.dependencies(info.name)), info.name)
+        )
+
+
+def output_file_name(module: str, json_schema: bool) -> str:
+    """Returns the output file name of a module, a valid Python module name for Pydantic output."""
+    if json_schema:
+        return f"{module}.json"
+    return f'{re.sub(r"[^0-9a-zA-Z_]", "_", module)}.py'
+
+
+def check_output_names(entries: Iterable[ModuleInfo], json_schema: bool) -> None:
+    """Raises a `CompilationError` if several modules would be written to the same file."""
+    modules: Dict[str, List[str]] = dict()
+    for info in entries:
+        modules.setdefault(output_file_name(info.name, json_schema), []).append(
+            info.name
+        )
+    clashes = [
+        f'"{file}": ' + ", ".join(f'"{name}"' for name in sorted(names))
+        for file, names in sorted(modules.items())
+        if len(names) > 1
+    ]
+    if clashes:
+        raise CompilationError(
+            "Several modules would be written to the same output file:", clashes
+        )
+
+
+def output_file(module: str, options: BuildOptions) -> Path:
+    """Returns the output file of a module, the `__init__` of its package with `package`."""
+    file = options.output_dir / output_file_name(module, options.json_schema)
+    return file.with_suffix("") / "__init__.py" if options.package else file
+
+
+def write_output(file: Path, text: str, files: Dict[str, str]) -> None:
+    """Writes an output module, and the submodules next to it if it is a package."""
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(text)
+    for name, source in files.items():
+        (file.parent / name).write_text(source)
+
+
+def compile_module(info: ModuleInfo, options: BuildOptions) -> BuildResult:
+    """Compiles a single module and writes its output. Runs in a worker process."""
+    from .compiler import _compile
+
+    start = time.time()
+    result = BuildResult(module=info.name, input_file=info.file.absolute())
+    try:
+        compiled = _compile(info.file, **options.compile_options())
+    except CompilationError as e:
+        result.error = str(e)
+    except Exception as e:  # Keep going with the other modules
+        result.error = f"{type(e).__name__}: {e}"
+    else:
+        result.sources = compiled.sources
+        result.type_modules = compiled.type_modules
+        if compiled.models > 0:
+            file = output_file(info.name, options)
+            write_output(file, compiled.text, compiled.files)
+            result.output_file = file
+    result.duration = time.time() - start
+    return result
+
+
+def build(directory: Path, options: BuildOptions, workers: int) -> List[BuildResult]:
+    """Compiles all entry modules found in `directory` with up to `workers` processes."""
+    files = sorted(directory.rglob("*.yang"))
+    options.search_paths = [directory.absolute(), *options.search_paths]
+    os.makedirs(options.output_dir, exist_ok=True)
+    if not options.json_schema:
+        (options.output_dir / "__init__.py").touch()
+
+    executor: Executor | None = (
+        ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    )
+    try:
+        chunksize = max(1, len(files) // (workers * 4))
+        infos: Iterable[Optional[ModuleInfo]] = (
+            executor.map(scan_file, files, chunksize=chunksize)
+            if executor is not None
+            else map(scan_file, files)
+        )
+        graph = ModuleGraph(info for info in infos if info is not None)
+        for name in sorted(graph.missing()):
+            logger.warning(
+                f'Module "{name}" is imported but not part of "{directory}".'
+            )
+        entries = graph.entry_modules()
+        if options.trim_path:
+            # Trim paths start with the name of the module they select branches of
+            starts = [
+                [e for e in path.split("/") if e][:1] for path in options.trim_path
+            ]
+            entries = [
+                info
+                for info in entries
+                if any(fnmatchcase(info.name, s[0]) for s in starts if s)
+            ]
+        check_output_names(entries, options.json_schema)
+        logger.info(
+            f"Compiling {len(entries)} of {len(graph.modules)} modules with {workers} worker(s)."
+        )
+
+        results: List[BuildResult] = []
+        if executor is None:
+            pending: Iterable[BuildResult] = (
+                compile_module(info, options) for info in entries
+            )
+        else:
+            futures = [executor.submit(compile_module, i, options) for i in entries]
+            pending = (future.result() for future in as_completed(futures))
+        for result in pending:
+            if result.error is not None:
+                logger.error(f'Failed to compile "{result.module}":\n{result.error}')
+            elif result.output_file is None:
+                logger.info(f'Skipped "{result.module}", it defines no data nodes.')
+            else:
+                logger.info(f'Compiled "{result.module}" in {result.duration:.3f}s.')
+            results.append(result)
+        if options.shared_types:
+            type_modules: Dict[str, Path] = dict()
+            for result in results:
+                type_modules.update(result.type_modules)
+            write_shared_types(
+                type_modules, options.output_dir, options.search_paths, executor
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return sorted(results, key=lambda r: r.module)
+
+
+def write_shared_types(
+    modules: Dict[str, Path],
+    output_dir: Path,
+    search_paths: List[Path],
+    executor: Executor | None = None,
+) -> None:
+    """Generates the shared type modules once each, including the ones they import from."""
+    from .compiler import _compile_types
+    from .utility.model_generator import ModelGenerator
+
+    sources: Dict[str, str] = dict()
+    done: Set[str] = set()
+    pending = dict(modules)
+    while pending:
+        futures = {
+            name: (
+                executor.submit(_compile_types, file, search_paths)
+                if executor is not None
+                else None
+            )
+            for name, file in pending.items()
+        }
+        done.update(pending.keys())
+        files, pending = pending, dict()
+        for name, future in futures.items():
+            try:
+                text, imports = (
+                    future.result()
+                    if future is not None
+                    else _compile_types(files[name], search_paths)
+                )
+            except Exception as e:  # Keep the other type modules
+                logger.error(f'Failed to generate the types of "{name}":\n{e}')
+                continue
+            sources[name] = text
+            pending.update({n: f for n, f in imports.items() if n not in done})
+    ModelGenerator.write_type_modules(output_dir, sources)
+    logger.info(f"Generated {len(sources)} shared type module(s).")
+
+
+def main(argv: List[str]) -> int:
+    """Entry point of `pydantify build`. Returns the exit code."""
+    parser = ArgumentParser(
+        prog="pydantify build",
+        description="Compile every YANG module with data nodes in a directory, one output module each.",
+    )
+    parser.add_argument(
+        "directory", help="The directory to search for YANG modules (recursively)."
+    )
+    add_compile_options(parser)
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        dest="workers",
+        help="Number of modules compiled in parallel. Defaults to the number of CPUs.",
+        default=os.cpu_count() or 1,
+    )
+    parser.add_argument(
+        "-p",
+        "--path",
+        action="append",
+        dest="search_paths",
+        help="Additional directory to search for imported modules. Can be repeated.",
+        default=[],
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        dest="verbose",
+        help="Enables debug output",
+        default=False,
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        dest="watch",
+        help="Keep running and regenerate the output modules whose YANG files changed.",
+        default=False,
+    )
+    args = parser.parse_args(argv)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    for option, enabled in (
+        ("--shared-types", args.shared_types),
+        ("--package", args.package_output),
+    ):
+        if enabled and (not args.native_output or args.json_schema_output):
+            parser.error(f"{option} requires --native Pydantic output.")
+
+    options = BuildOptions(
+        output_dir=Path(args.output_dir).absolute(),
+        search_paths=[Path(p).absolute() for p in args.search_paths],
+        json_schema=args.json_schema_output,
+        native=args.native_output,
+        standalone=args.standalone,
+        data_type=args.data_type,
+        strip_namespace=args.strip_namespace,
+        share_groupings=args.share_groupings,
+        serialization_plans=args.serialization_plans,
+        trim_path=args.trim_path,
+        defer_build=args.defer_build,
+        shared_types=args.shared_types,
+        package=args.package_output,
+        cache_dir=Path(args.cache_dir).absolute() if args.cache_dir else None,
+    )
+    start = time.time()
+    try:
+        results = build(Path(args.directory), options, max(1, args.workers))
+    except CompilationError as e:
+        logger.error(str(e))
+        return 1
+    failed = [r.module for r in results if r.error is not None]
+    logger.info(
+        f"Built {len(results) - len(failed)} of {len(results)} modules in {time.time() - start:.3f}s."
+    )
+    if args.watch:
+        from .watch import Watcher
+
+        Watcher.targets = [watch_target(r, options) for r in results]
+        return Watcher.run()
+    return 1 if failed else 0
+
+
+def watch_target(result: BuildResult, options: BuildOptions) -> WatchTarget:
+    """Returns the watch target of a built module, with the sources recorded by the build."""
+    from .watch import WatchTarget, file_state
+
+    # Failed builds are retried once their input file changes
+    sources = result.sources or {result.input_file}
+    return WatchTarget(
+        input_file=result.input_file,
+        output_file=output_file(result.module, options),
+        options=options.compile_options(),
+        sources={p: file_state(p) for p in sorted(sources)},
+    )
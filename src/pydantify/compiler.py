@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .exceptions import CompilationError
+
+if TYPE_CHECKING:
+    from pyang.context import Context
+    from pyang.statements import ModSubmodStatement
+
+logger = logging.getLogger("pydantify")
+
+_lock = threading.RLock()
+_pyang_initialized = False
+
+
+def compile(
+    input_file: str | Path,
+    *,
+    search_paths: Sequence[str | Path] = (),
+    deviations: Sequence[str | Path] = (),
+    trim_path: str | Sequence[str] | None = None,
+    data_type: Literal["config", "state"] | None = None,
+    strip_namespace: bool = False,
+    share_groupings: bool = False,
+    serialization_plans: bool = False,
+    defer_build: bool = False,
+    standalone: bool = False,
+    json_schema: bool = False,
+    native: bool = False,
+    cache_dir: str | Path | None = None,
+) -> str | Dict[str, Any]:
+    """Compiles a YANG module in-process, without touching `sys.argv` or exiting.
+
+    Returns the source code of the Pydantic models, or the JSON schema as `dict` if `json_schema`
+    is set. Both are empty if the module defines no data nodes. The options match the ones of
+    the CLI; `trim_path` may be a list of paths, like repeated `-t` options. `search_paths` are
+    searched for imported modules in addition to the input file's folder, `deviations` are
+    applied like pyang's `--deviation-module`, and `cache_dir` enables the cache of parsed YANG
+    modules.
+
+    The generator keeps its state in class attributes. Each call resets them, and restores the
+    previous values afterwards, while holding a process-wide lock: calls from several threads are
+    serialized, one waits for the other to finish. Use processes to compile in parallel.
+    Raises `CompilationError` if pyang reports errors or the trim path does not exist.
+    """
+    result = _compile(
+        Path(input_file),
+        search_paths=search_paths,
+        deviations=deviations,
+        trim_path=trim_path,
+        data_type=data_type,
+        strip_namespace=strip_namespace,
+        share_groupings=share_groupings,
+        serialization_plans=serialization_plans,
+        defer_build=defer_build,
+        standalone=standalone,
+        json_schema=json_schema,
+        native=native,
+        cache_dir=cache_dir,
+    )
+    if json_schema:
+        return json.loads(result.text) if result.models > 0 else {}
+    return result.text if result.models > 0 else ""
+
+
+@dataclass
+class CompileResult:
+    text: str
+    """The output file content, as written by the CLI."""
+    models: int
+    """Number of models written, 0 if the module defines no data nodes."""
+    sources: Set[Path]
+    """All YANG files read, i.e. the module, its transitive imports and deviations."""
+    type_modules: Dict[str, Path] = field(default_factory=dict)
+    """Modules whose shared type module the output imports, by name, with their YANG file."""
+    files: Dict[str, str] = field(default_factory=dict)
+    """Submodules of a package output, by file name. `text` is the package's `__init__`."""
+
+
+def _compile(
+    input_file: Path,
+    *,
+    search_paths: Sequence[str | Path] = (),
+    deviations: Sequence[str | Path] = (),
+    trim_path: str | Sequence[str] | None = None,
+    data_type: Literal["config", "state"] | None = None,
+    strip_namespace: bool = False,
+    share_groupings: bool = False,
+    serialization_plans: bool = False,
+    defer_build: bool = False,
+    standalone: bool = False,
+    json_schema: bool = False,
+    native: bool = False,
+    shared_types: bool = False,
+    package: bool = False,
+    cache_dir: str | Path | None = None,
+) -> CompileResult:
+    input_file = input_file.absolute()
+    with _isolated_state():
+        from .models.base import Node
+        from .utility.model_generator import ModelGenerator
+        from .utility.parse_cache import ParseCache
+        from .utility.yang_sources_tracker import YANGSourcesTracker
+
+        ModelGenerator.include_verification_code = False
+        ModelGenerator.standalone = standalone
+        ModelGenerator.json_schema_output = json_schema
+        ModelGenerator.native_output = native
+        ModelGenerator.shared_types = shared_types
+        ModelGenerator.package_output = package
+        ModelGenerator.defer_build = defer_build
+        if isinstance(trim_path, str):
+            trim_path = [trim_path]
+        ModelGenerator.trim_path = list(trim_path) if trim_path else None
+        ModelGenerator.input_dir = input_file.parent
+        Node.data_type = data_type
+        Node.strip_namespace = strip_namespace
+        Node.share_groupings = share_groupings
+        Node.serialization_plans = serialization_plans
+        ParseCache.cache_dir = Path(cache_dir).absolute() if cache_dir else None
+
+        if ParseCache.enabled():
+            ParseCache.install()
+        try:
+            ctx, modules = _load_modules(
+                input_file, [input_file.parent, *search_paths], deviations
+            )
+        finally:
+            ParseCache.uninstall()
+        for module in ctx.modules.values():
+            YANGSourcesTracker.track_from_pos(module.pos)
+        sources = {Path(f) for f in YANGSourcesTracker.relevant_files()}
+
+        output = io.StringIO()
+        count = ModelGenerator.generate(ctx=ctx, modules=modules, fd=output)
+        type_modules = {
+            name: Path(module.pos.ref).absolute()
+            for name, module in ModelGenerator.type_modules.items()
+        }
+        files = dict(ModelGenerator.package_files)
+
+    return CompileResult(
+        text=output.getvalue(),
+        models=count,
+        sources=sources,
+        type_modules=type_modules,
+        files=files,
+    )
+
+
+def _compile_types(
+    module_file: Path, search_paths: Sequence[str | Path] = ()
+) -> Tuple[str, Dict[str, Path]]:
+    """Returns the shared type module of a YANG module and the modules it imports types from."""
+    module_file = module_file.absolute()
+    with _isolated_state():
+        from .emitters import TypesEmitter
+
+        _, modules = _load_modules(module_file, [module_file.parent, *search_paths], [])
+        emitter = TypesEmitter(modules[0])
+        text = emitter.emit()
+        return text, {
+            name: Path(module.pos.ref).absolute()
+            for name, module in emitter.type_modules.items()
+        }
+
+
+def _load_modules(
+    input_file: Path,
+    search_paths: Sequence[str | Path],
+    deviations: Sequence[str | Path],
+) -> Tuple[Context, List[ModSubmodStatement]]:
+    """Parses and validates the input module and its dependencies, like pyang's CLI does."""
+    import optparse
+    import os
+
+    from pyang import error, syntax
+    from pyang.context import Context
+    from pyang.repository import FileRepository
+
+    from .utility.profiler import Profiler
+
+    path = os.pathsep.join(str(Path(p).absolute()) for p in search_paths)
+    ctx = Context(FileRepository(path))
+    ctx.opts = optparse.Values({"deviations": [str(d) for d in deviations]})
+
+    Profiler.begin("pyang parse")
+    try:
+        text = input_file.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        raise CompilationError(f'Could not read "{input_file}".', [str(e)]) from e
+    match = syntax.re_filename.search(input_file.name)
+    if match is not None:
+        name, rev, in_format = match.groups()
+        module = ctx.add_module(
+            str(input_file),
+            text,
+            in_format,
+            name,
+            rev,
+            expect_failure_error=False,
+            primary_module=True,
+        )
+    else:
+        module = ctx.add_module(str(input_file), text, primary_module=True)
+
+    for deviation in deviations:
+        deviation_module = ctx.add_module(
+            str(deviation), Path(deviation).read_text(encoding="utf-8")
+        )
+        if deviation_module is not None:
+            ctx.deviation_modules.append(deviation_module)
+
+    Profiler.end("pyang parse")
+
+    modules = [module] if module is not None else []
+    with Profiler.phase("pyang validate"):
+        ctx.validate()
+        for m in modules:
+            m.prune()
+
+    errors: List[str] = []
+    for pos, tag, args in sorted(ctx.errors, key=lambda e: (e[0].ref, e[0].line)):
+        message = f"{pos.label()}: {error.err_to_str(tag, args)}"
+        if error.is_warning(error.err_level(tag)):
+            logger.warning(message)
+        else:
+            errors.append(message)
+    if errors or module is None:
+        raise CompilationError(f'Failed to compile "{input_file}".', errors)
+    return ctx, modules
+
+
+_STATE: List[Tuple[str, str, Callable[[], Any]]] = [
+    # (module, class and attribute, factory of the initial value)
+    ("pydantify.models.base", "Node._name_count", dict),
+    ("pydantify.models.base", "Node.alias_mapping", dict),
+    ("pydantify.models.base", "Node.data_type", lambda: None),
+    ("pydantify.models.base", "Node.strip_namespace", lambda: False),
+    ("pydantify.models.base", "Node.share_groupings", lambda: False),
+    ("pydantify.models.base", "Node.serialization_plans", lambda: False),
+    ("pydantify.models.base", "Node._shared_nodes", dict),
+    ("pydantify.models.base", "Node._included", dict),
+    ("pydantify.models.typeresolver", "TypeResolver._TypeResolver__mapping", dict),
+    (
+        "pydantify.utility.yang_sources_tracker",
+        "YANGSourcesTracker._YANGSourcesTracker__tracked_refs",
+        set,
+    ),
+    ("pydantify.utility.model_generator", "ModelGenerator.trim_path", lambda: None),
+    ("pydantify.utility.model_generator", "ModelGenerator.standalone", lambda: False),
+    (
+        "pydantify.utility.model_generator",
+        "ModelGenerator.json_schema_output",
+        lambda: False,
+    ),
+    (
+        "pydantify.utility.model_generator",
+        "ModelGenerator.native_output",
+        lambda: False,
+    ),
+    ("pydantify.utility.model_generator", "ModelGenerator.shared_types", lambda: False),
+    ("pydantify.utility.model_generator", "ModelGenerator.type_modules", dict),
+    (
+        "pydantify.utility.model_generator",
+        "ModelGenerator.package_output",
+        lambda: False,
+    ),
+    ("pydantify.utility.model_generator", "ModelGenerator.package_files", dict),
+    ("pydantify.utility.model_generator", "ModelGenerator.defer_build", lambda: False),
+    ("pydantify.utility.model_generator", "ModelGenerator.variants", lambda: None),
+    ("pydantify.utility.model_generator", "ModelGenerator.formats", lambda: None),
+    ("pydantify.utility.model_generator", "ModelGenerator.variant_files", lambda: None),
+    (
+        "pydantify.utility.model_generator",
+        "ModelGenerator.include_verification_code",
+        lambda: False,
+    ),
+    ("pydantify.utility.model_generator", "ModelGenerator.input_dir", Path),
+    ("pydantify.utility.parse_cache", "ParseCache.cache_dir", lambda: None),
+]
+"""Class attributes holding the configuration and bookkeeping of a single generation run."""
+
+_MISSING = object()
+
+
+@contextmanager
+def _isolated_state() -> Iterator[None]:
+    """Runs the block with fresh generator state and restores the previous state afterwards."""
+    import importlib
+
+    with _lock:
+        _init_pyang()
+        saved: List[Tuple[type, str, Any]] = []
+        for module_name, attribute, factory in _STATE:
+            class_name, name = attribute.split(".")
+            owner = getattr(importlib.import_module(module_name), class_name)
+            saved.append((owner, name, owner.__dict__.get(name, _MISSING)))
+            setattr(owner, name, factory())
+        try:
+            yield
+        finally:
+            for owner, name, value in saved:
+                if value is _MISSING:
+                    delattr(owner, name)
+                else:
+                    setattr(owner, name, value)
+
+
+def _init_pyang() -> None:
+    """Registers pyang's builtin extension grammars once, without keeping its plugins around."""
+    global _pyang_initialized
+    if _pyang_initialized:
+        return
+    from pyang import plugin
+
+    plugins = list(plugin.plugins)
+    plugin.init([])
+    plugin.plugins[:] = plugins
+    _pyang_initialized = True
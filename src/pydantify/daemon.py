@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .exceptions import CompilationError
+from .options import add_compile_options
+
+logger = logging.getLogger("pydantify")
+
+COMPILE_OPTIONS = {
+    "search_paths",
+    "deviations",
+    "trim_path",
+    "data_type",
+    "strip_namespace",
+    "share_groupings",
+    "serialization_plans",
+    "defer_build",
+    "standalone",
+    "json_schema",
+    "native",
+    "cache_dir",
+}
+"""Keyword arguments of `pydantify.compile()` accepted by the daemon."""
+
+WARM_UP_MODULE = """
+module pydantify-warm-up {
+  namespace "urn:pydantify:warm-up";
+  prefix w;
+  container c {
+    leaf l { type string; }
+  }
+}
+"""
+
+
+def default_socket_path() -> Path:
+    """Returns `$PYDANTIFY_SOCKET`, or a per-user socket in the temporary directory."""
+    path = os.environ.get("PYDANTIFY_SOCKET", None)
+    if path:
+        return Path(path)
+    return Path(tempfile.gettempdir()) / f"pydantify-{os.getuid()}.sock"
+
+
+class CompileRequestHandler(socketserver.StreamRequestHandler):
+    """Handles one request per connection: a JSON line in, a JSON line out."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:  # Connection probe, e.g. of `create_server()`
+            return
+        response: Dict[str, Any]
+        try:
+            request = json.loads(line)
+            response = {"output": self.compile(request)}
+        except CompilationError as e:
+            response = {"error": e.message, "errors": e.errors}
+        except Exception as e:  # Report back instead of killing the daemon
+            logger.exception("Failed to handle request")
+            response = {"error": f"{type(e).__name__}: {e}", "errors": []}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    @staticmethod
+    def compile(request: Dict[str, Any]) -> str | Dict[str, Any]:
+        from .compiler import compile
+
+        options = request.get("options", {})
+        unknown = set(options.keys()) - COMPILE_OPTIONS
+        if unknown:
+            raise CompilationError(f"Unknown options: {', '.join(sorted(unknown))}")
+        start = time.time()
+        output = compile(request["input_file"], **options)
+        logger.info(
+            f'Compiled "{request["input_file"]}" in {time.time() - start:.3f}s.'
+        )
+        return output
+
+
+def create_server(socket_path: str | Path) -> socketserver.BaseServer:
+    """Binds the daemon to `socket_path`, replacing a stale socket left by a crashed daemon."""
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(socket_path))
+            except OSError:
+                socket_path.unlink()
+            else:
+                raise OSError(f'A daemon is already listening on "{socket_path}".')
+
+    # Restrict access to the current user, the daemon reads any file it is asked to compile
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(
+            str(socket_path), CompileRequestHandler
+        )
+    finally:
+        os.umask(umask)
+    server.daemon_threads = True
+    return server
+
+
+def warm_up() -> None:
+    """Imports all dependencies and compiles a tiny module once, so later requests start warm."""
+    from .compiler import compile
+    from .utility.parse_cache import ParseCache
+
+    # Keep parsed modules of all requests in memory, even without cache directory
+    ParseCache.keep_in_memory = True
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory) / "pydantify-warm-up.yang"
+        file.write_text(WARM_UP_MODULE)
+        compile(file)
+        compile(file, json_schema=True)
+
+
+def serve(socket_path: str | Path | None = None) -> None:
+    """Serves compile requests on a Unix socket until interrupted."""
+    import signal
+
+    socket_path = Path(socket_path or default_socket_path()).absolute()
+    server = create_server(socket_path)
+    start = time.time()
+    warm_up()
+    logger.info(
+        f'Listening on "{socket_path}" (warmed up in {time.time() - start:.3f}s).'
+    )
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down.")
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+def request(
+    input_file: str | Path,
+    *,
+    socket_path: str | Path | None = None,
+    timeout: float | None = None,
+    **options: Any,
+) -> str | Dict[str, Any]:
+    """Compiles a YANG module in a running daemon. Same arguments and result as `compile()`.
+
+    Raises `ConnectionError` (or `FileNotFoundError`) if no daemon is listening on the socket.
+    """
+    paths = ("search_paths", "deviations")
+    options = {
+        key: [str(Path(p).absolute()) for p in value] if key in paths else value
+        for key, value in options.items()
+    }
+    if options.get("cache_dir", None) is not None:
+        options["cache_dir"] = str(Path(options["cache_dir"]).absolute())
+    message = {"input_file": str(Path(input_file).absolute()), "options": options}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path or default_socket_path()))
+        client.sendall(json.dumps(message).encode() + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("The daemon closed the connection without response.")
+    response = json.loads(line)
+    if "error" in response:
+        raise CompilationError(response["error"], response["errors"])
+    return response["output"]
+
+
+def serve_main(argv: List[str]) -> int:
+    """Entry point of `pydantify serve`. Returns the exit code."""
+    parser = ArgumentParser(
+        prog="pydantify serve",
+        description="Keep pydantify loaded and compile models sent by `pydantify client`.",
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        dest="socket",
+        help='The Unix socket to listen on. Defaults to "$PYDANTIFY_SOCKET" or a per-user socket in the temporary directory.',
+        default=None,
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        dest="verbose",
+        help="Enables debug output",
+        default=False,
+    )
+    args = parser.parse_args(argv)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        serve(args.socket)
+    except OSError as e:
+        logger.error(e)
+        return 1
+    return 0
+
+
+def client_main(argv: List[str]) -> int:
+    """Entry point of `pydantify client`. Returns the exit code."""
+    parser = ArgumentParser(
+        prog="pydantify client",
+        description="Transform a YANG model to a serializable Pydantic model using a running `pydantify serve`.",
+    )
+    parser.add_argument(
+        "input_file",
+        action="store",
+        help="The YANG file containing the entrypoint to the model to evaluate.",
+    )
+    add_compile_options(parser, local=False)
+    parser.add_argument(
+        "-s",
+        "--socket",
+        dest="socket",
+        help='The Unix socket of the daemon. Defaults to "$PYDANTIFY_SOCKET" or a per-user socket in the temporary directory.',
+        default=None,
+    )
+    parser.add_argument(
+        "-i",
+        "--input-dir",
+        "--path",
+        action="append",
+        dest="search_paths",
+        help="Additional directory to search for imported modules. Can be repeated.",
+        default=[],
+    )
+    parser.add_argument(
+        "-f",
+        "--output-file",
+        dest="output_file",
+        help='The name of the output file. Defaults to "out.py" for Pydantic output or "out.json" for JSON schema output.',
+        default=None,
+    )
+    parser.add_argument(
+        "--deviation-module",
+        action="append",
+        dest="deviations",
+        help="Deviation module to apply, like pyang's option of the same name. Can be repeated.",
+        default=[],
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        output = request(
+            args.input_file,
+            socket_path=args.socket,
+            search_paths=args.search_paths,
+            deviations=args.deviations,
+            trim_path=args.trim_path,
+            data_type=args.data_type,
+            strip_namespace=args.strip_namespace,
+            share_groupings=args.share_groupings,
+            serialization_plans=args.serialization_plans,
+            defer_build=args.defer_build,
+            standalone=args.standalone,
+            json_schema=args.json_schema_output,
+            native=args.native_output,
+        )
+    except CompilationError as e:
+        logger.error(e)
+        return 1
+    except OSError as e:
+        logger.error(f"Could not reach the daemon, is `pydantify serve` running? {e}")
+        return 1
+
+    output_dir = Path(args.output_dir).absolute()
+    os.makedirs(output_dir, exist_ok=True)
+    if args.json_schema_output is False:
+        (output_dir / "__init__.py").touch()
+    default_output_file = "out.json" if args.json_schema_output else "out.py"
+    output_file = output_dir / (args.output_file or default_output_file)
+    text = json.dumps(output, indent=2) if isinstance(output, dict) else output
+    output_file.write_text(text)
+    logger.info(f'Wrote "{output_file}".')
+    return 0
@@ -0,0 +1,2 @@
+from .json_schema import JSONSchemaEmitter
+from .python import PackageEmitter, PythonEmitter, TypesEmitter
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import inspect
+import json
+import logging
+import re
+from io import StringIO
+from types import NoneType
+from typing import Any, Dict, List, TextIO
+
+from pydantic.fields import FieldInfo
+from pydantic_core import to_jsonable_python
+
+from ..models import (
+    MODEL_DOCSTRING,
+    ChoiceNode,
+    LeafListNode,
+    LeafNode,
+    ListNode,
+    ModelRoot,
+    Node,
+    TypeDefNode,
+)
+from ..models.typeinfo import (
+    BuiltinType,
+    EnumType,
+    ListType,
+    NodeType,
+    TypeInfo,
+    UnionType,
+)
+
+logger = logging.getLogger("pydantify")
+
+JsonSchema = Dict[str, Any]
+
+_BUILTIN_SCHEMAS: Dict[type, JsonSchema] = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    bytes: {"type": "string", "format": "binary"},
+    NoneType: {"type": "null"},
+}
+_CONSTRAINT_KEYWORDS: Dict[str, str] = {
+    "ge": "minimum",
+    "le": "maximum",
+    "min_length": "minLength",
+    "max_length": "maxLength",
+    "pattern": "pattern",
+}
+_VALUE_NODES = (LeafNode, LeafListNode, TypeDefNode)
+"""Nodes whose output class is a `RootModel` of their YANG type."""
+
+
+def sort_schema(value: Any, parent_key: str | None = None) -> Any:
+    """Sorts keys alphabetically, except the ones of `properties` and `default`, like Pydantic."""
+    if isinstance(value, dict):
+        keys = list(value.keys())
+        if parent_key not in ("properties", "default"):
+            keys.sort()
+        return {key: sort_schema(value[key], parent_key=key) for key in keys}
+    elif isinstance(value, list):
+        return [sort_schema(item, parent_key) for item in value]
+    return value
+
+
+def any_of(schemas: List[JsonSchema]) -> JsonSchema:
+    """Returns the union of schemas, flattening nested unions and dropping duplicates."""
+    members: Dict[str, JsonSchema] = dict()
+    for schema in schemas:
+        nested = schema["anyOf"] if len(schema) == 1 and "anyOf" in schema else [schema]
+        for member in nested:
+            members.setdefault(json.dumps(member, sort_keys=True), member)
+    if len(members) == 1:
+        return next(iter(members.values()))
+    return {"anyOf": list(members.values())}
+
+
+class JSONSchemaEmitter:
+    """Writes the JSON schema of the output model directly from the node tree.
+
+    Produces the same schema as `model_json_schema(by_alias=True)` of the generated Pydantic models
+    (without the `namespace` and `prefix` class variables), but without building them. Every
+    definition is written to the output as soon as it is generated, so only the names of the
+    definitions are kept in memory.
+    """
+
+    def __init__(self, root: ModelRoot):
+        self.root = root
+        self.definitions: Dict[str, Node | EnumType] = dict()
+
+    def emit(self) -> str:
+        """Returns the complete JSON schema document."""
+        output = StringIO()
+        self.write(output)
+        return output.getvalue()
+
+    def write(self, fd: TextIO) -> None:
+        """Writes the JSON schema document to `fd`, one definition at a time."""
+        self.collect_definitions()
+        model = sort_schema(
+            self.object_schema("Model", MODEL_DOCSTRING, self.root.field_nodes())
+        )
+        if len(self.definitions) == 0:
+            fd.write(json.dumps(model, indent=2))
+            return
+
+        fd.write('{\n  "$defs": {\n')
+        for i, name in enumerate(sorted(self.definitions.keys())):
+            schema = sort_schema(self.definition(self.definitions[name]))
+            lines = json.dumps(schema, indent=2).split("\n")
+            fd.write(",\n" if i > 0 else "")
+            fd.write(f"    {json.dumps(name)}: {lines[0]}")
+            fd.writelines(f"\n    {line}" for line in lines[1:])
+        fd.write("\n  },\n")
+        fd.write(json.dumps(model, indent=2)[2:])
+
+    @staticmethod
+    def definition_name(target: Node | EnumType) -> str:
+        name = target.name if isinstance(target, EnumType) else target.name()
+        return re.sub(r"[^a-zA-Z0-9.\-_]", "_", name)
+
+    def ref(self, target: Node | EnumType) -> JsonSchema:
+        return {"$ref": f"#/$defs/{self.definition_name(target)}"}
+
+    def collect_definitions(self) -> None:
+        """Finds all classes referenced by the output model, i.e. the entries of `$defs`."""
+        pending: List[Node | TypeInfo] = list(self.root.field_nodes())
+        while pending:
+            item = pending.pop()
+            match item:
+                case ChoiceNode():
+                    pending.extend(item.selected_children())
+                case Node():
+                    if item.shared is not None:
+                        item = item.shared
+                    name = self.definition_name(item)
+                    if name in self.definitions:
+                        continue
+                    self.definitions[name] = item
+                    if isinstance(item, _VALUE_NODES):
+                        pending.append(item.type_info)
+                    else:
+                        pending.extend(item.selected_children())
+                case EnumType():
+                    self.definitions[self.definition_name(item)] = item
+                case ListType():
+                    pending.append(item.item)
+                case UnionType():
+                    pending.extend(item.members)
+                case NodeType():
+                    pending.append(item.node)
+
+    def definition(self, target: Node | EnumType) -> JsonSchema:
+        """Returns the schema of the class generated for a node or enumeration."""
+        if isinstance(target, EnumType):
+            return {"enum": list(target.values), "title": target.name, "type": "string"}
+        if isinstance(target, _VALUE_NODES):
+            schema = dict(self.type_schema(target.type_info))
+            if target.description:
+                schema.setdefault("description", inspect.cleandoc(target.description))
+            return schema
+        return self.object_schema(
+            target.name(), target.description, target.selected_children()
+        )
+
+    def object_schema(
+        self, title: str, description: str | None, children: List[Node]
+    ) -> JsonSchema:
+        # Children with the same name replace each other, as fields of the same name would
+        fields: Dict[str, Node] = {ch.arg: ch for ch in children}
+        properties: Dict[str, JsonSchema] = dict()
+        required: List[str] = []
+        for child in fields.values():
+            field_info = child.get_output_class().field_info
+            assert isinstance(field_info, FieldInfo) and field_info.alias is not None
+            properties[field_info.alias] = self.field_schema(child, field_info)
+            if field_info.is_required():
+                required.append(field_info.alias)
+        properties.pop("namespace", None)
+        properties.pop("prefix", None)
+
+        schema: JsonSchema = {"type": "object", "properties": properties}
+        if required:
+            schema["required"] = required
+        schema["title"] = title
+        if description:
+            schema["description"] = inspect.cleandoc(description)
+        return schema
+
+    def field_schema(self, node: Node, field_info: FieldInfo) -> JsonSchema:
+        """Returns the schema of the field representing `node` in its parent class."""
+        schema: JsonSchema
+        if isinstance(node, (ListNode, LeafListNode)):
+            schema = {"items": self.ref(node), "type": "array"}
+        elif isinstance(node, ChoiceNode):
+            schema = any_of([self.ref(case) for case in node.selected_children()])
+        else:
+            schema = self.ref(node)
+        if not field_info.is_required():
+            schema["default"] = to_jsonable_python(field_info.default)
+        if field_info.description is not None:
+            schema["description"] = field_info.description
+
+        # Drop keys repeating the referenced definition, as Pydantic does
+        if "$ref" in schema and not isinstance(node, ChoiceNode):
+            if node.description and schema.get("description") == inspect.cleandoc(
+                node.description
+            ):
+                del schema["description"]
+        return schema
+
+    def type_schema(self, type_info: TypeInfo) -> JsonSchema:
+        """Returns the (inline) schema of a resolved YANG type."""
+        match type_info:
+            case BuiltinType():
+                schema = dict(_BUILTIN_SCHEMAS[type_info.python_type])
+                for constraint, value in type_info.constraints.items():
+                    if value is not None:
+                        schema[_CONSTRAINT_KEYWORDS[constraint]] = value
+                return schema
+            case ListType():
+                schema = {"items": self.type_schema(type_info.item), "type": "array"}
+                if type_info.min_length is not None:
+                    schema["minItems"] = type_info.min_length
+                if type_info.max_length is not None:
+                    schema["maxItems"] = type_info.max_length
+                return schema
+            case EnumType():
+                return self.ref(type_info)
+            case UnionType():
+                return any_of([self.type_schema(m) for m in type_info.members])
+            case NodeType():
+                return self.ref(type_info.node)
+        raise NotImplementedError(f"Unknown type {type_info}")
@@ -0,0 +1,731 @@
+from __future__ import annotations
+
+import json
+import keyword
+import logging
+import re
+from collections import defaultdict
+from enum import Enum
+from types import NoneType
+from typing import Any, Dict, List, Set, Tuple
+
+from datamodel_code_generator.reference import FieldNameResolver
+from pyang.statements import ModSubmodStatement, Statement
+from pyang.types import (
+    InstanceIdentifierTypeSpec,
+    LeafrefTypeSpec,
+    PathTypeSpec,
+    TypeSpec,
+    UnionTypeSpec,
+)
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic.fields import FieldInfo
+
+from ..models import (
+    MODEL_DOCSTRING,
+    ChoiceNode,
+    ContainerNode,
+    LeafListNode,
+    LeafNode,
+    ListNode,
+    ModelRoot,
+    Node,
+    TypeDefNode,
+    TypeResolver,
+)
+from ..models.typeinfo import (
+    BuiltinType,
+    EnumType,
+    ListType,
+    NodeType,
+    TypeInfo,
+    UnionType,
+)
+
+logger = logging.getLogger("pydantify")
+
+_BUILTIN_NAMES: Dict[type, str] = {
+    str: "str",
+    int: "int",
+    float: "float",
+    bool: "bool",
+    bytes: "bytes",
+    NoneType: "None",
+}
+_RESERVED_FIELD_NAMES = {"namespace", "prefix", "serialization_plan"}
+_RESERVED_TYPE_NAMES = {"Annotated", "Enum", "Field", "List", "Union"}
+"""Names imported by type modules."""
+
+TYPES_PACKAGE = "yang_types"
+"""Package of the shared type modules, next to the models generated with `shared_types`.
+
+Not called `types`, which would shadow the standard library when running a model as a script.
+"""
+
+
+def literal(value: Any) -> str:
+    """Returns the Python source representation of a JSON-compatible value."""
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, list):
+        return f"[{', '.join(literal(v) for v in value)}]"
+    if isinstance(value, Enum):
+        return literal(value.value)
+    return repr(value)
+
+
+def docstring(text: str, indent: str) -> List[str]:
+    """Renders a docstring in the layout used by datamodel-code-generator."""
+    text = text.replace("\\", "\\\\").replace('"""', '\\"\\"\\"')
+    lines = [f'{indent}"""']
+    lines.extend(f"{indent}{line}".rstrip() for line in text.strip("\n").split("\n"))
+    lines.append(f'{indent}"""')
+    return lines
+
+
+def type_module_name(module: str) -> str:
+    """Returns the name of the Python module holding the shared types of a YANG module."""
+    name = re.sub(r"\W", "_", module)
+    return f"{name}_" if keyword.iskeyword(name) else name
+
+
+def main_module(stm: Statement) -> ModSubmodStatement:
+    """Returns the module a statement belongs to, the including module for submodules."""
+    module = stm.top or stm
+    if module.keyword == "submodule":
+        module = module.i_ctx.get_module(module.i_modulename)
+    return module
+
+
+def _refers_to_nodes(spec: TypeSpec | None) -> bool:
+    if isinstance(spec, (PathTypeSpec, LeafrefTypeSpec, InstanceIdentifierTypeSpec)):
+        return True
+    if isinstance(spec, UnionTypeSpec):
+        return any(
+            _refers_to_nodes(getattr(t, "i_type_spec", None)) for t in spec.types
+        )
+    return False
+
+
+def shareable_typedef(stm: Statement) -> bool:
+    """Whether a typedef is written to the shared type module of its YANG module.
+
+    Only typedefs at the top level of a module are, except leafrefs, whose type depends on
+    where they are used.
+    """
+    if stm.parent is None or stm.parent.keyword not in ("module", "submodule"):
+        return False
+    return not _refers_to_nodes(getattr(stm.search_one("type"), "i_type_spec", None))
+
+
+def camel_case(name: str) -> str:
+    parts = [p for p in re.split(r"[^0-9a-zA-Z_]+", name) if p != ""]
+    return "".join(p[0].upper() + p[1:] for p in parts) or "Class"
+
+
+def type_names(module: ModSubmodStatement) -> Dict[str, str]:
+    """Returns the names of the shared typedefs of a module in its type module, by typedef."""
+    names: Dict[str, str] = dict()
+    used: Set[str] = set(_RESERVED_TYPE_NAMES)
+    for typedef in module.i_typedefs.values():
+        if not shareable_typedef(typedef):
+            continue
+        name = camel_case(typedef.arg)
+        if name[0].isdigit():
+            name = f"T{name}"
+        unique, count = name, 1
+        while unique in used:
+            count += 1
+            unique = f"{name}{count}"
+        used.add(unique)
+        names[typedef.arg] = unique
+    return names
+
+
+class PythonEmitter:
+    """Writes the source code of Pydantic v2 models directly from the node tree.
+
+    Unlike the default output, which builds runtime classes with `create_model`, dumps their JSON
+    schema and converts it with datamodel-code-generator, this only walks the nodes and their
+    `TypeInfo`. Containers, list entries and cases become classes, enumerations become `Enum`
+    classes, while leaves, leaf-lists and typedefs are written inline as (constrained) field types.
+    """
+
+    def __init__(
+        self, root: ModelRoot, shared_types: bool = False, defer_build: bool = False
+    ):
+        self.root = root
+        self.shared_types = shared_types
+        """Import the typedefs of other modules from their type module instead of inlining them."""
+        self.defer_build = defer_build
+        """Build the validators of the classes on first use instead of when defining them."""
+        self.blocks: List[List[str]] = []
+        self.block_names: List[str] = []
+        """Name of the class or type defined by each block."""
+        self.references: Dict[str, Set[str]] = defaultdict(set)
+        """Names of the classes and enumerations each class refers to, by class name."""
+        self.scope: List[str] = []
+        self.class_names: Dict[int, str] = dict()
+        self.enum_members: Dict[int, Dict[str, str]] = dict()
+        self.used_class_names: Set[str] = {"Model"}
+        self.typing_imports: Set[str] = set()
+        self.type_modules: Dict[str, ModSubmodStatement] = dict()
+        """Modules whose type module is imported, by name."""
+        self.type_names: Dict[str, Dict[str, str]] = dict()
+
+    def emit(self) -> str:
+        """Returns the source code of the complete output module."""
+        body = self.model_class()
+        blocks = [*self.blocks, body]
+
+        header = ["from __future__ import annotations", ""]
+        if self.enum_members:
+            header.append("from enum import Enum")
+        header.append(f"from typing import {', '.join(sorted(self.typing_imports))}")
+        header.extend(["", "from pydantic import BaseModel, ConfigDict, Field"])
+        if self.type_modules:
+            modules = sorted(type_module_name(m) for m in self.type_modules)
+            header.extend(["", f"from .{TYPES_PACKAGE} import {', '.join(modules)}"])
+        return "\n\n\n".join("\n".join(block) for block in [header, *blocks]) + "\n"
+
+    def model_class(self) -> List[str]:
+        root_node = self.root.root_node
+        assert isinstance(root_node, Node)
+        self.scope.append("Model")
+        block = self.class_block(
+            "Model", MODEL_DOCSTRING, root_node, self.root.field_nodes()
+        )
+        self.scope.pop()
+        return block
+
+    def class_block(
+        self, name: str, description: str | None, node: Node, fields: List[Node]
+    ) -> List[str]:
+        lines = [f"class {name}(BaseModel):"]
+        if description:
+            lines.extend(docstring(description, "    "))
+            lines.append("")
+        self.typing_imports.update(("ClassVar", "Optional"))
+        lines.extend(
+            [
+                "    model_config = ConfigDict(",
+                "        populate_by_name=True,",
+                '        regex_engine="python-re",',
+                *(["        defer_build=True,"] if self.defer_build else []),
+                "    )",
+                f"    namespace: ClassVar[Optional[str]] = {literal(node.namespace)}",
+                f"    prefix: ClassVar[Optional[str]] = {literal(node.prefix)}",
+            ]
+        )
+        if Node.serialization_plans:
+            # The fields of `Model` are the top-level nodes, even if the trimmed branch is a list
+            key = node.raw_statement.search_one("key")
+            keys = (
+                key.arg.split()
+                if key and node.keyword == "list" and name != "Model"
+                else []
+            )
+            self.typing_imports.add("List")
+            lines.append(
+                "    serialization_plan: ClassVar[List[List[Optional[str]]]] = ["
+            )
+            lines.extend(
+                f"        {literal(entry)},"
+                for entry in Node.serialization_plan(fields, keys)
+            )
+            lines.append("    ]")
+        field_names: Set[str] = set()
+        for child in fields:
+            lines.extend(self.field_lines(child, field_names))
+        return lines
+
+    def class_name(self, node: Node) -> str:
+        """Returns the name of the class representing `node`, writing the class on first use."""
+        if node.shared is not None:
+            node = node.shared
+        name = self.class_names.get(id(node), None)
+        if name is None:
+            name = self.unique_class_name(node.name())
+            self.class_names[id(node)] = name
+            children = node.selected_children()
+            self.scope.append(name)
+            block = self.class_block(name, node.description, node, children)
+            self.scope.pop()
+            self.add_block(name, block)
+        self.reference(name)
+        return name
+
+    def add_block(self, name: str, lines: List[str]) -> None:
+        self.blocks.append(lines)
+        self.block_names.append(name)
+
+    def reference(self, name: str) -> None:
+        """Records that the class being written refers to `name`."""
+        if self.scope:
+            self.references[self.scope[-1]].add(name)
+
+    def unique_class_name(self, name: str) -> str:
+        name = camel_case(name)
+        unique, count = name, 1
+        while unique in self.used_class_names:
+            count += 1
+            unique = f"{name}{count}"
+        self.used_class_names.add(unique)
+        return unique
+
+    def enum_name(self, enum: EnumType, name: str | None = None) -> str:
+        if id(enum) not in self.enum_members:
+            name = self.unique_class_name(enum.name) if name is None else name
+            members: Dict[str, str] = dict()
+            lines = [f"class {name}(Enum):"]
+            for value in enum.values:
+                member = re.sub(r"\W", "_", value)
+                if member == "" or member[0].isdigit() or keyword.iskeyword(member):
+                    member = f"field_{member}"
+                while member in members.values():
+                    member += "_"
+                members[value] = member
+                lines.append(f"    {member} = {literal(value)}")
+            self.enum_members[id(enum)] = members
+            self.class_names[id(enum)] = name
+            self.add_block(name, lines)
+        self.reference(self.class_names[id(enum)])
+        return self.class_names[id(enum)]
+
+    def type_expr(self, type_info: TypeInfo) -> Tuple[str, Dict[str, Any]]:
+        """Returns the annotation of a type and the constraints to add to its `Field`."""
+        match type_info:
+            case BuiltinType():
+                constraints = {
+                    k: v for k, v in type_info.constraints.items() if v is not None
+                }
+                return _BUILTIN_NAMES[type_info.python_type], constraints
+            case ListType():
+                self.typing_imports.add("List")
+                constraints = {
+                    k: v
+                    for k, v in (
+                        ("max_length", type_info.max_length),
+                        ("min_length", type_info.min_length),
+                    )
+                    if v is not None
+                }
+                return f"List[{self.inline_type_expr(type_info.item)}]", constraints
+            case EnumType():
+                return self.enum_name(type_info), {}
+            case UnionType():
+                self.typing_imports.add("Union")
+                members: List[str] = []
+                for member in type_info.members:
+                    expr = self.inline_type_expr(member)
+                    if expr not in members:
+                        members.append(expr)
+                if len(members) == 1:
+                    return members[0], {}
+                return f"Union[{', '.join(members)}]", {}
+            case NodeType():
+                return self.node_type_expr(type_info.node)
+        raise NotImplementedError(f"Unknown type {type_info}")
+
+    def inline_type_expr(self, type_info: TypeInfo) -> str:
+        """Returns the annotation of a type, including its constraints."""
+        expr, constraints = self.type_expr(type_info)
+        if constraints:
+            self.typing_imports.add("Annotated")
+            return f"Annotated[{expr}, Field({self.kwargs(constraints)})]"
+        return expr
+
+    def node_type_expr(self, node: Node) -> Tuple[str, Dict[str, Any]]:
+        """Returns the annotation of a node when used as a field (or leafref target)."""
+        if isinstance(node, (LeafNode, TypeDefNode)):
+            if self.is_shared(node):
+                return self.shared_type_name(node), {}
+            return self.type_expr(node.type_info)
+        if isinstance(node, LeafListNode):
+            self.typing_imports.add("List")
+            return f"List[{self.inline_type_expr(node.type_info)}]", {}
+        if isinstance(node, ListNode):
+            self.typing_imports.add("List")
+            return f"List[{self.class_name(node)}]", {}
+        if isinstance(node, ChoiceNode):
+            self.typing_imports.add("Union")
+            cases = [
+                self.inline_type_expr(NodeType(case))
+                for case in node.selected_children()
+            ]
+            return f"Union[{', '.join(cases)}]", {}
+        return self.class_name(node), {}
+
+    def own_module(self) -> str:
+        root_node = self.root.root_node
+        assert isinstance(root_node, Node)
+        return main_module(root_node.raw_statement).arg
+
+    def is_shared(self, node: Node) -> bool:
+        """Whether a node is a typedef written to a shared type module."""
+        return (
+            self.shared_types
+            and isinstance(node, TypeDefNode)
+            and shareable_typedef(node.raw_statement)
+            and main_module(node.raw_statement).arg != self.own_module()
+        )
+
+    def shared_type_name(self, node: Node) -> str:
+        """Returns the reference to a shared typedef, importing its type module."""
+        module = main_module(node.raw_statement)
+        self.type_modules[module.arg] = module
+        if module.arg not in self.type_names:
+            self.type_names[module.arg] = type_names(module)
+        name = self.type_names[module.arg][node.arg]
+        return f"{type_module_name(module.arg)}.{name}"
+
+    def enum_of(self, node: Node) -> EnumType | None:
+        """Returns the enumeration a leaf resolves to, following typedefs and leafrefs."""
+        type_info = getattr(node, "type_info", None)
+        while isinstance(type_info, NodeType):
+            type_info = getattr(type_info.node, "type_info", None)
+        return type_info if isinstance(type_info, EnumType) else None
+
+    def shared_enum(self, node: Node) -> str | None:
+        """Returns the reference to the shared typedef of a leaf's enumeration, if any."""
+        type_info = getattr(node, "type_info", None)
+        while isinstance(type_info, NodeType):
+            if self.is_shared(type_info.node):
+                if self.enum_of(type_info.node) is None:
+                    return None
+                return self.shared_type_name(type_info.node)
+            type_info = getattr(type_info.node, "type_info", None)
+        return None
+
+    def default_expr(self, node: Node, value: Any) -> str:
+        if value is None:
+            return "None"
+        shared = self.shared_enum(node)
+        if shared is not None:
+            # Look up the members by value, their names are only known to the type module
+            if isinstance(value, list):
+                return f"[{', '.join(f'{shared}({literal(v)})' for v in value)}]"
+            return f"{shared}({literal(value)})"
+        enum = self.enum_of(node)
+        if enum is not None:
+            members = self.enum_members[id(enum)]
+            name = self.class_names[id(enum)]
+            if isinstance(value, list):
+                return f"[{', '.join(f'{name}.{members[v]}' for v in value if v in members)}]"
+            if value in members:
+                return f"{name}.{members[value]}"
+        return literal(value)
+
+    def field_name(self, arg: str, used: Set[str]) -> str:
+        name = FieldNameResolver(snake_case_field=True).get_valid_name(arg)
+        if name in _RESERVED_FIELD_NAMES or hasattr(PydanticBaseModel, name):
+            name = f"{name}_"
+        unique, count = name, 0
+        while unique in used:
+            count += 1
+            unique = f"{name}_{count}"
+        used.add(unique)
+        return unique
+
+    def field_lines(self, node: Node, used_names: Set[str]) -> List[str]:
+        field_info = node.get_output_class().field_info
+        assert isinstance(field_info, FieldInfo)
+        expr, constraints = self.node_type_expr(node)
+        kwargs: Dict[str, Any] = dict()
+        default: str | None = None
+        required = field_info.is_required()
+        value = None if required else field_info.default
+        if isinstance(value, list) and len(value) == 0:
+            kwargs["default_factory"] = "list"
+        elif isinstance(value, list):
+            kwargs["default_factory"] = f"lambda: {self.default_expr(node, value)}"
+        elif not required:
+            default = self.default_expr(node, value)
+        kwargs["alias"] = literal(field_info.alias)
+        kwargs.update({k: literal(v) for k, v in constraints.items()})
+
+        if not required:
+            expr = f"Optional[{expr}]"
+        self.typing_imports.update(("Annotated", "Optional"))
+        name = self.field_name(node.arg, used_names)
+        line = (
+            f"    {name}: Annotated[{expr}, Field({self.kwargs(kwargs, quoted=True)})]"
+        )
+        lines = [line if default is None else f"{line} = {default}"]
+        if isinstance(node, (LeafNode, LeafListNode)) and field_info.description:
+            lines.extend(docstring(field_info.description, "    "))
+        return lines
+
+    @staticmethod
+    def kwargs(values: Dict[str, Any], quoted: bool = False) -> str:
+        """Renders keyword arguments. With `quoted`, values already are source code."""
+        return ", ".join(
+            f"{k}={v if quoted else literal(v)}" for k, v in values.items()
+        )
+
+
+class TypesEmitter(PythonEmitter):
+    """Writes the shared type module of a YANG module, imported by models generated with `shared_types`.
+
+    Enumeration typedefs become `Enum` classes, all other typedefs type aliases with their
+    constraints, and identities constants of their qualified name.
+    """
+
+    def __init__(self, module: ModSubmodStatement):
+        super().__init__(None, shared_types=True)  # type: ignore[arg-type]
+        self.module = module
+        self.names = type_names(module)
+        self.type_names[module.arg] = self.names
+        self.used_class_names.update(self.names.values())
+        self.emitted: Set[str] = set()
+        self.current = ""
+        """Name of the typedef being written, used to name its nested enumerations."""
+
+    def emit(self) -> str:
+        for typedef in self.module.i_typedefs.values():
+            if typedef.arg in self.names:
+                self.typedef_name(TypeResolver.typedef_node(typedef))
+        identities = self.identity_lines()
+        blocks = [*self.blocks, identities] if identities else self.blocks
+
+        header = [
+            f'"""Types of the YANG module {self.module.arg}."""',
+            "",
+            "from __future__ import annotations",
+            "",
+        ]
+        if self.enum_members:
+            header.append("from enum import Enum")
+        if self.typing_imports:
+            header.append(
+                f"from typing import {', '.join(sorted(self.typing_imports))}"
+            )
+        if "Annotated" in self.typing_imports:
+            header.extend(["", "from pydantic import Field"])
+        if self.type_modules:
+            modules = sorted(type_module_name(m) for m in self.type_modules)
+            header.extend(["", f"from . import {', '.join(modules)}"])
+        return "\n\n\n".join("\n".join(block) for block in [header, *blocks]) + "\n"
+
+    def own_module(self) -> str:
+        return self.module.arg
+
+    def typedef_name(self, node: Node) -> str:
+        """Returns the name of a typedef of this module, writing it on first use."""
+        name = self.names[node.arg]
+        if node.arg in self.emitted:
+            return name
+        self.emitted.add(node.arg)
+        assert isinstance(node, TypeDefNode)
+        outer, self.current = self.current, name
+        if isinstance(node.type_info, EnumType):
+            self.enum_name(node.type_info, name)
+            if node.description:
+                self.blocks[-1][1:1] = [*docstring(node.description, "    "), ""]
+        else:
+            lines = [f"{name} = {self.inline_type_expr(node.type_info)}"]
+            if node.description:
+                lines.extend(docstring(node.description, ""))
+            self.add_block(name, lines)
+        self.current = outer
+        return name
+
+    def enum_name(self, enum: EnumType, name: str | None = None) -> str:
+        if name is None and id(enum) not in self.enum_members:
+            name = self.unique_class_name(f"{self.current}Enum")
+        return super().enum_name(enum, name)
+
+    def node_type_expr(self, node: Node) -> Tuple[str, Dict[str, Any]]:
+        if (
+            isinstance(node, TypeDefNode)
+            and shareable_typedef(node.raw_statement)
+            and main_module(node.raw_statement).arg == self.module.arg
+        ):
+            return self.typedef_name(node), {}
+        return super().node_type_expr(node)
+
+    def identity_lines(self) -> List[str]:
+        lines: List[str] = []
+        used: Set[str] = set(self.names.values()) | set(self.used_class_names)
+        for identity in self.module.i_identities.values():
+            name = re.sub(r"\W", "_", identity.arg).upper()
+            if name[0].isdigit():
+                name = f"_{name}"
+            while name in used:
+                name += "_"
+            used.add(name)
+            lines.append(f"{name} = {literal(f'{self.module.arg}:{identity.arg}')}")
+        return lines
+
+
+class PackageEmitter(PythonEmitter):
+    """Writes the output model as a package, with one submodule per top-level node.
+
+    Top-level nodes that are the only child of their parent, like the `interfaces` container and
+    `interface` list of openconfig-interfaces, are descended into, so the split happens where the
+    tree first branches. Their classes and `Model` go to `_model`, classes used by several
+    top-level nodes to `_shared`. The `__init__` module imports a submodule when one of its
+    classes is accessed for the first time, so using a single container does not build the
+    classes of all others.
+    """
+
+    MODEL_MODULE = "_model"
+    SHARED_MODULE = "_shared"
+
+    def __init__(
+        self, root: ModelRoot, shared_types: bool = False, defer_build: bool = False
+    ):
+        super().__init__(root, shared_types=shared_types, defer_build=defer_build)
+        self.files: Dict[str, str] = dict()
+        """Source code of the submodules, by file name."""
+        self.top_level: Dict[str, str] = dict()
+        """Submodule of each top-level field, by its scope in `references`."""
+        self.chain: Set[int] = set()
+        """Nodes above the top-level nodes, which are the only child of their parent."""
+        self.chain_names: Set[str] = {"Model"}
+
+    def emit(self) -> str:
+        """Returns the source code of the package's `__init__`, and fills `files`."""
+        nodes = self.root.field_nodes()
+        while len(nodes) == 1 and isinstance(nodes[0], (ListNode, ContainerNode)):
+            node = nodes[0].shared or nodes[0]
+            self.chain.add(id(node))
+            nodes = node.selected_children()
+        body = self.model_class()
+        modules = self.assign_modules()
+        modules["Model"] = self.MODEL_MODULE
+
+        blocks: Dict[str, List[Tuple[str, List[str]]]] = defaultdict(list)
+        for name, block in zip(self.block_names, self.blocks):
+            blocks[modules[name]].append((name, block))
+        blocks[self.MODEL_MODULE].append(("Model", body))
+        for module, module_blocks in blocks.items():
+            self.files[f"{module}.py"] = self.submodule(module, module_blocks, modules)
+        return self.init_module(modules)
+
+    def class_block(
+        self, name: str, description: str | None, node: Node, fields: List[Node]
+    ) -> List[str]:
+        if id(node) in self.chain:
+            self.chain_names.add(name)
+        return super().class_block(name, description, node, fields)
+
+    def field_lines(self, node: Node, used_names: Set[str]) -> List[str]:
+        if (
+            self.scope[-1] not in self.chain_names
+            or id(node.shared or node) in self.chain
+        ):
+            return super().field_lines(node, used_names)
+        # Track the classes of each top-level field separately
+        scope = f"<{node.arg}>"
+        self.top_level[scope] = self.unique_module_name(node.arg)
+        self.scope.append(scope)
+        lines = super().field_lines(node, used_names)
+        self.scope.pop()
+        self.references[self.scope[-1]].update(self.references[scope])
+        return lines
+
+    def unique_module_name(self, arg: str) -> str:
+        name = FieldNameResolver(snake_case_field=True).get_valid_name(arg)
+        unique, count = name, 1
+        while unique in self.top_level.values() or unique.startswith("_"):
+            count += 1
+            unique = f"{name.lstrip('_')}_{count}"
+        return unique
+
+    def assign_modules(self) -> Dict[str, str]:
+        """Returns the submodule of each class, by class name."""
+        users: Dict[str, Set[str]] = defaultdict(set)
+        for scope, module in self.top_level.items():
+            pending = list(self.references[scope])
+            while pending:
+                name = pending.pop()
+                if module in users[name]:
+                    continue
+                users[name].add(module)
+                pending.extend(self.references[name])
+        modules: Dict[str, str] = dict()
+        for name in self.block_names:
+            if len(users[name]) == 0:  # Only used above the top-level nodes
+                modules[name] = self.MODEL_MODULE
+            elif len(users[name]) == 1:
+                modules[name] = next(iter(users[name]))
+            else:
+                modules[name] = self.SHARED_MODULE
+        return modules
+
+    def submodule(
+        self,
+        module: str,
+        blocks: List[Tuple[str, List[str]]],
+        modules: Dict[str, str],
+    ) -> str:
+        imports: Dict[str, Set[str]] = defaultdict(set)
+        for name, _ in blocks:
+            for reference in self.references[name]:
+                if modules[reference] != module:
+                    imports[modules[reference]].add(reference)
+        text = "\n\n\n".join("\n".join(block) for _, block in blocks)
+
+        header = ["from __future__ import annotations", ""]
+        if "(Enum):" in text:
+            header.append("from enum import Enum")
+        typing = sorted(n for n in self.typing_imports if re.search(rf"\b{n}\b", text))
+        if typing:
+            header.append(f"from typing import {', '.join(typing)}")
+        pydantic = [n for n in ("BaseModel", "ConfigDict", "Field") if n in text]
+        header.extend(["", f"from pydantic import {', '.join(pydantic)}"])
+        types = sorted(
+            type_module_name(m)
+            for m in self.type_modules
+            if f"{type_module_name(m)}." in text
+        )
+        if types:
+            header.extend(["", f"from ..{TYPES_PACKAGE} import {', '.join(types)}"])
+        if imports:
+            header.append("")
+            for other in sorted(imports):
+                header.append(
+                    f"from .{other} import {', '.join(sorted(imports[other]))}"
+                )
+        return "\n".join(header) + "\n\n\n" + text + "\n"
+
+    def init_module(self, modules: Dict[str, str]) -> str:
+        names = ["Model", *(n for n in self.block_names if n in modules)]
+        lines = [
+            '"""Generated models, each submodule is imported when one of its classes is first used."""',
+            "",
+            "from importlib import import_module",
+            "from typing import TYPE_CHECKING, Any, List",
+            "",
+            "if TYPE_CHECKING:",
+        ]
+        by_module: Dict[str, List[str]] = defaultdict(list)
+        for name in names:
+            by_module[modules[name]].append(name)
+        for module, module_names in by_module.items():
+            lines.append(f"    from .{module} import {', '.join(module_names)}")
+        lines.extend(["", "_SUBMODULES = {"])
+        lines.extend(
+            f"    {literal(name)}: {literal(modules[name])}," for name in names
+        )
+        lines.extend(
+            [
+                "}",
+                "",
+                "__all__ = list(_SUBMODULES)",
+                "",
+                "",
+                "def __getattr__(name: str) -> Any:",
+                "    if name not in _SUBMODULES:",
+                '        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")',
+                '    value = getattr(import_module(f".{_SUBMODULES[name]}", __name__), name)',
+                "    globals()[name] = value",
+                "    return value",
+                "",
+                "",
+                "def __dir__() -> List[str]:",
+                "    return sorted({*globals(), *_SUBMODULES})",
+            ]
+        )
+        return "\n".join(lines) + "\n"
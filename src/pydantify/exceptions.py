@@ -1,2 +1,14 @@
+from typing import List, Sequence
+
+
 class NotImplementedException(Exception):
     pass
+
+
+class CompilationError(Exception):
+    """The YANG model could not be turned into an output model."""
+
+    def __init__(self, message: str, errors: Sequence[str] = ()):
+        super().__init__("\n".join([message, *errors]))
+        self.message = message
+        self.errors: List[str] = list(errors)
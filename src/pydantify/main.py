@@ -2,6 +2,7 @@
 
 import logging
 import sys
+import time
 from typing import List
 
 logging.basicConfig(
@@ -13,12 +14,59 @@ logger = logging.getLogger("pydantify")
 
 
 def main():
-    from pyang.scripts.pyang_tool import run
+    start = time.perf_counter_ns()
+    if sys.argv[1:2] == ["build"]:
+        from .build import main as build_main
+
+        sys.exit(build_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["serve"]:
+        from .daemon import serve_main
+
+        sys.exit(serve_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["client"]:
+        # Only imports the standard library, the daemon does the heavy lifting
+        from .daemon import client_main
+
+        sys.exit(client_main(sys.argv[2:]))
+
+    from .utility.build_cache import BuildCache
+    from .utility.model_generator import ModelGenerator
+    from .utility.profiler import Profiler
+    from .watch import Watcher
+
+    imported = time.perf_counter_ns()
 
     # Parse user-give settings
     sys.argv[1:] = parse_cli_arguments()
 
-    run()
+    if Profiler.enabled:
+        Profiler.record("startup", Profiler.origin, start)
+        Profiler.record("imports", start, imported)
+        Profiler.record("cli", imported, time.perf_counter_ns())
+
+    if Watcher.enabled():
+        sys.exit(Watcher.run())
+
+    with Profiler.phase("build cache restore"):
+        restored = BuildCache.restore()
+    if restored:
+        ModelGenerator.copy_yang_sources()
+        Profiler.write_reports()
+        return
+
+    from pyang.scripts.pyang_tool import run
+
+    from .utility.parse_cache import ParseCache
+
+    try:
+        run()
+    except SystemExit as e:
+        if not e.code:
+            BuildCache.store()
+        raise
+    finally:
+        ParseCache.uninstall()
+        Profiler.write_reports()
 
 
 def parse_cli_arguments() -> List[str]:
@@ -27,11 +75,28 @@ def parse_cli_arguments() -> List[str]:
     # Import locally to not clutter scope of caller
     import logging
     import os
-    from argparse import ArgumentParser
+    from argparse import ArgumentParser, ArgumentTypeError
     from pathlib import Path
 
     from .models.base import Node
-    from .utility.model_generator import ModelGenerator
+    from .options import add_compile_options
+    from .utility.build_cache import BuildCache
+    from .utility.model_generator import FORMATS, VARIANTS, ModelGenerator
+    from .utility.parse_cache import ParseCache
+    from .utility.profiler import Profiler
+    from .watch import Watcher, WatchTarget
+
+    def comma_separated(choices: List[str]):
+        def parse(value: str) -> List[str]:
+            items = [item.strip() for item in value.split(",") if item.strip()]
+            invalid = [item for item in items if item not in choices]
+            if invalid or not items:
+                raise ArgumentTypeError(
+                    f"invalid choice: {', '.join(invalid) or repr(value)} (choose from {', '.join(choices)})"
+                )
+            return list(dict.fromkeys(items))  # Drop duplicates, keep the order
+
+        return parse
 
     # Setup parser
     parser = ArgumentParser(
@@ -55,14 +120,6 @@ def parse_cli_arguments() -> List[str]:
         help="Adds validation code, as well as the relevant YANG files, to the output model.",
         default=False,
     )
-    parser.add_argument(
-        "-S",
-        "--standalone",
-        action="store_true",
-        dest="standalone",
-        help="Generated output model has no dependency on Pydantify. All required code is copied into the output model.",
-        default=False,
-    )
     parser.add_argument(
         "-i",
         "--input-dir",
@@ -71,13 +128,6 @@ def parse_cli_arguments() -> List[str]:
         help="The directory that contains the YANG input model. Defaults to the input file's folder.",
         default=None,
     )
-    parser.add_argument(
-        "-o",
-        "--output-dir",
-        dest="output_dir",
-        help='The directory that should be used to store the output model. Defaults to "$CWD/out".',
-        default=f"{os.getcwd()}/out/",
-    )
     parser.add_argument(
         "-f",
         "--output-file",
@@ -90,50 +140,105 @@ def parse_cli_arguments() -> List[str]:
         action="store",
         help="The YANG file containing the entrypoint to the model to evaluate.",
     )
+    add_compile_options(parser)
+    parser.add_argument(
+        "--variants",
+        type=comma_separated(list(VARIANTS.keys())),
+        dest="variants",
+        metavar="VARIANT[,VARIANT...]",
+        help='Generate several variants from a single parse, each into its own file: full ("out.py"), config ("out_config.py") and state ("out_state.py"). Cannot be combined with --data-type.',
+        default=None,
+    )
+    parser.add_argument(
+        "--formats",
+        type=comma_separated(list(FORMATS)),
+        dest="formats",
+        metavar="FORMAT[,FORMAT...]",
+        help='Write each variant in several formats from the same models: Pydantic models ("py") and JSON schema ("json"). Cannot be combined with --json-schema.',
+        default=None,
+    )
     parser.add_argument(
-        "-t",
-        "--trim-path",
-        dest="trim_path",
-        help="Get only the specified branch of the whole tree.",
+        "--profile",
+        dest="profile",
+        metavar="REPORT_FILE",
+        help='Write the duration of each build phase to this JSON file, and a Chrome trace of them to "<name>.trace.json" next to it.',
         default=None,
     )
     parser.add_argument(
-        "-j",
-        "--json-schema",
+        "--profile-statements",
         action="store_true",
-        dest="json_schema_output",
-        help="Output JSON schema instead of Pydantic models.",
+        dest="profile_statements",
+        help="Also profile building the model of each YANG statement. Slows down the build.",
         default=False,
     )
     parser.add_argument(
-        "-d",
-        "--data-type",
-        action="store",
-        dest="data_type",
-        choices=["config", "state"],
-        help="Limit output to config or state only. Default is config and state combined.",
+        "--memory-report",
+        dest="memory_report",
+        metavar="REPORT_FILE",
+        help="Write the peak and retained memory of each build phase and top-level node to this JSON file. Slows down the build a lot.",
         default=None,
     )
     parser.add_argument(
-        "-n",
-        "--strip-namespace",
+        "--watch",
         action="store_true",
-        dest="strip_namespace",
-        help="Strip the YANG namespace from the output model aliases.",
+        dest="watch",
+        help="Keep running and regenerate the output model whenever one of its YANG files changes.",
         default=False,
     )
     relay_args: List[str] = []
 
     # Parse
     args, unknown_args = parser.parse_known_args()
+    variants: List[str] | None = None
+    formats: List[str] | None = None
+    if args.variants is not None or args.formats is not None:
+        for option, conflicting in (
+            ("--data-type", args.data_type is not None and args.variants is not None),
+            ("--json-schema", args.json_schema_output and args.formats is not None),
+            ("--package", args.package_output),
+            ("--watch", args.watch),
+        ):
+            if conflicting:
+                parser.error(
+                    f"{option} cannot be combined with --variants or --formats."
+                )
+        variants = args.variants or [args.data_type or "full"]
+        formats = args.formats or ["json" if args.json_schema_output else "py"]
+        args.json_schema_output = "py" not in formats
+    for option, enabled in (
+        ("--shared-types", args.shared_types),
+        ("--package", args.package_output),
+    ):
+        if enabled and (not args.native_output or args.json_schema_output):
+            parser.error(f"{option} requires --native Pydantic output.")
 
     # Apply known settings accordingly
     logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    if args.profile is not None or args.memory_report is not None:
+        Profiler.output_file = Path(args.profile).absolute() if args.profile else None
+        Profiler.memory_report_file = (
+            Path(args.memory_report).absolute() if args.memory_report else None
+        )
+        Profiler.start(
+            statements=args.profile_statements,
+            memory=args.memory_report is not None,
+            origin=Profiler.process_start(),
+        )
     ModelGenerator.include_verification_code = args.verify
     ModelGenerator.standalone = args.standalone
     ModelGenerator.json_schema_output = args.json_schema_output
+    ModelGenerator.native_output = args.native_output
+    ModelGenerator.shared_types = args.shared_types
+    ModelGenerator.package_output = args.package_output
+    ModelGenerator.defer_build = args.defer_build
+    ModelGenerator.variants = variants
+    ModelGenerator.formats = formats
     Node.data_type = args.data_type
     Node.strip_namespace = args.strip_namespace
+    Node.share_groupings = args.share_groupings
+    Node.serialization_plans = args.serialization_plans
+    Node._shared_nodes = dict()
+    Node._included = dict()
     default_output_file = "out.json" if args.json_schema_output else "out.py"
 
     input_dir = (
@@ -152,9 +257,77 @@ def parse_cli_arguments() -> List[str]:
     if args.json_schema_output is False:
         with open(output_dir / "__init__.py", "a"):  # Create init file if not exists
             pass
-    relay_args.append(
-        f"--output={output_dir}/{args.output_file if args.output_file is not None else default_output_file}"
+    output_file = output_dir / (
+        args.output_file if args.output_file is not None else default_output_file
+    )
+    if variants is not None and formats is not None:
+        # The first variant is written by pyang, the others next to it
+        ModelGenerator.output_stem = Path(output_file.name).stem
+        output_file = output_dir / ModelGenerator.variant_file_name(
+            ModelGenerator.output_stem, variants[0], formats[0]
+        )
+    if args.package_output:
+        # The package's `__init__` is written by pyang, its submodules next to it
+        output_file = output_file.with_suffix("") / "__init__.py"
+        os.makedirs(output_file.parent, exist_ok=True)
+    relay_args.append(f"--output={output_file}")
+
+    cache_dir = Path(args.cache_dir).absolute() if args.cache_dir is not None else None
+    # Restoring a cached output model would not restore the other files it imports
+    BuildCache.cache_dir = (
+        None
+        if args.shared_types or args.package_output or variants is not None
+        else cache_dir
     )
+    BuildCache.output_file = output_file
+    ParseCache.cache_dir = cache_dir
+    BuildCache.settings = {
+        "input_file": str(Path(args.input_file).absolute()),
+        "input_dir": str(input_dir),
+        "output_file": output_file.name,
+        "include_verification_code": args.verify,
+        "standalone": args.standalone,
+        "json_schema_output": args.json_schema_output,
+        "native_output": args.native_output,
+        "trim_path": args.trim_path,
+        "data_type": args.data_type,
+        "strip_namespace": args.strip_namespace,
+        "share_groupings": args.share_groupings,
+        "serialization_plans": args.serialization_plans,
+        "shared_types": args.shared_types,
+        "package_output": args.package_output,
+        "defer_build": args.defer_build,
+        "variants": variants,
+        "formats": formats,
+        "pyang_args": unknown_args,
+    }
+    if args.watch:
+        if args.verify or unknown_args:
+            logger.warning(
+                "Watch mode ignores --include-verification and options passed to Pyang."
+            )
+        Watcher.targets = [
+            WatchTarget(
+                input_file=Path(args.input_file).absolute(),
+                output_file=output_file,
+                options=dict(
+                    search_paths=[input_dir],
+                    trim_path=args.trim_path,
+                    data_type=args.data_type,
+                    strip_namespace=args.strip_namespace,
+                    share_groupings=args.share_groupings,
+                    serialization_plans=args.serialization_plans,
+                    standalone=args.standalone,
+                    json_schema=args.json_schema_output,
+                    native=args.native_output,
+                    shared_types=args.shared_types,
+                    package=args.package_output,
+                    defer_build=args.defer_build,
+                    cache_dir=cache_dir,
+                ),
+            )
+        ]
+
     relay_args.append(f"--plugindir={Path(__file__).parent}/plugins")
     relay_args.append("--format=pydantic")
 
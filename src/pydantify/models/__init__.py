@@ -2,8 +2,12 @@ from .base import BaseModel, GeneratedClass, Node, RootModel
 from .typeresolver import TypeResolver
 from .nodefactory import NodeFactory
 from .models import (
+    MODEL_DOCSTRING,
+    CaseNode,
+    ChoiceNode,
     ContainerNode,
     GeneratedClass,
+    LeafListNode,
     LeafNode,
     ListNode,
     ModelRoot,
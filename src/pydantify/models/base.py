@@ -4,11 +4,24 @@ import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, Type
+from functools import cached_property
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+)
 
 from datamodel_code_generator.reference import FieldNameResolver
 from pyang.statements import (
     Statement,
+    data_definition_keywords,
 )
 from pyang.types import Decimal64Value
 from pydantic import BaseModel as PydanticBaseModel
@@ -18,6 +31,7 @@ from pydantic.fields import FieldInfo
 from pydantic_core import PydanticUndefined, PydanticUndefinedType
 
 from ..utility.yang_sources_tracker import YANGSourcesTracker
+from .typeinfo import ListType, NodeType, TypeInfo, UnionType
 
 if TYPE_CHECKING:
     __class__: Type
@@ -53,12 +67,27 @@ class GeneratedClass:
 
     class_name: str | PydanticUndefinedType = PydanticUndefined
     """Output class name"""
-    cls: Type[BaseModel] | Type[RootModel] | PydanticUndefinedType = PydanticUndefined
-    """Ouput model class"""
+    cls_factory: (
+        Callable[[], Type[BaseModel] | Type[RootModel]] | PydanticUndefinedType
+    ) = PydanticUndefined
+    """Builds the output model class. Only called once the class is actually needed."""
     field_info: FieldInfo | PydanticUndefinedType = PydanticUndefined
     """Field info to add to field annotation"""
-    field_annotation: Type | None = None
-    """Annotated type when used """
+    field_annotation_factory: Callable[[Type], Type] | None = None
+    """Wraps the output model class into the annotated type when used, e.g. `List[cls]`"""
+
+    @cached_property
+    def cls(self) -> Type[BaseModel] | Type[RootModel]:
+        """Ouput model class"""
+        self.assert_is_valid()
+        return self.cls_factory()  # type: ignore[operator]
+
+    @property
+    def field_annotation(self) -> Type | None:
+        """Annotated type when used"""
+        if self.field_annotation_factory is None:
+            return None
+        return self.field_annotation_factory(self.cls)
 
     def assert_is_valid(self):
         for prop in self.__dataclass_fields__.keys():
@@ -77,6 +106,22 @@ class GeneratedClass:
         )  # type: ignore
 
 
+_SHARED_KEYWORDS = ("container", "list", "case")
+"""Keywords of the nodes whose output class is shared, if `Node.share_groupings` is set."""
+
+
+def _type_key(type_info: TypeInfo) -> Hashable:
+    """Identifies the nodes a resolved type refers to, e.g. the target of a leafref."""
+    match type_info:
+        case NodeType():
+            return id(type_info.node.canonical())
+        case UnionType():
+            return tuple(_type_key(m) for m in type_info.members)
+        case ListType():
+            return _type_key(type_info.item)
+    return None
+
+
 class Node(ABC):
     _name_count: Dict[str, int] = (
         dict()
@@ -84,10 +129,20 @@ class Node(ABC):
     alias_mapping: Dict[str, str] = dict()
     data_type: Literal["config", "state"] | None
     strip_namespace: bool
+    share_groupings: bool = False
+    """Generate a single class for all expansions of a grouping with the same content."""
+    _shared_nodes: Dict[Hashable, Node] = dict()
+    """Maps the content of a node to the first node with this content."""
+    _included: Dict[Statement, bool] = dict()
+    """Whether the node of a statement is included in the output, according to `data_type`."""
+    serialization_plans: bool = False
+    """Add the `serialization_plan` of its fields to each output class."""
 
     def __init__(self, stm: Statement):
         self.config: bool = __class__.__extract_config(stm)
-        self.children: List[Node] = __class__.extract_statement_list(stm, "i_children")
+        self.children: List[Node] = __class__.statements_to_nodes(
+            __class__.included_statements(stm)
+        )
         namespace: Statement | None = None
         prefix: Statement | None = None
 
@@ -127,6 +182,10 @@ class Node(ABC):
             self.default = convert_default_values(default)
 
         self._name: Optional[str] = None
+        self._selected_children: Optional[List[Node]] = None
+        self._canonical: Optional[Node] = None
+        self.shared: Optional[Node] = None
+        """Node generating the output class of this one, if `share_groupings` is set."""
 
         self._output_model: GeneratedClass = GeneratedClass()
         YANGSourcesTracker.track_from_pos(stm.pos)
@@ -151,9 +210,58 @@ class Node(ABC):
 
     def make_unique_name(self, suffix: str):
         if self._name is None:
-            self._name = Node.ensure_unique_name(f"{self.arg.capitalize()}{suffix}")
+            if Node.share_groupings and self.keyword in _SHARED_KEYWORDS:
+                canonical = self.canonical()
+                self.shared = canonical if canonical is not self else None
+            if self.shared is not None:
+                self._name = self.shared.name()
+            else:
+                self._name = Node.ensure_unique_name(f"{self.arg.capitalize()}{suffix}")
         return self._name
 
+    def canonical(self) -> Node:
+        """Returns the first node with the same content, i.e. generating the same output class."""
+        if self._canonical is None:
+            self._canonical = Node._shared_nodes.setdefault(self.__content_key(), self)
+        return self._canonical
+
+    def __content_key(self) -> Hashable:
+        """Identifies the output class of the node by the statements it is generated from.
+
+        Statements expanded from a grouping keep the position of their definition in it, so
+        all expansions of a grouping with the same refinements and augmentations get the same
+        key. Nodes only wrapping expanded statements are identified by their content.
+        Anything else is unique.
+        """
+        stm = self.raw_statement
+        origin: Hashable = id(stm)
+        if len(self.children) > 0 and all(
+            hasattr(ch.raw_statement, "i_uses") for ch in self.children
+        ):
+            origin = stm.keyword
+        elif hasattr(stm, "i_uses"):
+            origin = (stm.pos.ref, stm.pos.line, stm.keyword, stm.arg)
+        own = tuple(
+            (s.keyword, s.arg)
+            for s in self.substmts
+            if s.keyword not in data_definition_keywords
+        )
+        children = tuple(
+            (ch.arg, ch.config, ch.mandatory, id(ch.canonical()))
+            for ch in self.children
+        )
+        type_info = getattr(self, "type_info", None)
+        return (
+            type(self),
+            self.namespace,
+            self.prefix,
+            origin,
+            own,
+            children,
+            id(stm.search_one("type")),
+            _type_key(type_info) if type_info is not None else None,
+        )
+
     @classmethod
     def ensure_unique_name(cls, name: str) -> str:
         count: int = Node._name_count.setdefault(name, 0)
@@ -201,6 +309,29 @@ class Node(ABC):
         output_model.__doc__ = self.description or ""
         return output_model
 
+    def selected_children(self) -> List[Node]:
+        """Returns the children included in the output, according to `data_type`.
+
+        Evaluated once, when called at the end of the node's initialization, as it may mark
+        the node itself as state data.
+        """
+        if self._selected_children is None:
+            self._selected_children = [
+                ch
+                for ch in self.children
+                if (
+                    self.data_type == "config"
+                    and ch.config is True
+                    or self.data_type == "state"
+                    and ch.config is False
+                    or self.data_type is None
+                    or ch.mandatory is True
+                )
+            ]
+            if len(self._selected_children) > 0 and self.data_type == "state":
+                self.config = False
+        return self._selected_children
+
     def _children_to_fields(self) -> Dict[str, Tuple[type, FieldInfo]]:
         ret: Dict[str, Tuple[type, FieldInfo]] = dict()
         ret["namespace"] = (
@@ -213,25 +344,71 @@ class Node(ABC):
             str,
             FieldInfo(default=self.prefix, json_schema_extra={"x-is-classvar": True}),
         )
-        for ch in self.children:
-            if (
-                self.data_type == "config"
-                and ch.config is True
-                or self.data_type == "state"
-                and ch.config is False
-                or self.data_type is None
-                or ch.mandatory is True
-            ):
-                ret[ch.arg] = ch._output_model.to_field()
+        if Node.serialization_plans:
+            key = (
+                self.raw_statement.search_one("key") if self.keyword == "list" else None
+            )
+            ret["serialization_plan"] = (
+                List[List[Optional[str]]],
+                FieldInfo(
+                    default=Node.serialization_plan(
+                        self.selected_children(), key.arg.split() if key else []
+                    ),
+                    json_schema_extra={"x-is-classvar": True},
+                ),
+            )
+        for ch in self.selected_children():
+            ret[ch.arg] = ch._output_model.to_field()
+        return ret
 
-        if len(ret) > 2 and self.data_type == "state":
-            self.config = False
+    @staticmethod
+    def serialization_plan(
+        children: List[Node], keys: List[str]
+    ) -> List[List[Optional[str]]]:
+        """Returns the qualified name, namespace, module prefix and keyword of the nodes of a class's fields.
+
+        The entries are in the order of the XML elements, where the keys of a list come first.
+        """
+        first = [ch for key in keys for ch in children if ch.arg == key]
+        ordered = first + [ch for ch in children if ch not in first]
+        return [
+            [ch.get_qualified_name(), ch.namespace, ch.prefix, ch.keyword]
+            for ch in ordered
+        ]
 
-        return ret
+    @staticmethod
+    def statements_to_nodes(statements: List[Statement]) -> List[Node]:
+        from .nodefactory import NodeFactory
+
+        return [ch for ch in map(NodeFactory.generate, statements) if ch is not None]
 
     @staticmethod
-    def extract_statement_list(statement: Statement, attr_name: str) -> List[Node]:
+    def included_statements(stm: Statement) -> List[Statement]:
+        """Returns the child statements whose nodes are included in the output, according to `data_type`.
+
+        Applies the filter of `selected_children` to the statements, so that no node is built for
+        the subtrees it would drop. List keys are mandatory, and included in either data type.
+        """
+        children: List[Statement] = getattr(stm, "i_children", [])
+        if Node.data_type is None:
+            return children
+        key = stm.search_one("key") if stm.keyword == "list" else None
+        keys = key.arg.split() if key is not None else []
+        return [ch for ch in children if ch.arg in keys or Node.__is_included(ch)]
+
+    @staticmethod
+    def __is_included(stm: Statement) -> bool:
         from .nodefactory import NodeFactory
 
-        rv = getattr(statement, attr_name, [])
-        return [ch for ch in map(NodeFactory.generate, rv) if ch is not None]
+        included = Node._included.get(stm, None)
+        if included is None:
+            config = Node.__extract_config(stm)
+            if stm.keyword in NodeFactory._ignored_types:
+                included = False
+            elif Node.data_type == "config":
+                included = config is True
+            else:
+                # Nodes with selected children are marked as state data, see `selected_children`
+                included = config is False or len(Node.included_statements(stm)) > 0
+            Node._included[stm] = included
+        return included
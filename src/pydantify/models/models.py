@@ -17,6 +17,7 @@ from pydantic import create_model
 from pydantic.fields import Field, FieldInfo
 
 from . import BaseModel, GeneratedClass, Node, NodeFactory, RootModel, TypeResolver
+from .typeinfo import TypeInfo
 
 if TYPE_CHECKING:
     __class__: type
@@ -34,19 +35,19 @@ class TypeDefNode(Node):
                 self.default if self.default is not None or not self.mandatory else ...,
                 alias=self.get_qualified_name(),
             ),  # type: ignore[arg-type]
-            cls=self.to_pydantic_model(),
+            cls_factory=self.to_pydantic_model,
         )
+        self.type_info: TypeInfo = TypeResolver.resolve_statement(self.raw_statement)
 
     def get_base_class(self) -> type | Node | Enum:
-        base = TypeResolver.resolve_statement(self.raw_statement)
-        return base
+        return self.type_info.to_runtime()
 
     def name(self) -> str:
         return self.make_unique_name(suffix="Type")
 
     def to_pydantic_model(self) -> type[RootModel]:
         """Generates the output class representing this Typedef."""
-        base_type = TypeResolver.resolve_statement(self.raw_statement)
+        base_type = self.get_base_class()
         output_model: type[RootModel] = create_model(
             self.name(),
             __base__=(RootModel[base_type],),  # type: ignore[misc]
@@ -68,24 +69,21 @@ class LeafNode(Node):
                 description=self.description,
                 alias=self.get_qualified_name(),
             ),  # type: ignore[arg-type]
-            cls=self.to_pydantic_model(),
+            cls_factory=self.to_pydantic_model,
         )
+        self.type_info: TypeInfo = TypeResolver.resolve_statement(self.raw_statement)
 
     def name(self) -> str:
         return self.make_unique_name(suffix="Leaf")
 
     def get_base_class(self) -> type | Node | Enum:
-        base = TypeResolver.resolve_statement(self.raw_statement)
-        return base
+        return self.type_info.to_runtime()
 
     def to_pydantic_model(self) -> type[BaseModel | RootModel]:
         """Generates the output class representing this node."""
         fields: Dict[str, Any] = self._children_to_fields()
         base: Any = self.get_base_class()
 
-        if isinstance(base, Node):
-            base = base._output_model.cls
-
         output_model: type[BaseModel] | type[RootModel]
         if base is not None:
             output_model = create_model(
@@ -108,8 +106,9 @@ class CaseNode(Node):
         self._output_model = GeneratedClass(
             class_name=self.name(),
             field_info=Field(..., alias=self.get_qualified_name()),
-            cls=self.to_pydantic_model(),
+            cls_factory=self.to_pydantic_model,
         )
+        self.selected_children()
 
     def name(self) -> str:
         return self.make_unique_name(suffix="Case")
@@ -136,8 +135,9 @@ class ChoiceNode(Node):
             field_info=Field(  # type: ignore[arg-type]
                 ... if self.mandatory else None, alias=self.get_qualified_name()
             ),
-            cls=self.to_pydantic_model(),
+            cls_factory=self.to_pydantic_model,
         )
+        self.selected_children()
 
     def name(self) -> str:
         return self.make_unique_name(suffix="Choice")
@@ -147,6 +147,7 @@ class ChoiceNode(Node):
         fields: Dict[str, Any] = self._children_to_fields()
         fields.pop("namespace")
         fields.pop("prefix")
+        fields.pop("serialization_plan", None)
         bases: tuple = tuple(x[0] for x in fields.values())
         output_model: type[BaseModel] = Union[bases]  # type: ignore
         return output_model
@@ -165,8 +166,9 @@ class ContainerNode(Node):
                 ... if self.mandatory else None,
                 alias=self.get_qualified_name(),
             ),
-            cls=self.to_pydantic_model(),
+            cls_factory=self.to_pydantic_model,
         )
+        self.selected_children()
 
     def name(self) -> str:
         return self.make_unique_name(suffix="Container")
@@ -193,15 +195,15 @@ class ListNode(Node):
                     )
                     ch._output_model.field_info = new_field_info
 
-        output_class = self.to_pydantic_model()
         self._output_model = GeneratedClass(
             class_name=self.name(),
-            cls=output_class,
-            field_annotation=List[output_class],  # type: ignore
+            cls_factory=self.to_pydantic_model,
+            field_annotation_factory=lambda cls: List[cls],  # type: ignore[valid-type]
             field_info=Field(  # type: ignore[arg-type]
                 ... if self.mandatory else [], alias=self.get_qualified_name()
             ),
         )
+        self.selected_children()
 
     @staticmethod
     def __extract_keys(stm: Statement) -> List[str]:
@@ -233,33 +235,29 @@ class LeafListNode(Node):
         else:
             default = self.default
 
-        output_class = self.to_pydantic_model()
         self._output_model = GeneratedClass(
             class_name=self.name(),
-            cls=output_class,
-            field_annotation=List[output_class],  # type: ignore
+            cls_factory=self.to_pydantic_model,
+            field_annotation_factory=lambda cls: List[cls],  # type: ignore[valid-type]
             field_info=Field(
                 default,
                 description=self.description,
                 alias=self.get_qualified_name(),
             ),  # type: ignore[arg-type]
         )
+        self.type_info: TypeInfo = TypeResolver.resolve_statement(self.raw_statement)
 
     def name(self) -> str:
         return self.make_unique_name(suffix="LeafList")
 
     def get_base_class(self) -> type | Node | Enum:
-        base = TypeResolver.resolve_statement(self.raw_statement)
-        return base
+        return self.type_info.to_runtime()
 
     def to_pydantic_model(self) -> type[BaseModel | RootModel]:
         """Generates the output class representing this node."""
         fields: Dict[str, Any] = self._children_to_fields()
         base: Any = self.get_base_class()
 
-        if isinstance(base, Node):
-            base = base._output_model.cls
-
         output_model: type[BaseModel] | type[RootModel]
         if base is not None:
             output_model = create_model(
@@ -279,13 +277,12 @@ class ModuleNode(Node):
         assert isinstance(stm, ModSubmodStatement)
         super().__init__(stm)
 
-        output_class = self.to_pydantic_model()
         self._output_model = GeneratedClass(
             class_name=self.name(),
-            cls=output_class,
-            field_annotation=output_class,
+            cls_factory=self.to_pydantic_model,
             field_info=Field(...),
         )
+        self.selected_children()
 
     def to_pydantic_model(self) -> type[BaseModel] | type[RootModel]:
         return super().to_pydantic_model()
@@ -294,9 +291,35 @@ class ModuleNode(Node):
         return self.make_unique_name(suffix="Module")
 
 
+MODEL_DOCSTRING = """
+Initialize an instance of this class and serialize it to JSON; this results in a RESTCONF payload.
+
+## Tips
+Initialization:
+- all values have to be set via keyword arguments
+- if a class contains only a `root` field, it can be initialized as follows:
+    - `member=MyNode(root=<value>)`
+    - `member=<value>`
+
+Serialziation:
+- `exclude_defaults=True` omits fields set to their default value (recommended)
+- `by_alias=True` ensures qualified names are used (necessary)
+"""
+
+
 class ModelRoot:
-    def __init__(self, stm: type[Statement]):
-        self.root_node: Node | None = NodeFactory.generate(stm)
+    def __init__(self, stm: Statement | List[Statement]):
+        nodes = Node.statements_to_nodes(stm if isinstance(stm, list) else [stm])
+        self.root_node: Node | None = nodes[0] if nodes else None
+        self.branches: List[Node] = nodes
+        """Nodes of the trimmed branches, or the module node."""
+
+    def field_nodes(self) -> List[Node]:
+        """Returns the nodes that become fields of the output `Model` class."""
+        if isinstance(self.root_node, ModuleNode):
+            # Take only children, as the module itself is represented by `Model`
+            return self.root_node.selected_children()
+        return self.branches
 
     def to_pydantic_model(self) -> type[BaseModel] | None:
         fields: Dict
@@ -319,23 +342,19 @@ class ModelRoot:
                         json_schema_extra={"x-is-classvar": True},
                     ),
                 ),
-                self.root_node.arg: self.root_node.get_output_class().to_field(),
             }
+            if Node.serialization_plans:
+                fields["serialization_plan"] = (
+                    List[List[Optional[str]]],
+                    FieldInfo(
+                        default=Node.serialization_plan(self.branches, []),
+                        json_schema_extra={"x-is-classvar": True},
+                    ),
+                )
+            for node in self.branches:
+                fields[node.arg] = node.get_output_class().to_field()
         output_model: type[BaseModel] = create_model(
             "Model", __base__=(BaseModel,), **fields
         )
-        output_model.__doc__ = """
-Initialize an instance of this class and serialize it to JSON; this results in a RESTCONF payload.
-
-## Tips
-Initialization:
-- all values have to be set via keyword arguments
-- if a class contains only a `root` field, it can be initialized as follows:
-    - `member=MyNode(root=<value>)`
-    - `member=<value>`
-
-Serialziation:
-- `exclude_defaults=True` omits fields set to their default value (recommended)
-- `by_alias=True` ensures qualified names are used (necessary)
-"""
+        output_model.__doc__ = MODEL_DOCSTRING
         return output_model if fields else None
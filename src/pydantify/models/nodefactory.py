@@ -9,6 +9,8 @@ from typing_extensions import Self
 
 from pydantify.exceptions import NotImplementedException
 
+from ..utility.profiler import Profiler
+
 from . import Node, TypeResolver
 
 logger = logging.getLogger("pydantify")
@@ -55,6 +57,14 @@ class NodeFactory:
                     f'"{stm.keyword}" has not yet been implemented as a type.'
                 )
             mapping = cls._implemented_mappings[stm.keyword]
-            node = mapping.maps_to(stm)
+            if Profiler.statements or Profiler.memory:
+                with Profiler.statement(stm):
+                    node = mapping.maps_to(stm)
+            else:
+                node = mapping.maps_to(stm)
+            if node.shared is not None:
+                # Expansion of a grouping seen before, reuse its class
+                shared = node.shared.get_output_class()
+                node.get_output_class().cls_factory = lambda: shared.cls
             TypeResolver.register(stm, node)
             return node
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import cached_property
+from types import NoneType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
+
+from pydantic.types import conbytes, confloat, conint, conlist, constr
+
+if TYPE_CHECKING:
+    from .base import Node
+
+
+class TypeInfo(ABC):
+    """Resolved YANG type of a leaf, leaf-list or typedef.
+
+    Independent of Pydantic, so output can be written without building any model classes.
+    `to_runtime()` converts it into the annotation used for `pydantic.create_model`.
+    """
+
+    @abstractmethod
+    def to_runtime(self) -> Any:
+        pass
+
+
+_CONSTRAINED_TYPES: Dict[type, Callable[..., Any]] = {
+    int: conint,
+    float: confloat,
+    str: constr,
+    bytes: conbytes,
+}
+
+
+@dataclass(eq=False)
+class BuiltinType(TypeInfo):
+    """A Python builtin, optionally constrained (`ge`, `le`, `min_length`, `max_length`, `pattern`)."""
+
+    python_type: type
+    constraints: Dict[str, Any] = field(default_factory=dict)
+
+    def to_runtime(self) -> Any:
+        if self.constraints:
+            return _CONSTRAINED_TYPES[self.python_type](**self.constraints)
+        return self.python_type
+
+
+@dataclass(eq=False)
+class ListType(TypeInfo):
+    """A list of items with length bounds, e.g. YANG `empty`, represented as `[null]`."""
+
+    item: TypeInfo
+    min_length: int | None = None
+    max_length: int | None = None
+
+    def to_runtime(self) -> Any:
+        return conlist(
+            self.item.to_runtime(),
+            min_length=self.min_length,
+            max_length=self.max_length,
+        )
+
+
+@dataclass(eq=False)
+class EnumType(TypeInfo):
+    name: str
+    values: List[str]
+
+    def to_runtime(self) -> Any:
+        return self.runtime_enum
+
+    @cached_property
+    def runtime_enum(self) -> type[Enum]:
+        return Enum(self.name, {x: x for x in self.values})  # type: ignore[return-value]
+
+
+@dataclass(eq=False)
+class UnionType(TypeInfo):
+    members: List[TypeInfo]
+
+    def to_runtime(self) -> Any:
+        return Union[tuple(member.to_runtime() for member in self.members)]  # type: ignore
+
+
+@dataclass(eq=False)
+class NodeType(TypeInfo):
+    """The output class of another node, i.e. a typedef or the target of a leafref."""
+
+    node: Node
+
+    def to_runtime(self) -> Any:
+        return self.node.get_output_class().cls
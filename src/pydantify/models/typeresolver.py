@@ -1,5 +1,4 @@
-from enum import Enum
-from typing import Dict, List, Optional, Type, Union
+from typing import Dict, List, Optional, Type
 from types import NoneType
 
 from pyang.statements import Statement, TypedefStatement, TypeStatement
@@ -25,12 +24,18 @@ from pyang.types import (
     UnionTypeSpec,
     XSDPattern,
 )
-from pydantic.types import conbytes, confloat, conint, constr, conlist
-from pydantic_core import PydanticUndefinedType
 from typing_extensions import Self
 
 from ..utility.patterns import convert_pattern
 from . import Node
+from .typeinfo import (
+    BuiltinType,
+    EnumType,
+    ListType,
+    NodeType,
+    TypeInfo,
+    UnionType,
+)
 
 
 class TypeResolver:
@@ -40,17 +45,33 @@ class TypeResolver:
     def get_model_if_known(cls: Type[Self], stm: Statement) -> Node | None:
         return TypeResolver.__mapping.get(stm, None)
 
+    @classmethod
+    def reset(cls: Type[Self]) -> None:
+        """Forgets the nodes of all statements, e.g. to build another node tree from them."""
+        cls.__mapping = dict()
+
     @classmethod
     def register(cls: Type[Self], stm: Statement, model: Node):
         assert isinstance(model, Node) and isinstance(stm, Statement)
         cls.__mapping[stm] = model
 
     @classmethod
-    def resolve_statement(cls: Type[Self], stm: Statement) -> type | Node | Enum:
+    def typedef_node(cls: Type[Self], typedef: TypedefStatement) -> Node:
+        """Returns the node of a typedef, creating it on first use."""
+        ret = cls.__mapping.get(typedef, None)
+        if ret is None:
+            from . import TypeDefNode
+
+            ret = TypeDefNode(typedef)
+            cls.register(typedef, ret)
+        return ret
+
+    @classmethod
+    def resolve_statement(cls: Type[Self], stm: Statement) -> TypeInfo:
         # Check if already known
         ret: Optional[Node] = cls.__mapping.get(stm, None)
         if ret is not None:
-            return ret
+            return NodeType(ret)
 
         # If not known, check type definition
         stm_type: TypeStatement = stm.search_one(keyword="type")
@@ -64,25 +85,12 @@ class TypeResolver:
         return cls.__resolve_type_statement(stm_type=stm_type)
 
     @classmethod
-    def __resolve_type_statement(
-        cls: Type[Self], stm_type: TypeStatement
-    ) -> type | Enum:
+    def __resolve_type_statement(cls: Type[Self], stm_type: TypeStatement) -> TypeInfo:
         typespec: TypeSpec = getattr(stm_type, "i_type_spec", None)
         typedef: TypedefStatement = getattr(stm_type, "i_typedef", None)
 
         if typedef is not None:  # Type is a typedef
-            ret = cls.__mapping.get(typedef, None)
-            if ret is None:
-                from . import TypeDefNode
-
-                typedef_node: Node = TypeDefNode(typedef)
-                cls.register(typedef, typedef_node)
-                output_type = typedef_node._output_model.cls
-            else:
-                output_type = ret._output_model.cls
-            if isinstance(output_type, PydanticUndefinedType):
-                raise Exception(f"{typedef_node} output model is Undefined")
-            return output_type
+            return NodeType(cls.typedef_node(typedef))
 
         if typespec is not None:  # Type is a base type
             resolved = cls.__resolve_type_spec(typespec)
@@ -91,7 +99,7 @@ class TypeResolver:
         assert False  ## Not yet implemented
 
     @classmethod
-    def __resolve_type_spec(cls: Type[Self], spec: TypeSpec) -> type | Enum:
+    def __resolve_type_spec(cls: Type[Self], spec: TypeSpec) -> TypeInfo:
         from . import Node, NodeFactory
 
         match (spec.__class__.__qualname__):
@@ -100,16 +108,15 @@ class TypeResolver:
                     spec.base.min = spec.min
                     spec.base.max = spec.max
                     return cls.__resolve_type_spec(spec.base)
-                return conint(ge=spec.min, le=spec.max)
+                return BuiltinType(int, {"ge": spec.min, "le": spec.max})
             case LengthTypeSpec.__qualname__:
-                return constr(
-                    min_length=spec.min,
-                    max_length=spec.max,
+                return BuiltinType(
+                    str, {"min_length": spec.min, "max_length": spec.max}
                 )
             case EnumTypeSpec.__qualname__:
-                return Enum(
-                    Node.ensure_unique_name(f"{spec.name}Enum"),
-                    {x: x for x, _ in spec.enums},
+                return EnumType(
+                    name=Node.ensure_unique_name(f"{spec.name}Enum"),
+                    values=[x for x, _ in spec.enums],
                 )  # TODO: make separate node type
             case PathTypeSpec.__qualname__:
                 target_statement = getattr(spec, "i_target_node", None)
@@ -132,12 +139,9 @@ class TypeResolver:
                     NodeFactory.generate(target_statement)
                 node = cls.__mapping.get(target_statement)
                 if isinstance(node, Node):
-                    return node._output_model.cls  # type: ignore
+                    return NodeType(node)
             case IntTypeSpec.__qualname__:
-                return conint(
-                    ge=spec.min,
-                    le=spec.max,
-                )
+                return BuiltinType(int, {"ge": spec.min, "le": spec.max})
             case Decimal64TypeSpec.__qualname__:
                 # Workaround until pyang.type.Decimal64Value contains fd
                 # prefered way: `spec.min.value * 10**-spec.min.fd`
@@ -153,25 +157,21 @@ class TypeResolver:
                 min_value = conv_to_float(spec.min.s)
                 max_value = conv_to_float(spec.max.s)
 
-                return confloat(
-                    ge=min_value,
-                    le=max_value,
-                )
+                return BuiltinType(float, {"ge": min_value, "le": max_value})
             case StringTypeSpec.__qualname__:
-                return str
+                return BuiltinType(str)
             case BooleanTypeSpec.__qualname__:
-                return bool
+                return BuiltinType(bool)
             case BinaryTypeSpec.__qualname__:
-                return conbytes(
-                    min_length=spec.min,
-                    max_length=spec.max,
+                return BuiltinType(
+                    bytes, {"min_length": spec.min, "max_length": spec.max}
                 )
             case PatternTypeSpec.__qualname__:
                 pattern = cls.__resolve_pattern(patterns=spec.res)
-                return constr(pattern=convert_pattern(pattern))
+                return BuiltinType(str, {"pattern": convert_pattern(pattern)})
             case EmptyTypeSpec.__qualname__:
                 # Empty is represented as `[null]`
-                return conlist(NoneType, min_length=1, max_length=1)
+                return ListType(BuiltinType(NoneType), min_length=1, max_length=1)
             case (
                 IdentityrefTypeSpec.__qualname__
             ):  # TODO: abort before entering this stage?
@@ -201,14 +201,15 @@ class TypeResolver:
                 #     raise Exception(f"No node {name} not found with prefix {prefix}")
 
                 # return find_identityref(spec)
-                return str
+                return BuiltinType(str)
             case UnionTypeSpec.__qualname__:
-                union = tuple([cls.__resolve_type_statement(typ) for typ in spec.types])
-                return Union[union]  # type: ignore
+                return UnionType(
+                    [cls.__resolve_type_statement(typ) for typ in spec.types]
+                )
             case BitTypeSpec.__qualname__:
                 # Crafting a pattern like: ^(flag1|flag2|flag3|\s)*$
                 pattern = "^(" + "|".join([b[0] for b in spec.bits]) + "|\\s)*$"
-                return constr(pattern=pattern)
+                return BuiltinType(str, {"pattern": pattern})
         assert False, f'Spec "{spec.__class__.__qualname__}" not yet implemented.'
 
     @classmethod
@@ -0,0 +1,108 @@
+import os
+from argparse import ArgumentParser
+
+
+def add_compile_options(parser: ArgumentParser, *, local: bool = True) -> None:
+    """Adds the options shared by `pydantify`, `pydantify build` and `pydantify client`.
+
+    :param local: Also add the options that only work in the process writing the output:
+        `--package`, `--shared-types` and `--cache-dir`.
+    """
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        dest="output_dir",
+        help='The directory that should be used to store the output model. Defaults to "$CWD/out".',
+        default=f"{os.getcwd()}/out/",
+    )
+    parser.add_argument(
+        "-t",
+        "--trim-path",
+        action="append",
+        dest="trim_path",
+        help='Get only the specified branch of the whole tree. Path elements may be glob patterns, e.g. "interfaces/*/config". Can be repeated to get several branches.',
+        default=None,
+    )
+    parser.add_argument(
+        "-S",
+        "--standalone",
+        action="store_true",
+        dest="standalone",
+        help="Generated output model has no dependency on Pydantify. All required code is copied into the output model.",
+        default=False,
+    )
+    parser.add_argument(
+        "-j",
+        "--json-schema",
+        action="store_true",
+        dest="json_schema_output",
+        help="Output JSON schema instead of Pydantic models.",
+        default=False,
+    )
+    parser.add_argument(
+        "--native",
+        action="store_true",
+        dest="native_output",
+        help="Write the output directly from the YANG tree instead of building Pydantic models first. Faster, but the Pydantic output is not identical.",
+        default=False,
+    )
+    parser.add_argument(
+        "-d",
+        "--data-type",
+        action="store",
+        dest="data_type",
+        choices=["config", "state"],
+        help="Limit output to config or state only. Default is config and state combined.",
+        default=None,
+    )
+    parser.add_argument(
+        "-n",
+        "--strip-namespace",
+        action="store_true",
+        dest="strip_namespace",
+        help="Strip the YANG namespace from the output model aliases.",
+        default=False,
+    )
+    parser.add_argument(
+        "--share-groupings",
+        action="store_true",
+        dest="share_groupings",
+        help="Generate a single class for all uses of a grouping with the same refinements and augmentations, instead of one class per use.",
+        default=False,
+    )
+    parser.add_argument(
+        "--serialization-plans",
+        action="store_true",
+        dest="serialization_plans",
+        help="Add to each generated class the qualified name, namespace, module prefix and kind of its fields, in the order of their XML elements, used by the NETCONF XML serializer.",
+        default=False,
+    )
+    parser.add_argument(
+        "--defer-build",
+        action="store_true",
+        dest="defer_build",
+        help="Build the validators of the generated models on first use instead of on import, and add a warm_up() function building them ahead of time.",
+        default=False,
+    )
+    if not local:
+        return
+    parser.add_argument(
+        "--package",
+        action="store_true",
+        dest="package_output",
+        help="Write the output model as a package with one submodule per top-level node, each imported when first used. Requires --native.",
+        default=False,
+    )
+    parser.add_argument(
+        "--shared-types",
+        action="store_true",
+        dest="shared_types",
+        help="Generate the typedefs and identities of imported modules into a yang_types package next to the output model, which imports them from there. Requires --native.",
+        default=False,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        help="Cache parsed YANG modules and generated output models in this directory and reuse them while neither the YANG files nor the options change.",
+        default=None,
+    )
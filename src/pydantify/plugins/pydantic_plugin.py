@@ -1,15 +1,21 @@
 import logging
 import os
+import sys
 import time
 from io import TextIOWrapper
-from typing import Dict
+from pathlib import Path
+from typing import Dict, List
 
 import psutil
 from pyang.context import Context
 from pyang.plugin import PyangPlugin, register_plugin
 from pyang.statements import ModSubmodStatement
 
+from pydantify.exceptions import CompilationError
+from pydantify.utility import YANGSourcesTracker
 from pydantify.utility.model_generator import ModelGenerator
+from pydantify.utility.parse_cache import ParseCache
+from pydantify.utility.profiler import Profiler
 
 logger = logging.getLogger("pydantify")
 
@@ -31,11 +37,45 @@ class Pydantify(PyangPlugin):
         self.handle_comments = True
         logger.debug("Plugin registered for pydantic format.")
 
+    def setup_ctx(self, ctx: Context):
+        """Reuse previously parsed modules, if a cache is configured."""
+        if ParseCache.enabled():
+            ParseCache.install()
+        Profiler.begin("pyang parse")
+
+    def pre_validate_ctx(self, ctx: Context, modules: List[ModSubmodStatement]):
+        Profiler.end("pyang parse")
+        Profiler.begin("pyang validate")
+
+    def post_validate_ctx(self, ctx: Context, modules: List[ModSubmodStatement]):
+        Profiler.end("pyang validate")
+
     def emit(self, ctx: Context, modules: ModSubmodStatement, fd: TextIOWrapper):
         """Convert yang model."""
         start = psutil.Process(os.getpid()).create_time()
         logger.debug(f"Pyang completed parsing in {time.time() - start:.3f}s.")
+        if ParseCache.enabled():
+            logger.debug(f"Parse cache: {ParseCache.stats()}")
+
+        # Every loaded module (imports, deviations) is an input of this build.
+        YANGSourcesTracker.reset()
+        for module in ctx.modules.values():
+            YANGSourcesTracker.track_from_pos(module.pos)
 
         start = time.time()
-        ModelGenerator.generate(ctx=ctx, modules=modules, fd=fd)
+        try:
+            with Profiler.phase("generate"):
+                ModelGenerator.generate(ctx=ctx, modules=modules, fd=fd)
+                if ModelGenerator.package_output:
+                    ModelGenerator.write_package_files(Path(fd.name).parent)
+                if ModelGenerator.variant_files:
+                    ModelGenerator.write_variant_files(Path(fd.name).parent)
+                if ModelGenerator.shared_types:
+                    ModelGenerator.write_type_modules(
+                        ModelGenerator.output_dir,
+                        ModelGenerator.generate_type_modules(),
+                    )
+        except CompilationError as e:
+            logger.error(f"{e} Exiting.")
+            sys.exit(1)
         logger.info(f"Output model generated in {time.time() - start:.3f}s.")
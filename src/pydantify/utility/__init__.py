@@ -1,3 +1,11 @@
 from .yang_sources_tracker import YANGSourcesTracker
 from .function_tools import function_content_to_source_code, function_to_source_code
-from .restconf import restconf_patch_request
+from .restconf import (
+    RestconfClient,
+    RestconfJob,
+    RestconfJobResult,
+    RestconfRequest,
+    RestconfResult,
+    restconf_patch_request,
+)
+from .warm_up import warm_up
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+
+from typing_extensions import Self
+
+from .yang_sources_tracker import YANGSourcesTracker
+
+logger = logging.getLogger("pydantify")
+
+
+def file_digest(path: Path) -> str:
+    """Returns the SHA-256 hex digest of a file's content."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class BuildCache:
+    """On-disk cache of generated output models.
+
+    Every build is recorded in a manifest keyed by the effective generator settings. The manifest
+    holds the digest of every YANG file the output depends on (as recorded by `YANGSourcesTracker`)
+    and the digest of the output file, whose content is stored once under `objects/<digest>`.
+    A build can be restored from the cache if none of the recorded YANG files changed since.
+    """
+
+    cache_dir: Optional[Path] = None
+    settings: Dict[str, Any] = dict()
+    output_file: Path
+
+    @classmethod
+    def enabled(cls: Type[Self]) -> bool:
+        return cls.cache_dir is not None
+
+    @classmethod
+    def key(cls: Type[Self]) -> str:
+        """Hash of all settings influencing the generated output, including tool versions."""
+        settings = dict(cls.settings)
+        for package in ("pydantify", "pyang", "pydantic", "datamodel-code-generator"):
+            try:
+                settings[f"version:{package}"] = version(package)
+            except PackageNotFoundError:  # pragma: no cover
+                settings[f"version:{package}"] = None
+        encoded = json.dumps(settings, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    @classmethod
+    def restore(cls: Type[Self]) -> bool:
+        """Copies the cached output to `output_file` if it is still up to date. Returns whether it was."""
+        if cls.cache_dir is None:
+            return False
+        manifest_file = cls.cache_dir / "manifests" / f"{cls.key()}.json"
+        if not manifest_file.is_file():
+            logger.debug("Build cache miss: no previous build with these settings.")
+            return False
+        manifest: Dict[str, Any] = json.loads(manifest_file.read_text())
+        for source, digest in manifest["sources"].items():
+            if not Path(source).is_file() or file_digest(Path(source)) != digest:
+                logger.debug(f'Build cache miss: "{source}" changed.')
+                return False
+        blob = cls.cache_dir / "objects" / manifest["output"]
+        if not blob.is_file():
+            logger.debug("Build cache miss: cached output is missing.")
+            return False
+
+        shutil.copyfile(blob, cls.output_file)
+        YANGSourcesTracker.reset()
+        for source in manifest["sources"].keys():
+            YANGSourcesTracker.track_file(source)
+        logger.info(f'Restored "{cls.output_file.name}" from build cache.')
+        return True
+
+    @classmethod
+    def store(cls: Type[Self]) -> None:
+        """Records the output of the last build in the cache."""
+        if cls.cache_dir is None or not cls.output_file.is_file():
+            return
+        objects_dir = cls.cache_dir / "objects"
+        manifests_dir = cls.cache_dir / "manifests"
+        os.makedirs(objects_dir, exist_ok=True)
+        os.makedirs(manifests_dir, exist_ok=True)
+
+        output_digest = file_digest(cls.output_file)
+        blob = objects_dir / output_digest
+        if not blob.exists():
+            cls.__atomic_copy(cls.output_file, blob)
+        manifest = {
+            "sources": {
+                source: file_digest(Path(source))
+                for source in sorted(YANGSourcesTracker.relevant_files())
+            },
+            "output": output_digest,
+        }
+        manifest_file = manifests_dir / f"{cls.key()}.json"
+        tmp_file = manifest_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp_file, manifest_file)
+        logger.debug(f'Stored build in cache "{manifest_file}".')
+
+    @staticmethod
+    def __atomic_copy(src: Path, dst: Path) -> None:
+        tmp_file = dst.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp_file)
+        os.replace(tmp_file, dst)
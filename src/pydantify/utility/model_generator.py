@@ -1,30 +1,60 @@
+import copy
 import json
 import logging
-import sys
+import os
+import re
 from collections import defaultdict
-from io import TextIOWrapper
+from fnmatch import fnmatchcase
+from io import StringIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    TextIO,
+    Type,
+)
 
-from datamodel_code_generator.config import JSONSchemaParserConfig
-from datamodel_code_generator.model import pydantic_v2
-from datamodel_code_generator.parser.base import Result
-from datamodel_code_generator.parser.jsonschema import JsonSchemaParser
 from pyang.context import Context
 from pyang.statements import ModSubmodStatement, Statement
 from pydantic import BaseModel
 from typing_extensions import Self
 
-from ..models import ModelRoot, Node
-from ..utility import restconf_patch_request
+from ..exceptions import CompilationError
+from ..models import ModelRoot, Node, TypeResolver
+from ..utility import restconf_patch_request, warm_up
+from .profiler import Profiler
 from . import (
     YANGSourcesTracker,
     function_content_to_source_code,
     function_to_source_code,
 )
 
+if TYPE_CHECKING:
+    from datamodel_code_generator.parser.base import Result
+
 logger = logging.getLogger("pydantify")
 
+VARIANTS: Dict[str, Literal["config", "state"] | None] = {
+    "full": None,
+    "config": "config",
+    "state": "state",
+}
+"""Output variants, by name, with the `data_type` they are generated with."""
+FORMATS = ("py", "json")
+"""Output formats, Pydantic models and JSON schema, by file extension."""
+
+_GLOB_CHARACTERS = re.compile(r"[*?\[]")
+"""Characters turning an element of a trim path into a glob pattern."""
+
+_REGEX_ENGINE_CONFIG = re.compile(r'(\n( +)regex_engine="python-re",\n)')
+"""The last `ConfigDict` argument datamodel-code-generator writes for every class."""
+
+_CLASS_DEFINITION = re.compile(r"^class ", re.MULTILINE)
+
 
 # Helper function
 def dynamically_serialized_helper_function():  # pragma: no cover
@@ -68,64 +98,255 @@ class ModelGenerator:
     input_dir: Path
     output_dir: Path
     standalone: bool = False
-    trim_path: Optional[str] = None
+    trim_path: Optional[List[str]] = None
+    """Paths of the branches to generate, instead of the whole module. See `trim_branches`."""
     json_schema_output: bool
+    native_output: bool = False
+    shared_types: bool = False
+    package_output: bool = False
+    defer_build: bool = False
+    package_files: Dict[str, str] = dict()
+    """Source code of the submodules of the output package, by file name."""
+    type_modules: Dict[str, ModSubmodStatement] = dict()
+    """Modules whose shared type module the generated models import, by name."""
+    variants: Optional[List[str]] = None
+    """Variants to generate from a single parse, see `VARIANTS`. Overrides `Node.data_type`."""
+    formats: Optional[List[str]] = None
+    """Formats to write each variant in, see `FORMATS`. Only used with `variants`."""
+    output_stem: str = "out"
+    """Name of the output files of the variants, without their suffix and extension."""
+    variant_files: Optional[Dict[str, str]] = None
+    """Content of the output files of the variants besides the first one, by file name."""
 
     @classmethod
     def generate(
         cls: Type[Self],
         ctx: Context,
         modules: List[ModSubmodStatement],
-        fd: TextIOWrapper,
-    ):
-        """Generate and write output model to a given file descriptor."""
-        # Generate actual model
-        cls.__generate(modules, fd)
-        fd.write("\n\n")
-
-        # Add initialization helper-code if Pydantic models generated
-        if cls.json_schema_output is False:
-            cls.__generate_helper_code(fd)
+        fd: TextIO,
+    ) -> int:
+        """Generate and write output model to a given file descriptor. Returns the number of models written."""
+        if cls.variants is not None:
+            count = cls.__generate_variants(modules, fd)
+        else:
+            output = "json" if cls.json_schema_output else "py"
+            count = cls.__write(cls.__node_trees(modules), {output: fd})
+            cls.__finish(fd, output)
+        cls.copy_yang_sources()
+        return count
 
     @classmethod
-    def __generate(
-        cls: Type[Self], modules: List[ModSubmodStatement], fd: TextIOWrapper
-    ):
-        """Generates and yields"""
+    def __generate_variants(
+        cls: Type[Self], modules: List[ModSubmodStatement], fd: TextIO
+    ) -> int:
+        """Generates every variant in every format from a single parse of the modules.
 
+        The first output is written to `fd`, the others are kept in `variant_files`. All formats
+        of a variant are written from the same node tree, and share its Pydantic models.
+        """
+        assert cls.variants is not None and cls.formats is not None
+        cls.variant_files = dict()
+        count = 0
+        for variant in cls.variants:
+            # Node names and the selected children depend on the data type, start over
+            Node.data_type = VARIANTS[variant]
+            Node._name_count = dict()
+            Node._shared_nodes = dict()
+            Node._included = dict()
+            TypeResolver.reset()
+            with Profiler.phase(f"variant {variant}"):
+                outputs: Dict[str, TextIO] = {
+                    output: StringIO() for output in cls.formats
+                }
+                if variant == cls.variants[0]:
+                    outputs[cls.formats[0]] = fd
+                count += cls.__write(cls.__node_trees(modules), outputs)
+                for output, output_fd in outputs.items():
+                    cls.__finish(output_fd, output)
+                    if isinstance(output_fd, StringIO) and output_fd is not fd:
+                        name = cls.variant_file_name(cls.output_stem, variant, output)
+                        cls.variant_files[name] = output_fd.getvalue()
+        return count
+
+    @classmethod
+    def __node_trees(
+        cls: Type[Self], modules: List[ModSubmodStatement]
+    ) -> List[ModelRoot]:
+        """Builds the node tree of each module, or of the trimmed branches of it."""
+        roots: List[ModelRoot] = []
         for module in modules:
-            if cls.trim_path is not None:
-                split_path = cls.split_path(cls.trim_path)
-                module = cls.trim(module, split_path)
-            if module is None:
-                logger.error("Invalid module. Exiting.")
-                sys.exit(0)
-            mod = ModelRoot(module)
-            pydantic_model = mod.to_pydantic_model()
+            if cls.trim_path is None:
+                with Profiler.phase("node tree"):
+                    roots.append(ModelRoot(module))
+                continue
+            with Profiler.phase("trim"):
+                branches = cls.trim_branches(module, cls.trim_path)
+            if branches is None:
+                raise CompilationError("Invalid module.")
+            with Profiler.phase("node tree"):
+                roots.append(ModelRoot(branches))
+        return roots
+
+    @classmethod
+    def __write(
+        cls: Type[Self], roots: List[ModelRoot], outputs: Dict[str, TextIO]
+    ) -> int:
+        """Writes the models of the node trees to the file of each output format ("py" or "json").
+
+        Returns the number of models written to each file.
+        """
+        count = 0
+        for mod in roots:
+            if cls.native_output:
+                # Skip models without any fields
+                if len(mod.field_nodes()) == 0:
+                    continue
+                with Profiler.phase("native emit"):
+                    for output, fd in outputs.items():
+                        cls.__generate_native(mod, fd, json_schema=output == "json")
+                count += 1
+                continue
+            with Profiler.phase("create_model"):
+                if Profiler.memory:
+                    # Build the classes of each top-level node separately to account for them
+                    for node in mod.field_nodes():
+                        with Profiler.phase(node.arg, category="container"):
+                            node.get_output_class().to_field()
+                pydantic_model = mod.to_pydantic_model()
             if pydantic_model is None:
                 continue
             # Skip models that only have 'prefix' and/or 'namespace' fields
             model_fields = set(pydantic_model.model_fields.keys())
             if model_fields <= {"prefix", "namespace"}:
                 continue
-            schema = cls.custom_dump(pydantic_model)
-            result = (
-                json.dumps(schema, indent=2)
-                if cls.json_schema_output is True
-                else cls.__generate_pydantic(json.dumps(schema))
+            with Profiler.phase("json schema"):
+                schema = pydantic_model.model_json_schema(by_alias=True)
+            written = False
+            for output, fd in outputs.items():
+                result: "str | dict[tuple[str, ...], Result]"
+                if output == "json":
+                    result = json.dumps(cls.strip_class_variables(schema), indent=2)
+                else:
+                    with Profiler.phase("datamodel-code-generator"):
+                        result = cls.__generate_pydantic(json.dumps(schema))
+                # Keep mypy happy
+                if isinstance(result, str):
+                    if cls.defer_build and output == "py":
+                        result = cls.defer_build_config(result)
+                    fd.write(result)
+                    written = True
+                else:
+                    logger.warning(
+                        f"Expected string but got {type(result)} whilst parsing JSON"
+                    )
+            count += written
+        return count
+
+    @classmethod
+    def defer_build_config(cls: Type[Self], source: str) -> str:
+        """Adds `defer_build=True` to the `ConfigDict` of every class written by datamodel-code-generator."""
+        # datamodel-code-generator does not know this config option
+        source, count = _REGEX_ENGINE_CONFIG.subn(r"\1\2defer_build=True,\n", source)
+        if count == 0 and _CLASS_DEFINITION.search(source):
+            raise CompilationError(
+                "Could not add defer_build=True to the output of datamodel-code-generator, "
+                "its format may have changed."
             )
-            # Keep mypy happy
-            if isinstance(result, str):
-                fd.write(result)
-            else:
-                logger.warning(
-                    f"Expected string but got {type(result)} whilst parsing JSON"
-                )
-            pass
+        return source
+
+    @classmethod
+    def __finish(cls: Type[Self], fd: TextIO, output: str) -> None:
+        """Appends the helper code to an output file of the given format."""
+        if cls.defer_build and output == "py":
+            fd.write("\n\n" if cls.package_output else "\n\n\n")
+            fd.write(function_to_source_code(warm_up))
+        if cls.package_output:
+            # The `__init__` module only loads the submodules, skip the helper code
+            return
+        fd.write("\n\n")
+
+        # Add initialization helper-code if Pydantic models generated
+        if output == "py":
+            with Profiler.phase("helper code"):
+                cls.__generate_helper_code(fd)
+
+    @classmethod
+    def __generate_native(
+        cls: Type[Self], mod: ModelRoot, fd: TextIO, json_schema: bool
+    ):
+        """Generates the output straight from the node tree, without building pydantic models first"""
+        from ..emitters import JSONSchemaEmitter, PackageEmitter, PythonEmitter
+
+        if json_schema:
+            JSONSchemaEmitter(mod).write(fd)
+        elif cls.package_output:
+            package = PackageEmitter(
+                mod, shared_types=cls.shared_types, defer_build=cls.defer_build
+            )
+            fd.write(package.emit())
+            cls.package_files.update(package.files)
+            cls.type_modules.update(package.type_modules)
+        else:
+            emitter = PythonEmitter(
+                mod, shared_types=cls.shared_types, defer_build=cls.defer_build
+            )
+            fd.write(emitter.emit())
+            cls.type_modules.update(emitter.type_modules)
+
+    @classmethod
+    def generate_type_modules(cls: Type[Self]) -> Dict[str, str]:
+        """Returns the source code of the shared type modules the generated models import, by module name.
+
+        Includes the type modules these in turn import from.
+        """
+        from ..emitters import TypesEmitter
+
+        sources: Dict[str, str] = dict()
+        pending = list(cls.type_modules.values())
+        while pending:
+            module = pending.pop()
+            if module.arg in sources:
+                continue
+            with Profiler.phase("shared types"):
+                emitter = TypesEmitter(module)
+                sources[module.arg] = emitter.emit()
+            pending.extend(emitter.type_modules.values())
+        return sources
+
+    @classmethod
+    def write_package_files(cls: Type[Self], package_dir: Path) -> None:
+        """Writes the submodules of the output package next to its `__init__` module."""
+        for file_name, source in cls.package_files.items():
+            (package_dir / file_name).write_text(source)
+
+    @classmethod
+    def write_variant_files(cls: Type[Self], output_dir: Path) -> None:
+        """Writes the output files of the variants besides the first one to `output_dir`."""
+        for file_name, source in (cls.variant_files or {}).items():
+            (output_dir / file_name).write_text(source)
+
+    @staticmethod
+    def write_type_modules(output_dir: Path, sources: Dict[str, str]) -> None:
+        """Writes shared type modules to the type package in `output_dir`."""
+        from ..emitters.python import TYPES_PACKAGE, type_module_name
+
+        package = output_dir / TYPES_PACKAGE
+        os.makedirs(package, exist_ok=True)
+        init_file = package / "__init__.py"
+        if not init_file.exists():
+            init_file.write_text('"""Types shared by the generated models."""\n')
+        for module, source in sources.items():
+            (package / f"{type_module_name(module)}.py").write_text(source)
 
     @staticmethod
-    def __generate_pydantic(json: str) -> str | dict[tuple[str, ...], Result]:
+    def __generate_pydantic(json: str) -> "str | dict[tuple[str, ...], Result]":
         """Generates pydantic models"""
+        # Import locally, datamodel-code-generator is slow to import and only needed here
+        from datamodel_code_generator.config import JSONSchemaParserConfig
+        from datamodel_code_generator.format import CodeFormatter
+        from datamodel_code_generator.model import pydantic_v2
+        from datamodel_code_generator.parser.jsonschema import JsonSchemaParser
+
         extra_template_data: defaultdict[str, dict[str, Any]] = defaultdict(dict)
         extra_template_data["#all#"]["config"] = {}
         extra_template_data["#all#"]["config"]["regex_engine"] = '"python-re"'
@@ -151,10 +372,11 @@ class ModelGenerator:
                 field_extra_keys=set(["x-is-classvar"]),
             ),
         )
-        return parser.parse()
+        with Profiler.wrap(CodeFormatter, "format_code", "format"):
+            return parser.parse()
 
     @classmethod
-    def __generate_helper_code(cls: Type[Self], fd: TextIOWrapper) -> None:
+    def __generate_helper_code(cls: Type[Self], fd: TextIO) -> None:
         if cls.standalone:
             fd.write(function_to_source_code(restconf_patch_request))
             fd.write("\n\n")
@@ -179,9 +401,15 @@ class ModelGenerator:
                     ]
                 )
             )
-        YANGSourcesTracker.copy_yang_files(
-            input_root=cls.input_dir, output_dir=cls.output_dir
-        )
+
+    @classmethod
+    def copy_yang_sources(cls: Type[Self]) -> None:
+        """Copies the YANG files the output model depends on next to it, if verification code is included."""
+        if cls.include_verification_code and cls.json_schema_output is False:
+            with Profiler.phase("copy yang files"):
+                YANGSourcesTracker.copy_yang_files(
+                    input_root=cls.input_dir, output_dir=cls.output_dir
+                )
 
     @classmethod
     def split_path(cls: Type[Self], path: str) -> List[str]:
@@ -191,32 +419,93 @@ class ModelGenerator:
     def trim(
         cls: Type[Self], statement: Statement, path: List[str]
     ) -> Statement | None:
-        arg, path = path[0], path[1:]
-        if arg == statement.arg:
-            while len(path) > 0:
-                for child in statement.i_children:
-                    if child.arg == path[0]:
-                        statement = child
-                        path = path[1:]
-                        break
+        """Returns the first statement at `path` in the module `statement`."""
+        branches = cls.trim_branches(statement, ["/".join(path)])
+        return branches[0] if branches else None
+
+    @classmethod
+    def trim_branches(
+        cls: Type[Self], module: Statement, paths: List[str]
+    ) -> List[Statement] | None:
+        """Returns the statements at the trim paths starting with the name of `module`.
+
+        Path elements may be glob patterns, e.g. `interfaces/interface/*/counters`, which select
+        every matching child. Branches inside another selected branch are dropped. Returns `None`
+        if no path starts with the module's name, or an element of a path matches no child.
+        """
+        index: Dict[int, Dict[str, Statement]] = dict()
+
+        def children(statement: Statement) -> Dict[str, Statement]:
+            if id(statement) not in index:
+                index[id(statement)] = {ch.arg: ch for ch in statement.i_children}
+            return index[id(statement)]
+
+        selected: Dict[int, Statement] = dict()
+        for path in paths:
+            split_path = cls.split_path(path)
+            if not split_path or not fnmatchcase(module.arg, split_path[0]):
+                continue
+            statements = [module]
+            for element in split_path[1:]:
+                if _GLOB_CHARACTERS.search(element):
+                    matches = [
+                        child
+                        for statement in statements
+                        for name, child in children(statement).items()
+                        if fnmatchcase(name, element)
+                    ]
                 else:
-                    logger.warn(
-                        f'Path element "{path[0]}" not found in "{statement.arg}\n'
-                        f"Available: [{', '.join(ch.arg for ch in statement.i_children)}]"
+                    matches = [
+                        children(statement)[element]
+                        for statement in statements
+                        if element in children(statement)
+                    ]
+                if not matches:
+                    available = dict.fromkeys(
+                        n for s in statements for n in children(s)
+                    )
+                    logger.warning(
+                        f'Path element "{element}" not found in "{", ".join(s.arg for s in statements)}"\n'
+                        f"Available: [{', '.join(available)}]"
                     )
                     return None
-            return statement
-        return None
+                statements = matches
+            for statement in statements:
+                selected.setdefault(id(statement), statement)
+        if not selected:
+            return None
 
-    @classmethod
-    def custom_dump(cls: Type[Self], model: Type[BaseModel]) -> Dict[str, Any]:
-        schema = model.model_json_schema(by_alias=True)
-        if cls.json_schema_output:
-            properties = schema.get("properties", {})
+        def inside_other_branch(statement: Statement) -> bool:
+            parent = statement.parent
+            while parent is not None:
+                if id(parent) in selected:
+                    return True
+                parent = parent.parent
+            return False
+
+        branches = [s for s in selected.values() if not inside_other_branch(s)]
+        names = [s.arg for s in branches]
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise CompilationError(
+                "The trim paths select several nodes named "
+                + ", ".join(f'"{n}"' for n in duplicates)
+                + "."
+            )
+        return branches
+
+    @staticmethod
+    def strip_class_variables(schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns a copy of the JSON schema of the models without the `namespace`, `prefix` and `serialization_plan` class variables."""
+        schema = copy.deepcopy(schema)
+        for def_schema in [schema, *schema.get("$defs", {}).values()]:
+            properties = def_schema.get("properties", {})
             properties.pop("namespace", None)
             properties.pop("prefix", None)
-            for def_schema in schema["$defs"].values():
-                def_properties = def_schema.get("properties", {})
-                def_properties.pop("namespace", None)
-                def_properties.pop("prefix", None)
+            properties.pop("serialization_plan", None)
         return schema
+
+    @staticmethod
+    def variant_file_name(stem: str, variant: str, output: str) -> str:
+        """Returns the name of the output file of a variant in a format, e.g. "out_config.json"."""
+        return f"{stem}{'' if variant == 'full' else f'_{variant}'}.{output}"
@@ -1,28 +1,432 @@
+from enum import Enum
+from io import BytesIO
+from types import NoneType, UnionType
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
 from lxml import etree
-from pydantic import BaseModel
-from typing import Any
+from pydantic import BaseModel, RootModel
+
+NETCONF_NAMESPACE = "urn:ietf:params:xml:ns:netconf:base:1.0"
+NETCONF_CONFIG = f"{{{NETCONF_NAMESPACE}}}config"
+"""Root element of the `<edit-config>` payload, to pass as `root`."""
+
+_REQUIRED = object()
+
+
+class _Field(NamedTuple):
+    attribute: str
+    module: str | None
+    """Name of the module qualifying the field's alias, if any."""
+    name: str
+    default: Any
+    namespace: str | None = None
+    """Namespace of the field's node, if the class has a `serialization_plan`."""
+    prefix: str | None = None
+    """Prefix of the module of the field's node, if the class has a `serialization_plan`."""
+    keyword: str | None = None
+    """Keyword of the field's node, if the class has a `serialization_plan`."""
+
+
+class _Element(NamedTuple):
+    """Child element of a model class, as parsed by `model_validate_xml`."""
+
+    alias: str
+    model_class: Type[BaseModel] | None
+    """Class of containers and list entries, `None` for leaves."""
+    is_list: bool
+    is_empty: bool
+    """Whether the element is an `empty` leaf, whose value is `[None]`."""
+    module: str | None
+    namespace: str | None
+    choices: Tuple[str, ...] = ()
+    """Aliases of the choices the element is a case child of, outermost first."""
+
+
+_Tags = Dict[Tuple[Type[BaseModel], str | None, str | None], Dict[str, _Element]]
+
+_FIELDS: Dict[Type[BaseModel], List[_Field]] = dict()
+_NAMESPACES: Dict[Type[BaseModel], Dict[str, str]] = dict()
+_TAGS: _Tags = dict()
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def model_dump_xml_string(
+    model: BaseModel,
+    pretty_print: bool = False,
+    root: str | None = None,
+    namespaces: Dict[str, str] | None = None,
+) -> str:
+    if pretty_print:
+        element = model_dump_xml(model, root, namespaces)
+        return etree.tostring(element, encoding=str, pretty_print=True)
+    output = BytesIO()
+    model_write_xml(model, output, root, namespaces)
+    return output.getvalue().decode()
+
+
+def model_dump_xml(
+    model: BaseModel,
+    root: str | None = None,
+    namespaces: Dict[str, str] | None = None,
+) -> etree._Element:
+    output = BytesIO()
+    model_write_xml(model, output, root, namespaces)
+    return etree.fromstring(output.getvalue())
+
+
+def model_write_xml(
+    model: BaseModel,
+    target: str | BinaryIO,
+    root: str | None = None,
+    namespaces: Dict[str, str] | None = None,
+    buffered: bool = True,
+) -> None:
+    """Writes `model` as NETCONF XML to a file name or binary file, e.g. `socket.makefile("wb")`.
+
+    The elements are written while walking the model, without building a dict or element tree
+    first. Fields set to their default value are omitted, like `exclude_defaults=True`.
+
+    :param root: Tag wrapping the top-level nodes, e.g. `NETCONF_CONFIG`. Required unless the
+        model has a single top-level node.
+    :param namespaces: Namespaces of module names, for leaves augmented by modules that define
+        no container or list.
+    """
+    namespaces = {**_module_namespaces(type(model)), **(namespaces or dict())}
+    with etree.xmlfile(target, encoding="utf-8", buffered=buffered) as xf:
+        if root is not None:
+            namespace = etree.QName(root).namespace
+            with xf.element(root, nsmap={None: namespace} if namespace else None):
+                _write_children(xf, model, None, namespace, namespaces)
+            return
+        children = list(_children(model))
+        count = sum(len(values) for _, values in children)
+        if count != 1:
+            raise ValueError(
+                f"The model has {count} top-level nodes, pass a `root` element to wrap them in."
+            )
+        _write_field(xf, *children[0], None, None, namespaces)
+
 
+def model_validate_xml(
+    cls: Type[M],
+    source: str | bytes | BinaryIO,
+    namespaces: Dict[str, str] | None = None,
+    huge_tree: bool = False,
+) -> M:
+    """Validates NETCONF XML, e.g. a `<get-config>` reply, from a file name, bytes or binary file.
 
-def model_dump_xml_string(model: BaseModel, pretty_print: bool = False) -> str:
-    element = model_dump_xml(model)
-    return etree.tostring(element, encoding=str, pretty_print=pretty_print)
+    The XML is parsed incrementally and every element is cleared once converted, so the memory of
+    the parsed tree does not grow with the size of the reply. Elements around the top-level nodes
+    (e.g. `<rpc-reply>` and `<data>`) are skipped, as are nodes the model does not know.
 
+    :param namespaces: Namespaces of module names, for leaves augmented by modules that define
+        no container or list.
+    :param huge_tree: Lift libxml2's limits on the nesting depth and the size of text nodes. Only
+        for trusted input, a large reply is parsed without it.
+    """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    tags = _TAGS
+    if namespaces:
+        tags = dict()
+    namespaces = {**_module_namespaces(cls), **(namespaces or dict())}
+    data: Dict[str, Any] = dict()
+    top_level = _tags(tags, cls, None, None, namespaces)
+    # The open elements of the model: the element, how it is parsed, the data of its children
+    # and its child elements, or `None` for leaves
+    stack: List[
+        Tuple[etree._Element, _Element, Dict[str, Any], Dict[str, _Element] | None]
+    ] = []
+    skipped = 0
+    for event, element in etree.iterparse(
+        source, events=("start", "end"), remove_comments=True, huge_tree=huge_tree
+    ):
+        if event == "start":
+            if skipped:
+                skipped += 1
+                continue
+            children = stack[-1][3] if stack else top_level
+            if children is None:  # Leaf with child elements
+                skipped = 1
+                continue
+            parsed = children.get(element.tag) or children.get(
+                etree.QName(element).localname
+            )
+            if parsed is None:
+                # Elements around the top-level nodes are skipped, but not their children
+                if stack:
+                    skipped = 1
+                continue
+            if parsed.model_class is None:
+                stack.append((element, parsed, data, None))
+            else:
+                children = _tags(
+                    tags,
+                    parsed.model_class,
+                    parsed.module,
+                    parsed.namespace,
+                    namespaces,
+                )
+                stack.append((element, parsed, dict(), children))
+            continue
 
-def model_dump_xml(model: BaseModel) -> etree.Element:
-    dump = model.model_dump(exclude_defaults=True)
-    return dict_to_elements(dump, model.namespace, model.prefix)[0]  # type: ignore  # ToDo: Find a better way
+        if skipped:
+            skipped -= 1
+        elif stack and stack[-1][0] is element:
+            _, parsed, children_data, children = stack.pop()
+            if children is None:
+                value: Any = None if parsed.is_empty else element.text or ""
+            else:
+                value = children_data
+            parent_data = stack[-1][2] if stack else data
+            for choice in parsed.choices:
+                parent_data = parent_data.setdefault(choice, dict())
+            if parsed.is_list:
+                parent_data.setdefault(parsed.alias, []).append(value)
+            else:
+                parent_data[parsed.alias] = value
+            if children is None:
+                continue  # Leaves are dropped with their parent
+        # Drop the converted element and the previous ones, which are already converted
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return cls.model_validate(data)
 
 
-def dict_to_elements(
-    model: dict[str, Any], namespace: str, prefix: str
-) -> list[etree.Element]:
-    result: list[etree.Element] = []
-    for name, value in model.items():
-        element = etree.Element(f"{{{namespace}}}{name}", nsmap={prefix: namespace})
-        if isinstance(value, dict):
-            for child in dict_to_elements(value, namespace, prefix):
-                element.append(child)
+def _write_children(
+    xf: Any,
+    model: BaseModel,
+    module: str | None,
+    namespace: str | None,
+    namespaces: Dict[str, str],
+) -> None:
+    for field, values in _children(model):
+        _write_field(xf, field, values, module, namespace, namespaces)
+
+
+def _write_field(
+    xf: Any,
+    field: _Field,
+    values: List[Any],
+    module: str | None,
+    namespace: str | None,
+    namespaces: Dict[str, str],
+) -> None:
+    """Writes the containers, list entries or leaves of a field of a node in `module` and `namespace`."""
+    if field.keyword == "choice":
+        # Choices and cases are no elements, the children of the case are written instead
+        _write_children(xf, values[0], module, namespace, namespaces)
+        return
+    child_module = field.module or module
+    is_model = isinstance(values[0], BaseModel)
+    child_namespace: str | None
+    if field.namespace is not None:
+        child_namespace = field.namespace
+    elif is_model:
+        child_namespace = namespaces.get(child_module or "") or getattr(
+            values[0], "namespace", namespace
+        )
+    elif child_module == module:
+        child_namespace = namespace
+    elif child_module in namespaces:
+        child_namespace = namespaces[child_module]
+    else:
+        raise ValueError(
+            f'The namespace of module "{child_module}" is unknown, pass it in `namespaces`.'
+        )
+    tag = f"{{{child_namespace}}}{field.name}" if child_namespace else field.name
+    nsmap: Dict[str | None, str | None] | None = None
+    if child_namespace != namespace:
+        # Also bind the module's prefix, used by identityref and instance-identifier values
+        nsmap = {None: child_namespace}
+        prefix = field.prefix
+        if field.namespace is None and is_model:
+            # Without a plan, only the class of a container or list knows its module's prefix
+            if getattr(values[0], "namespace", None) == child_namespace:
+                prefix = getattr(values[0], "prefix", None)
+        if prefix:
+            nsmap[prefix] = child_namespace
+    for value in values:
+        with xf.element(tag, nsmap=nsmap):
+            if is_model:
+                _write_children(xf, value, child_module, child_namespace, namespaces)
+            elif value is not None:  # `None` entries are the value of `empty` leaves
+                xf.write(_text(value))
+
+
+def _children(model: BaseModel) -> Iterator[Tuple[_Field, List[Any]]]:
+    """Yields the field of each child element with its value, or the entries of lists."""
+    for field in _fields(type(model)):
+        value = getattr(model, field.attribute)
+        if value is None or (field.default is not None and value == field.default):
+            continue
+        value = _unwrap(value)
+        if isinstance(value, list):
+            if value:
+                yield field, [_unwrap(entry) for entry in value]
         else:
-            element.text = str(value)
-        result.append(element)
-    return result
+            yield field, [value]
+
+
+def _unwrap(value: Any) -> Any:
+    while isinstance(value, RootModel):
+        value = value.root
+    return value
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _fields(cls: Type[BaseModel]) -> List[_Field]:
+    """Returns the fields of a model class, in the order of the elements.
+
+    Classes generated with `--serialization-plans` list the namespace, prefix and keyword of each
+    field and the order of the elements in their `serialization_plan`.
+    """
+    fields = _FIELDS.get(cls)
+    if fields is None:
+        plan = {
+            alias: (namespace, prefix, keyword)
+            for alias, namespace, prefix, keyword in getattr(
+                cls, "serialization_plan", []
+            )
+        }
+        attributes = {
+            info.alias or attribute: attribute
+            for attribute, info in cls.model_fields.items()
+        }
+        fields = []
+        for alias in [*plan, *(a for a in attributes if a not in plan)]:
+            attribute = attributes[alias]
+            info = cls.model_fields[attribute]
+            module, _, name = alias.rpartition(":")
+            default = (
+                _REQUIRED
+                if info.is_required()
+                else info.get_default(call_default_factory=True)
+            )
+            namespace, prefix, keyword = plan.get(alias, (None, None, None))
+            fields.append(
+                _Field(
+                    attribute, module or None, name, default, namespace, prefix, keyword
+                )
+            )
+        _FIELDS[cls] = fields
+    return fields
+
+
+def _tags(
+    tags: _Tags,
+    cls: Type[BaseModel],
+    module: str | None,
+    namespace: str | None,
+    namespaces: Dict[str, str],
+) -> Dict[str, _Element]:
+    """Returns the child elements of a model class in `module` and `namespace`, by tag.
+
+    Elements of modules whose namespace is unknown are looked up by their local name.
+    """
+    key = (cls, module, namespace)
+    children = tags.get(key)
+    if children is None:
+        children = dict()
+        for field in _fields(cls):
+            annotation = cls.model_fields[field.attribute].annotation
+            alias = f"{field.module}:{field.name}" if field.module else field.name
+            if field.keyword == "choice":
+                # The children of the cases are elements of this class
+                for case_class in _model_classes(annotation):
+                    for tag, element in _tags(
+                        tags, case_class, module, namespace, namespaces
+                    ).items():
+                        choices = (alias, *element.choices)
+                        children.setdefault(tag, element._replace(choices=choices))
+                continue
+            model_class = next(_model_classes(annotation), None)
+            child_module = field.module or module
+            child_namespace: str | None
+            if field.namespace is not None:
+                child_namespace = field.namespace
+            elif model_class is not None:
+                child_namespace = namespaces.get(child_module or "") or getattr(
+                    model_class, "namespace", namespace
+                )
+            elif child_module == module:
+                child_namespace = namespace
+            else:
+                child_namespace = namespaces.get(child_module or "")
+            element = _Element(
+                alias=alias,
+                model_class=model_class,
+                is_list=_is_list(annotation),
+                is_empty=_is_list(annotation, NoneType),
+                module=child_module,
+                namespace=child_namespace,
+            )
+            tag = (
+                f"{{{child_namespace}}}{field.name}" if child_namespace else field.name
+            )
+            children[tag] = element
+        tags[key] = children
+    return children
+
+
+def _is_list(annotation: Any, item: Any = None) -> bool:
+    """Returns whether an annotation is a list, optionally of `item`."""
+    origin = get_origin(annotation)
+    if origin is list:
+        return item is None or get_args(annotation) == (item,)
+    if origin is Union or origin is UnionType:
+        return any(_is_list(argument, item) for argument in get_args(annotation))
+    return False
+
+
+def _module_namespaces(cls: Type[BaseModel]) -> Dict[str, str]:
+    """Returns the namespace of each module qualifying a field that holds a model class."""
+    namespaces = _NAMESPACES.get(cls)
+    if namespaces is None:
+        namespaces = dict()
+        seen = {cls}
+        pending = [cls]
+        while pending:
+            for info in pending.pop().model_fields.values():
+                module = (info.alias or "").rpartition(":")[0]
+                for model_class in _model_classes(info.annotation):
+                    namespace = getattr(model_class, "namespace", None)
+                    if module and namespace:
+                        namespaces.setdefault(module, namespace)
+                    if model_class not in seen:
+                        seen.add(model_class)
+                        pending.append(model_class)
+        _NAMESPACES[cls] = namespaces
+    return namespaces
+
+
+def _model_classes(annotation: Any) -> Iterator[Type[BaseModel]]:
+    """Yields the model classes of containers and lists in a field annotation."""
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel) and not issubclass(annotation, RootModel):
+            yield annotation
+        return
+    for argument in getattr(annotation, "__args__", ()):
+        yield from _model_classes(argument)
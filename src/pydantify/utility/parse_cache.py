@@ -0,0 +1,123 @@
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type
+
+import pyang
+from pyang import yang_parser
+from pyang.context import Context
+from pyang.statements import Statement
+from pyang.yang_parser import YangParser
+from typing_extensions import Self
+
+logger = logging.getLogger("pydantify")
+
+
+class CachingYangParser(YangParser):
+    """Drop-in replacement for pyang's `YangParser` that consults the `ParseCache` first."""
+
+    def parse(self, ctx: Context, ref: str, text: str) -> Statement | None:
+        return ParseCache.parse(self, ctx, ref, text)
+
+
+class ParseCache:
+    """Persistent cache of parsed YANG statement trees.
+
+    Pyang parses every module (including all imports) from scratch on each run, and modules whose
+    file name carries no revision are even parsed twice. Parsed trees are stored pickled, keyed by
+    the module's file path, the SHA-256 of its content (and thereby its name and revision), the
+    parser options and the pyang version. Validation still happens on every run, as it links the
+    trees of all modules in the context together.
+
+    Only load caches from trusted directories, as they contain pickled objects. Long-running
+    processes can set `keep_in_memory` to cache parsed trees without a cache directory. Only the
+    newest tree of each file is kept in memory, so editing a file replaces its tree.
+    """
+
+    cache_dir: Optional[Path] = None
+    keep_in_memory: bool = False
+    hits: int = 0
+    misses: int = 0
+    __memory: Dict[str, Tuple[str, bytes]] = dict()
+    """Key and pickled tree of the newest parse of each file path."""
+
+    @classmethod
+    def enabled(cls: Type[Self]) -> bool:
+        return cls.cache_dir is not None or cls.keep_in_memory
+
+    @classmethod
+    def install(cls: Type[Self]) -> None:
+        """Makes pyang use the caching parser for all YANG modules it reads."""
+        cls.hits = 0
+        cls.misses = 0
+        yang_parser.YangParser = CachingYangParser  # type: ignore[misc]
+
+    @classmethod
+    def uninstall(cls: Type[Self]) -> None:
+        yang_parser.YangParser = YangParser  # type: ignore[misc]
+
+    @classmethod
+    def key(cls: Type[Self], ctx: Context, ref: str, text: str) -> str:
+        options = (
+            pyang.__version__,
+            ref,
+            ctx.keep_comments,
+            ctx.keep_arg_substrings,
+            ctx.max_line_len,
+            ctx.lax_quote_checks,
+        )
+        digest = hashlib.sha256(repr(options).encode())
+        digest.update(text.encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def parse(
+        cls: Type[Self], parser: YangParser, ctx: Context, ref: str, text: str
+    ) -> Statement | None:
+        """Returns a freshly unpickled tree for `text` if cached, parses and stores it otherwise."""
+        key = cls.key(ctx, ref, text)
+        data = cls.__load(ref, key)
+        if data is not None:
+            cls.hits += 1
+            return pickle.loads(data)
+
+        cls.misses += 1
+        errors_before = len(ctx.errors)
+        module = YangParser.parse(parser, ctx, ref, text)
+        # Only cache clean parses, so warnings are reported again on every run.
+        if module is not None and len(ctx.errors) == errors_before:
+            cls.__store(
+                ref, key, pickle.dumps(module, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        return module
+
+    @classmethod
+    def __load(cls: Type[Self], ref: str, key: str) -> bytes | None:
+        newest = cls.__memory.get(ref, None)
+        if newest is not None and newest[0] == key:
+            return newest[1]
+        if cls.cache_dir is not None:
+            file = cls.cache_dir / "parsed" / f"{key}.pickle"
+            if file.is_file():
+                data = file.read_bytes()
+                cls.__memory[ref] = (key, data)
+                return data
+        return None
+
+    @classmethod
+    def __store(cls: Type[Self], ref: str, key: str, data: bytes) -> None:
+        cls.__memory[ref] = (key, data)
+        if cls.cache_dir is None:
+            return
+        parsed_dir = cls.cache_dir / "parsed"
+        os.makedirs(parsed_dir, exist_ok=True)
+        file = parsed_dir / f"{key}.pickle"
+        tmp_file = file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, file)
+
+    @classmethod
+    def stats(cls: Type[Self]) -> Dict[str, Any]:
+        return {"hits": cls.hits, "misses": cls.misses}
@@ -0,0 +1,289 @@
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Type
+
+from typing_extensions import Self
+
+logger = logging.getLogger("pydantify")
+
+
+class Profiler:
+    """Records how long the phases of a build take.
+
+    Phases are recorded as complete events of the Chrome trace format (nanoseconds internally)
+    and can be nested. With `statements` set, building the node of every YANG statement is recorded
+    too, which makes builds noticeably slower. With `memory` set, `tracemalloc` tracks the peak
+    and retained memory of every phase and of every top-level data node (as "container"), which
+    slows down builds a lot. Recording is a no-op unless `start()` was called.
+    """
+
+    enabled: bool = False
+    statements: bool = False
+    memory: bool = False
+    origin: int = 0
+    """`perf_counter_ns()` at the start of the recording, timestamps are relative to it."""
+    output_file: Optional[Path] = None
+    memory_report_file: Optional[Path] = None
+    __events: List[Dict[str, Any]] = []
+    __open: Dict[str, ContextManager[None]] = dict()
+    __peaks: List[int] = []
+    """Highest traced memory so far of each running phase, outermost first."""
+    __peak: int = 0
+
+    @classmethod
+    def start(
+        cls: Type[Self],
+        statements: bool = False,
+        memory: bool = False,
+        origin: Optional[int] = None,
+    ) -> None:
+        """Starts recording, discarding all previously recorded phases."""
+        cls.enabled = True
+        cls.statements = statements
+        cls.memory = memory
+        cls.origin = origin if origin is not None else time.perf_counter_ns()
+        cls.__events = []
+        cls.__open = dict()
+        cls.__peaks = []
+        cls.__peak = 0
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @staticmethod
+    def process_start() -> int:
+        """Returns the start of the current process, as `perf_counter_ns()` value."""
+        import psutil
+
+        elapsed = time.time() - psutil.Process(os.getpid()).create_time()
+        return time.perf_counter_ns() - int(elapsed * 1e9)
+
+    @classmethod
+    def stop(cls: Type[Self]) -> None:
+        if cls.memory:
+            tracemalloc.stop()
+        cls.enabled = False
+        cls.statements = False
+        cls.memory = False
+
+    @classmethod
+    def record(
+        cls: Type[Self],
+        name: str,
+        start: int,
+        end: int,
+        category: str = "phase",
+        **args: Any,
+    ) -> None:
+        """Records a phase from `start` to `end` (both from `perf_counter_ns()`)."""
+        if not cls.enabled:
+            return
+        cls.__events.append(
+            {
+                "name": name,
+                "cat": category,
+                "start": start - cls.origin,
+                "duration": end - start,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    @classmethod
+    @contextmanager
+    def phase(
+        cls: Type[Self], name: str, category: str = "phase", **args: Any
+    ) -> Iterator[None]:
+        """Records the duration of the block, and its memory usage if `memory` is set."""
+        if not cls.enabled:
+            yield
+            return
+        if cls.memory:
+            with cls.__track_memory(args):
+                start = time.perf_counter_ns()
+                try:
+                    yield
+                finally:
+                    end = time.perf_counter_ns()
+        else:
+            start = time.perf_counter_ns()
+            try:
+                yield
+            finally:
+                end = time.perf_counter_ns()
+        cls.record(name, start, end, category, **args)
+
+    @classmethod
+    @contextmanager
+    def __track_memory(cls: Type[Self], args: Dict[str, Any]) -> Iterator[None]:
+        """Adds the `peak` and `retained` bytes traced during the block to `args`."""
+        before, peak = tracemalloc.get_traced_memory()
+        # The peak is global, keep the one of the enclosing phase before resetting it
+        if cls.__peaks:
+            cls.__peaks[-1] = max(cls.__peaks[-1], peak)
+        cls.__peak = max(cls.__peak, peak)
+        tracemalloc.reset_peak()
+        cls.__peaks.append(before)
+        try:
+            yield
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            peak = max(cls.__peaks.pop(), peak)
+            cls.__peak = max(cls.__peak, peak)
+            if cls.__peaks:
+                cls.__peaks[-1] = max(cls.__peaks[-1], peak)
+            args["peak"] = peak
+            args["retained"] = after - before
+
+    @classmethod
+    @contextmanager
+    def statement(cls: Type[Self], stm: Any) -> Iterator[None]:
+        """Records building the node of a YANG statement, per `statements` and `memory`."""
+        with ExitStack() as stack:
+            parent = getattr(stm, "parent", None)
+            if cls.memory and parent is not None and parent.parent is None:
+                stack.enter_context(cls.phase(stm.arg, category="container"))
+            if cls.statements:
+                stack.enter_context(
+                    cls.phase(stm.keyword, category="statement", arg=stm.arg)
+                )
+            yield
+
+    @classmethod
+    def begin(cls: Type[Self], name: str) -> None:
+        """Starts a phase that ends with `end()`, for phases spanning several callbacks."""
+        if cls.enabled:
+            phase = cls.phase(name)
+            phase.__enter__()
+            cls.__open[name] = phase
+
+    @classmethod
+    def end(cls: Type[Self], name: str) -> None:
+        phase = cls.__open.pop(name, None)
+        if phase is not None:
+            phase.__exit__(None, None, None)
+
+    @classmethod
+    @contextmanager
+    def wrap(cls: Type[Self], owner: Any, attribute: str, name: str) -> Iterator[None]:
+        """Records every call of the method `owner.attribute` within the block."""
+        if not cls.enabled:
+            yield
+            return
+        original = getattr(owner, attribute)
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with cls.phase(name):
+                return original(*args, **kwargs)
+
+        setattr(owner, attribute, wrapper)
+        try:
+            yield
+        finally:
+            setattr(owner, attribute, original)
+
+    @classmethod
+    def report(cls: Type[Self]) -> Dict[str, Any]:
+        """Returns the total and self time (excluding nested phases) per phase, in seconds.
+
+        With `memory` set, also the highest traced memory during any call of the phase (`peak`)
+        and the memory its calls allocated but did not free again (`retained`), in bytes.
+        """
+        categories = {
+            "phase": "phases",
+            "statement": "statements",
+            "container": "containers",
+        }
+        summaries: Dict[str, Dict[str, Dict[str, Any]]] = {c: {} for c in categories}
+        stacks: Dict[int, List[Dict[str, Any]]] = dict()
+        for event in sorted(cls.__events, key=lambda e: (e["start"], -e["duration"])):
+            stack = stacks.setdefault(event["tid"], [])
+            while (
+                stack and stack[-1]["start"] + stack[-1]["duration"] <= event["start"]
+            ):
+                stack.pop()
+            summary = summaries[event["cat"]].setdefault(
+                event["name"], {"calls": 0, "total": 0, "self": 0}
+            )
+            summary["calls"] += 1
+            summary["self"] += event["duration"]
+            # Only count the outermost call of recursive phases
+            phase = (event["cat"], event["name"])
+            if all((e["cat"], e["name"]) != phase for e in stack):
+                summary["total"] += event["duration"]
+                if "retained" in event["args"]:
+                    summary["retained"] = (
+                        summary.get("retained", 0) + event["args"]["retained"]
+                    )
+            if "peak" in event["args"]:
+                summary["peak"] = max(summary.get("peak", 0), event["args"]["peak"])
+            if stack:
+                parent = summaries[stack[-1]["cat"]][stack[-1]["name"]]
+                parent["self"] -= event["duration"]
+            stack.append(event)
+
+        end = max((e["start"] + e["duration"] for e in cls.__events), default=0)
+        report: Dict[str, Any] = {"total": end / 1e9}
+        if cls.memory:
+            report["peak"] = max(cls.__peak, tracemalloc.get_traced_memory()[1])
+        for category, title in categories.items():
+            items = summaries[category].items()
+            report[title] = {
+                name: {
+                    **summary,
+                    "total": summary["total"] / 1e9,
+                    "self": summary["self"] / 1e9,
+                }
+                for name, summary in sorted(items, key=lambda i: -i[1]["self"])
+            }
+        if not cls.statements:
+            del report["statements"]
+        if not cls.memory:
+            del report["containers"]
+        return report
+
+    @classmethod
+    def chrome_trace(cls: Type[Self]) -> Dict[str, Any]:
+        """Returns the recorded phases in the Chrome trace format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": e["name"],
+                    "cat": e["cat"],
+                    "ph": "X",
+                    "ts": e["start"] / 1e3,
+                    "dur": e["duration"] / 1e3,
+                    "pid": pid,
+                    "tid": e["tid"],
+                    "args": e["args"],
+                }
+                for e in cls.__events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    @classmethod
+    def write(cls: Type[Self], file: Path, trace: bool = True) -> None:
+        """Writes the report to `file`, and the Chrome trace next to it as `<name>.trace.json`."""
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(json.dumps(cls.report(), indent=2))
+        if not trace:
+            logger.info(f'Wrote report to "{file}".')
+            return
+        trace_file = file.with_suffix(".trace.json")
+        trace_file.write_text(json.dumps(cls.chrome_trace()))
+        logger.info(f'Wrote profile to "{file}" and "{trace_file}".')
+
+    @classmethod
+    def write_reports(cls: Type[Self]) -> None:
+        """Writes the reports requested on the command line."""
+        if cls.output_file is not None:
+            cls.write(cls.output_file)
+        if cls.memory_report_file is not None:
+            cls.write(cls.memory_report_file, trace=False)
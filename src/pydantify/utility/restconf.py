@@ -1,3 +1,29 @@
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from asyncio import Semaphore, Task
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from pydantic import BaseModel
+    from requests import Response, Session
+
+RESTCONF_MEDIA_TYPE = "application/yang-data+json"
+RETRY_STATUSES = (429, 502, 503, 504)
+"""Statuses retried by `RestconfClient`, besides failed connections."""
+
+
 def restconf_patch_request(url: str, user_pw_auth: tuple[str, str], data: str):
     r"""Sends a restconf "PATCH" request to a network device
 
@@ -21,3 +47,253 @@ def restconf_patch_request(url: str, user_pw_auth: tuple[str, str], data: str):
     )
 
     return response
+
+
+class RestconfRequest(NamedTuple):
+    """A request of `RestconfClient.map`."""
+
+    method: str
+    url: str
+    data: BaseModel | str | bytes | None = None
+
+
+class RestconfResult(NamedTuple):
+    """The outcome of a `RestconfRequest`: its response, or the error that prevented one."""
+
+    request: RestconfRequest
+    response: Response | None
+    error: BaseException | None
+
+
+class RestconfJob(NamedTuple):
+    """A model to push to a device with `RestconfClient.push`."""
+
+    device: str
+    """Base URL of the device, e.g. `'https://10.0.0.1'`."""
+    path: str
+    """Path of the data resource, e.g. `'openconfig-interfaces:interfaces'`."""
+    data: BaseModel | str | bytes | None
+    method: str = "PATCH"
+
+    @property
+    def url(self) -> str:
+        return f"{self.device.rstrip('/')}/restconf/data/{self.path.lstrip('/')}"
+
+
+class RestconfJobResult(NamedTuple):
+    """The outcome of a `RestconfJob`: its response, or the error that prevented one."""
+
+    job: RestconfJob
+    response: Response | None
+    error: BaseException | None
+
+
+class RestconfClient:
+    r"""Sends RESTCONF requests to many devices over keep-alive connections
+
+    Connections are pooled per host and reused by later requests to the same device. Failed
+    connections and the statuses in `RETRY_STATUSES` are retried with exponential backoff, except
+    for `POST`, which is not idempotent. `map` sends requests from a pool of worker threads.
+
+    :param auth: tuple of username & password, e.g. `("user", "pw")`
+    :param workers: number of requests `map` sends at a time
+    :param connections_per_host: connections kept open to each device; further requests to the same device wait for one
+    :param max_hosts: number of devices whose connections are kept open, the least recently used are closed
+    :param retries: retries of a request before giving up
+    :param backoff: the n-th retry waits `backoff * 2 ** (n - 1)` seconds, or as long as a `Retry-After` header asks
+    :param timeout: seconds to wait for a connection and then for the response
+    :param verify: verify the TLS certificate of the devices, or the CA bundle to verify it with; `False` disables the verification
+    """
+
+    def __init__(
+        self,
+        auth: Tuple[str, str] | None = None,
+        *,
+        workers: int = 16,
+        connections_per_host: int = 4,
+        max_hosts: int = 1024,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float | Tuple[float, float] = (10, 60),
+        verify: bool | str = True,
+    ):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"PATCH"},
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=connections_per_host,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session: Session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.auth = auth
+        self.session.verify = verify
+        self.session.headers.update(
+            {"Accept": RESTCONF_MEDIA_TYPE, "Content-Type": RESTCONF_MEDIA_TYPE}
+        )
+        self.workers = workers
+        self.connections_per_host = connections_per_host
+        self.timeout = timeout
+        self._executor: ThreadPoolExecutor | None = None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: BaseModel | str | bytes | None = None,
+        **kwargs: Any,
+    ) -> Response:
+        r"""Sends a request and returns its response, whatever its status
+
+        :param method: HTTP method, e.g. `"PATCH"`
+        :param url: e.g. `'https://device/restconf/data/openconfig-interfaces:interfaces'`
+        :param data: payload; a model instance is serialized with `model_dump_json(exclude_defaults=True, by_alias=True)`
+        :param kwargs: passed on to `requests.Session.request`
+        """
+        from pydantic import BaseModel
+
+        if isinstance(data, BaseModel):
+            data = data.model_dump_json(exclude_defaults=True, by_alias=True)
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, data=data, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def put(self, url: str, data: BaseModel | str | bytes, **kwargs: Any) -> Response:
+        return self.request("PUT", url, data, **kwargs)
+
+    def post(self, url: str, data: BaseModel | str | bytes, **kwargs: Any) -> Response:
+        return self.request("POST", url, data, **kwargs)
+
+    def patch(self, url: str, data: BaseModel | str | bytes, **kwargs: Any) -> Response:
+        return self.request("PATCH", url, data, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def submit(
+        self,
+        method: str,
+        url: str,
+        data: BaseModel | str | bytes | None = None,
+        **kwargs: Any,
+    ) -> Future[Response]:
+        """Sends a request from a worker thread, and returns the future of its response."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(
+                self.workers, thread_name_prefix="restconf"
+            )
+        return self._executor.submit(self.request, method, url, data, **kwargs)
+
+    def map(
+        self, requests: Iterable[RestconfRequest | Tuple[Any, ...]]
+    ) -> Iterator[RestconfResult]:
+        r"""Sends requests from the worker threads and yields their results as they complete
+
+        Requests are taken from `requests` as earlier ones complete, so it may be a generator
+        of any length. Errors, e.g. devices that cannot be reached, are returned in the result
+        instead of being raised.
+
+        :param requests: `RestconfRequest`\ s or `(method, url[, data])` tuples
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        pending = iter(requests)
+        running: Dict[Future[Response], RestconfRequest] = dict()
+        while True:
+            for item in pending:
+                request = RestconfRequest(*item)
+                running[self.submit(*request)] = request
+                if len(running) >= 2 * self.workers:
+                    break
+            if not running:
+                return
+            for future in wait(running, return_when=FIRST_COMPLETED).done:
+                request = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    yield RestconfResult(request, future.result(), None)
+                else:
+                    yield RestconfResult(request, None, error)
+
+    async def push(
+        self,
+        jobs: Iterable[RestconfJob | Tuple[Any, ...]],
+        *,
+        concurrency: int | None = None,
+        per_device: int | None = None,
+    ) -> AsyncIterator[RestconfJobResult]:
+        r"""Pushes models to many devices from an event loop, and yields the results as they complete
+
+        Models are serialized and sent by the worker threads, so the event loop only waits for
+        them. Jobs are taken from `jobs` as earlier ones complete, at most four times
+        `concurrency` at a time. Errors are returned in the result instead of being raised.
+
+        :param jobs: `RestconfJob`\ s or `(device, path, data[, method])` tuples
+        :param concurrency: requests sent at a time to all devices, at most `workers`
+        :param per_device: requests sent at a time to a single device, defaults to `connections_per_host`
+        """
+        import asyncio
+
+        concurrency = min(concurrency or self.workers, self.workers)
+        per_device = per_device or self.connections_per_host
+        all_devices = asyncio.Semaphore(concurrency)
+        devices: Dict[str, Semaphore] = dict()
+
+        async def run(job: RestconfJob) -> RestconfJobResult:
+            device = devices.get(job.device)
+            if device is None:
+                device = devices[job.device] = asyncio.Semaphore(per_device)
+            async with device, all_devices:
+                future = self.submit(job.method, job.url, job.data)
+                try:
+                    response = await asyncio.wrap_future(future)
+                except Exception as error:
+                    return RestconfJobResult(job, None, error)
+            return RestconfJobResult(job, response, None)
+
+        pending = iter(jobs)
+        running: Set[Task[RestconfJobResult]] = set()
+        try:
+            while True:
+                for item in pending:
+                    running.add(asyncio.ensure_future(run(RestconfJob(*item))))
+                    if len(running) >= 4 * concurrency:
+                        break
+                if not running:
+                    return
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in running:
+                task.cancel()
+
+    def close(self) -> None:
+        """Waits for the requests sent, then closes all connections."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.session.close()
+
+    def __enter__(self) -> "RestconfClient":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
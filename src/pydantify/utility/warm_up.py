@@ -0,0 +1,36 @@
+def warm_up(*models: type, background: bool = True):
+    r"""Builds the validators of the generated models ahead of their first use
+
+    Models generated with `--defer-build` only build their validators when first used. Call this
+    once at startup to build them while the program does other work.
+
+    :param models: model classes to build, e.g. `InterfacesContainer`. Defaults to all models of this module
+    :param background: build in a daemon thread instead of blocking until done
+
+    :return: the thread building the validators, or `None` if not built in the background
+    """
+    import sys
+    import threading
+
+    from pydantic import BaseModel
+
+    def build() -> None:
+        module = sys.modules[__name__]
+        classes = models or [
+            getattr(module, name)
+            for name in getattr(module, "__all__", None) or list(vars(module))
+        ]
+        for cls in classes:
+            if (
+                isinstance(cls, type)
+                and issubclass(cls, BaseModel)
+                and cls.__module__.startswith(__name__)
+            ):
+                cls.model_rebuild()
+
+    if not background:
+        build()
+        return None
+    thread = threading.Thread(target=build, name="warm_up", daemon=True)
+    thread.start()
+    return thread
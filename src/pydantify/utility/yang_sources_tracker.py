@@ -11,27 +11,36 @@ logger = logging.getLogger("pydantify")
 
 
 class YANGSourcesTracker:
-    __relevant_files: Set[str]
+    __tracked_refs: Set[str] = set()
 
     @classmethod
     def track_from_pos(cls: Type[Self], pos: Position) -> None:
-        path = str(Path(pos.ref).absolute())
-        cls._relevant_files().add(path)
+        cls.__tracked_refs.add(pos.ref)
 
-    # TODO: Is this necessary?
-    # Pytest does not reset static class variable otherwise.
     @classmethod
-    def _relevant_files(cls) -> Set[str]:
-        if not hasattr(cls, "__relevant_files"):
-            cls.__relevant_files = set()
-        return cls.__relevant_files
+    def track_file(cls: Type[Self], file: str | Path) -> None:
+        cls.__tracked_refs.add(str(file))
+
+    @classmethod
+    def relevant_files(cls: Type[Self]) -> Set[str]:
+        """Returns the absolute paths of all tracked YANG files that exist on disk."""
+        return {
+            str(Path(ref).absolute())
+            for ref in cls.__tracked_refs
+            if Path(ref).is_file()
+        }
+
+    @classmethod
+    def reset(cls: Type[Self]) -> None:
+        """Forgets all tracked files. Called at the start of every generation run."""
+        cls.__tracked_refs = set()
 
     @classmethod
     def copy_yang_files(cls: Type[Self], input_root: Path, output_dir: Path) -> None:
         """Copy only the relevant YANG model files to the output directory."""
-        for f in cls._relevant_files():
+        for f in sorted(cls.relevant_files()):
             out_path = output_dir
-            if input_root is not None:
+            if input_root is not None and Path(f).is_relative_to(input_root):
                 delta = Path(f).parent.relative_to(input_root)
                 out_path = output_dir.joinpath(delta)
                 if not out_path.exists():
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple, Type
+
+from typing_extensions import Self
+
+from .exceptions import CompilationError
+
+logger = logging.getLogger("pydantify")
+
+FileState = Tuple[int, int] | None
+"""Modification time and size of a file, `None` if it does not exist."""
+
+
+def file_state(path: Path) -> FileState:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass
+class WatchTarget:
+    """An output file, and the YANG files it was generated from by the last build."""
+
+    input_file: Path
+    output_file: Path
+    options: Dict[str, Any] = field(default_factory=dict)
+    """Keyword arguments of `pydantify.compile()`."""
+    sources: Dict[Path, FileState] = field(default_factory=dict)
+
+
+class Watcher:
+    """Regenerates output files whenever one of their YANG sources changes.
+
+    Every build records the files the output depends on (the module, its transitive imports and
+    deviations, as loaded by pyang). Changes are detected by polling the modification time and
+    size of these files, so an edit only rebuilds the targets that read the edited file.
+    """
+
+    targets: List[WatchTarget] = []
+    interval: float = 0.5
+
+    @classmethod
+    def enabled(cls: Type[Self]) -> bool:
+        return len(cls.targets) > 0
+
+    @classmethod
+    def build(cls: Type[Self], targets: Iterable[WatchTarget]) -> int:
+        """Regenerates the given targets. Returns the number of failed builds."""
+        from .compiler import _compile
+
+        failures = 0
+        for target in targets:
+            start = time.time()
+            try:
+                result = _compile(target.input_file, **target.options)
+            except CompilationError as e:
+                logger.error(e)
+                failures += 1
+                # Keep watching the previous sources, and at least the input file
+                target.sources.setdefault(target.input_file, None)
+                target.sources = {p: file_state(p) for p in target.sources}
+                continue
+
+            target.sources = {p: file_state(p) for p in sorted(result.sources)}
+            if result.models == 0:
+                logger.warning(f'"{target.input_file.name}" defines no data nodes.')
+                continue
+            from .build import write_output, write_shared_types
+
+            write_output(target.output_file, result.text, result.files)
+            if result.type_modules:
+                # Next to the output module, or next to its package
+                output_dir = target.output_file.parent
+                if target.options.get("package", False):
+                    output_dir = output_dir.parent
+                write_shared_types(
+                    result.type_modules,
+                    output_dir,
+                    target.options.get("search_paths", []),
+                )
+            logger.info(
+                f'Generated "{target.output_file.name}" in {time.time() - start:.3f}s.'
+            )
+        return failures
+
+    @classmethod
+    def changed(cls: Type[Self]) -> List[WatchTarget]:
+        """Returns the targets of which any source changed since their last build."""
+        states: Dict[Path, FileState] = dict()
+        changed_files: Set[Path] = set()
+        outdated: List[WatchTarget] = []
+        for target in cls.targets:
+            for path in target.sources.keys():
+                if path not in states:
+                    states[path] = file_state(path)
+            changes = [p for p, s in target.sources.items() if states[p] != s]
+            if changes:
+                changed_files.update(changes)
+                outdated.append(target)
+        for path in sorted(changed_files):
+            logger.info(f'"{path}" changed.')
+        return outdated
+
+    @classmethod
+    def poll(cls: Type[Self]) -> List[WatchTarget]:
+        """Rebuilds the outdated targets once. Returns them."""
+        outdated = cls.changed()
+        cls.build(outdated)
+        return outdated
+
+    @classmethod
+    def run(cls: Type[Self]) -> int:
+        """Builds the targets not built yet, then rebuilds them on changes until interrupted."""
+        cls.build([target for target in cls.targets if not target.sources])
+        files = {path for target in cls.targets for path in target.sources}
+        logger.info(f"Watching {len(files)} files for changes. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(cls.interval)
+                cls.poll()
+        except KeyboardInterrupt:
+            return 0
@@ -1,6 +1,17 @@
+import json
 import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import List
+from unittest.mock import patch
+
 import pytest
 
+import pydantify
+
+EXAMPLES = Path(__file__).parent / "examples"
+
 if os.getenv("_PYTEST_RAISE", "0") != "0":
 
     @pytest.hookimpl(tryfirst=True)
@@ -10,3 +21,63 @@ if os.getenv("_PYTEST_RAISE", "0") != "0":
     @pytest.hookimpl(tryfirst=True)
     def pytest_internalerror(excinfo):
         raise excinfo.value
+
+
+def reset_pyang():
+    """Forgets the pyang plugins and generated class names of earlier runs."""
+    from pyang import plugin
+
+    from pydantify.models.base import Node
+
+    plugin.plugins = []
+    Node._name_count = dict()
+
+
+@pytest.fixture(autouse=True)
+def reset_pyang_state():
+    reset_pyang()
+
+
+@pytest.fixture
+def run_pydantify():
+    """Returns a function running the `pydantify` command on a YANG file, which must exit with `exit_code`."""
+
+    def run(
+        input_file: Path, output_folder: Path, args: List[str] = [], exit_code: int = 0
+    ):
+        args = [
+            sys.argv[0],
+            *args,
+            f"-i={input_file.parent}",
+            f"-o={output_folder}",
+            str(input_file),
+        ]
+        reset_pyang()
+        with patch.object(sys, "argv", args):
+            from pydantify.main import main
+
+            try:
+                main()
+            except SystemExit as e:
+                assert (e.code or 0) == exit_code, f"Pyang exited with {e.code}"
+            else:
+                assert exit_code == 0, "Pyang exited without errors"
+
+    return run
+
+
+@pytest.fixture
+def load_sample():
+    """Returns a function loading the sample data of an example, validated by its generated models."""
+
+    def load(input_file: str, deviations: List[str] = []):
+        module = ModuleType(f"sample_{Path(input_file).parent.name}")
+        sys.modules[module.__name__] = module
+        source = pydantify.compile(
+            EXAMPLES / input_file, deviations=[EXAMPLES / d for d in deviations]
+        )
+        exec(source, module.__dict__)
+        sample_data = (EXAMPLES / input_file).parent / "sample_data.json"
+        return module.Model.model_validate(json.loads(sample_data.read_text()))
+
+    return load
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Annotated, ClassVar, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class LocalContainer(BaseModel):
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = (
+        "http://pydantify.github.io/ns/yang/pydantify-interfaces"
+    )
+    prefix: ClassVar[Optional[str]] = "if"
+    address: Annotated[Optional[str], Field(alias="interfaces:address")] = None
+    """
+    IP address
+    """
+    port: Annotated[Optional[int], Field(alias="interfaces:port", ge=0, le=65535)] = (
+        None
+    )
+    """
+    Port number
+    """
+
+
+class MonitorContainer(BaseModel):
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = (
+        "http://pydantify.github.io/ns/yang/pydantify-interfaces"
+    )
+    prefix: ClassVar[Optional[str]] = "if"
+    address: Annotated[Optional[str], Field(alias="interfaces:address")] = None
+    """
+    IP address
+    """
+    port: Annotated[Optional[int], Field(alias="interfaces:port", ge=0, le=65535)] = 161
+    """
+    Port number
+    """
+
+
+class PrimaryContainer(BaseModel):
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = (
+        "http://pydantify.github.io/ns/yang/pydantify-interfaces"
+    )
+    prefix: ClassVar[Optional[str]] = "if"
+    local: Annotated[Optional[LocalContainer], Field(alias="interfaces:local")] = None
+    remote: Annotated[Optional[LocalContainer], Field(alias="interfaces:remote")] = None
+
+
+class RemoteContainer(BaseModel):
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = (
+        "http://pydantify.github.io/ns/yang/pydantify-interfaces"
+    )
+    prefix: ClassVar[Optional[str]] = "if"
+    address: Annotated[Optional[str], Field(alias="interfaces:address")] = None
+    """
+    IP address
+    """
+    port: Annotated[Optional[int], Field(alias="interfaces:port", ge=0, le=65535)] = (
+        None
+    )
+    """
+    Port number
+    """
+    vrf: Annotated[Optional[str], Field(alias="interfaces:vrf")] = None
+    """
+    VRF of the remote endpoint
+    """
+
+
+class BackupContainer(BaseModel):
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = (
+        "http://pydantify.github.io/ns/yang/pydantify-interfaces"
+    )
+    prefix: ClassVar[Optional[str]] = "if"
+    local: Annotated[Optional[LocalContainer], Field(alias="interfaces:local")] = None
+    remote: Annotated[Optional[RemoteContainer], Field(alias="interfaces:remote")] = (
+        None
+    )
+
+
+class Model(BaseModel):
+    """
+    Initialize an instance of this class and serialize it to JSON; this results in a RESTCONF payload.
+
+    ## Tips
+    Initialization:
+    - all values have to be set via keyword arguments
+    - if a class contains only a `root` field, it can be initialized as follows:
+        - `member=MyNode(root=<value>)`
+        - `member=<value>`
+
+    Serialziation:
+    - `exclude_defaults=True` omits fields set to their default value (recommended)
+    - `by_alias=True` ensures qualified names are used (necessary)
+    """
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = (
+        "http://pydantify.github.io/ns/yang/pydantify-interfaces"
+    )
+    prefix: ClassVar[Optional[str]] = "if"
+    primary: Annotated[
+        Optional[PrimaryContainer], Field(alias="interfaces:primary")
+    ] = None
+    backup: Annotated[Optional[BackupContainer], Field(alias="interfaces:backup")] = (
+        None
+    )
+    monitor: Annotated[
+        Optional[MonitorContainer], Field(alias="interfaces:monitor")
+    ] = None
+
+
+if __name__ == "__main__":
+    model = Model(
+        # <Initialize model here>
+    )
+
+    restconf_payload = model.model_dump_json(
+        exclude_defaults=True, by_alias=True, indent=2
+    )
+
+    print(f"Generated output: {restconf_payload}")
+
+    # Send config to network device:
+    # from pydantify.utility import restconf_patch_request
+    # restconf_patch_request(url='...', user_pw_auth=('usr', 'pw'), data=restconf_payload)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Annotated, ClassVar, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .yang_types import common_types, link_types
+
+
+class InterfaceListEntry(BaseModel):
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = "urn:example:interfaces"
+    prefix: ClassVar[Optional[str]] = "if"
+    name: Annotated[common_types.NameString, Field(alias="interfaces:name")]
+    description: Annotated[Optional[str], Field(alias="interfaces:description")] = None
+    type: Annotated[Optional[str], Field(alias="interfaces:type")] = None
+    speed: Annotated[
+        Optional[common_types.PortSpeed], Field(alias="interfaces:speed")
+    ] = common_types.PortSpeed("auto")
+    negotiated_speed: Annotated[
+        Optional[link_types.LinkSpeed], Field(alias="interfaces:negotiated-speed")
+    ] = None
+    load: Annotated[Optional[common_types.Percent], Field(alias="interfaces:load")] = (
+        None
+    )
+    vlan: Annotated[
+        Optional[common_types.VlanOrAny], Field(alias="interfaces:vlan")
+    ] = None
+    mtu: Annotated[Optional[link_types.Mtu], Field(alias="interfaces:mtu")] = 1500
+
+
+class InterfacesContainer(BaseModel):
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = "urn:example:interfaces"
+    prefix: ClassVar[Optional[str]] = "if"
+    interface: Annotated[
+        Optional[List[InterfaceListEntry]],
+        Field(default_factory=list, alias="interfaces:interface"),
+    ]
+
+
+class Model(BaseModel):
+    """
+    Initialize an instance of this class and serialize it to JSON; this results in a RESTCONF payload.
+
+    ## Tips
+    Initialization:
+    - all values have to be set via keyword arguments
+    - if a class contains only a `root` field, it can be initialized as follows:
+        - `member=MyNode(root=<value>)`
+        - `member=<value>`
+
+    Serialziation:
+    - `exclude_defaults=True` omits fields set to their default value (recommended)
+    - `by_alias=True` ensures qualified names are used (necessary)
+    """
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        regex_engine="python-re",
+    )
+    namespace: ClassVar[Optional[str]] = "urn:example:interfaces"
+    prefix: ClassVar[Optional[str]] = "if"
+    interfaces: Annotated[
+        Optional[InterfacesContainer], Field(alias="interfaces:interfaces")
+    ] = None
+
+
+if __name__ == "__main__":
+    model = Model(
+        # <Initialize model here>
+    )
+
+    restconf_payload = model.model_dump_json(
+        exclude_defaults=True, by_alias=True, indent=2
+    )
+
+    print(f"Generated output: {restconf_payload}")
+
+    # Send config to network device:
+    # from pydantify.utility import restconf_patch_request
+    # restconf_patch_request(url='...', user_pw_auth=('usr', 'pw'), data=restconf_payload)
@@ -0,0 +1,40 @@
+"""Types of the YANG module common-types."""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Annotated, Union
+
+from pydantic import Field
+
+Percent = Annotated[int, Field(ge=0, le=100)]
+"""
+A percentage.
+"""
+
+
+class Speed(Enum):
+    """
+    Link speed.
+    """
+
+    auto = "auto"
+    field_100M = "100M"
+    field_1G = "1G"
+
+
+PortSpeed = Speed
+
+
+class VlanOrAnyEnum(Enum):
+    any = "any"
+
+
+VlanOrAny = Union[Annotated[int, Field(ge=1, le=4094)], VlanOrAnyEnum]
+
+
+NameString = Annotated[str, Field(min_length=1, max_length=32)]
+
+
+INTERFACE_TYPE = "common-types:interface-type"
+ETHERNET = "common-types:ethernet"
@@ -0,0 +1,17 @@
+"""Types of the YANG module link-types."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from pydantic import Field
+
+from . import common_types
+
+Mtu = Annotated[int, Field(ge=68, le=9216)]
+
+
+LinkSpeed = common_types.Speed
+"""
+Speed negotiated on the link.
+"""
@@ -0,0 +1,211 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+from pytest import param
+
+import pydantify
+from pydantify.build import (
+    BuildOptions,
+    ModuleGraph,
+    build,
+    output_file_name,
+    scan_file,
+)
+from pydantify.compiler import _compile_types
+from pydantify.exceptions import CompilationError
+
+EXAMPLES = Path(__package__) / "examples"
+
+
+def run_build(directory: Path, output_folder: Path, args: List[str] = []) -> int:
+    args = [sys.argv[0], "build", *args, f"-o={output_folder}", str(directory)]
+    with patch.object(sys, "argv", args):
+        from pydantify.main import main
+
+        with pytest.raises(SystemExit) as e:
+            main()
+    assert isinstance(e.value.code, int)
+    return e.value.code
+
+
+@pytest.fixture
+def catalog(tmp_path: Path) -> Path:
+    directory = tmp_path / "yang"
+    directory.mkdir()
+    for file in (EXAMPLES / "openconfig").glob("*.yang"):
+        # Put some modules into a subdirectory, imports must still be found
+        target = directory / "types" if "types" in file.name else directory
+        target.mkdir(exist_ok=True)
+        shutil.copy(file, target)
+    return directory
+
+
+def test_scan_file():
+    info = scan_file(EXAMPLES / "openconfig" / "openconfig-interfaces.yang")
+    assert info is not None
+    assert info.name == "openconfig-interfaces"
+    assert info.submodule is False
+    assert info.has_data is True
+    assert "ietf-interfaces" in info.imports
+    assert info.revision != ""
+
+    info = scan_file(EXAMPLES / "openconfig" / "openconfig-types.yang")
+    assert info is not None
+    assert info.has_data is False
+
+
+def test_entry_modules():
+    graph = ModuleGraph(
+        info
+        for info in map(scan_file, sorted((EXAMPLES / "openconfig").glob("*.yang")))
+        if info is not None
+    )
+    entries = [info.name for info in graph.entry_modules()]
+    # Most dependencies first
+    assert entries == ["openconfig-interfaces", "ietf-interfaces"]
+    assert graph.missing() == set()
+
+
+@pytest.mark.parametrize(
+    "file_name, args",
+    [
+        param("openconfig_interfaces.py", ["-w=2"], id="pydantic"),
+        param("openconfig-interfaces.json", ["-w=2", "-j"], id="json-schema"),
+        param("openconfig_interfaces.py", ["-w=1", "--native"], id="single worker"),
+    ],
+)
+def test_build(catalog: Path, tmp_path: Path, file_name: str, args: List[str]):
+    output_dir = tmp_path / "out"
+    assert run_build(catalog, output_dir, args) == 0
+
+    outputs = sorted(p.name for p in output_dir.iterdir())
+    suffix = Path(file_name).suffix
+    expected = [output_file_name(m, suffix == ".json") for m in ("ietf-interfaces",)]
+    expected += [file_name]
+    if suffix == ".py":
+        expected += ["__init__.py"]
+    assert outputs == sorted(expected)
+
+    # Same output as compiling the module on its own
+    output = pydantify.compile(
+        catalog / "openconfig-interfaces.yang",
+        search_paths=[catalog],
+        json_schema="-j" in args,
+        native="--native" in args,
+    )
+    text = (output_dir / file_name).read_text()
+    assert (json.loads(text) if suffix == ".json" else text) == output
+
+
+def test_build_trim_path(catalog: Path, tmp_path: Path):
+    trim_path = "openconfig-interfaces/interfaces/interface/config"
+    output_dir = tmp_path / "out"
+    assert run_build(catalog, output_dir, ["-w=1", f"-t={trim_path}"]) == 0
+
+    # Only the module the trim path starts in is compiled
+    outputs = sorted(p.name for p in output_dir.iterdir())
+    assert outputs == ["__init__.py", "openconfig_interfaces.py"]
+    output = pydantify.compile(
+        catalog / "openconfig-interfaces.yang",
+        search_paths=[catalog],
+        trim_path=trim_path,
+    )
+    assert (output_dir / "openconfig_interfaces.py").read_text() == output
+
+
+def test_build_failure(catalog: Path, tmp_path: Path):
+    (catalog / "broken.yang").write_text(
+        "module broken { namespace urn:broken; prefix b; container c { leaf l { type missing; } } }"
+    )
+    output_dir = tmp_path / "out"
+    assert run_build(catalog, output_dir, ["-w=2"]) == 1
+    assert (output_dir / "openconfig_interfaces.py").exists()
+    assert not (output_dir / "broken.py").exists()
+
+
+def test_build_output_name_clash(tmp_path: Path):
+    catalog = tmp_path / "yang"
+    catalog.mkdir()
+    for name in ("foo-bar", "foo_bar"):
+        (catalog / f"{name}.yang").write_text(
+            f"module {name} {{ namespace urn:{name}; prefix p; leaf l {{ type string; }} }}"
+        )
+    output_dir = tmp_path / "out"
+    with pytest.raises(CompilationError, match='"foo_bar.py": "foo-bar", "foo_bar"'):
+        build(catalog, BuildOptions(output_dir=output_dir), workers=1)
+    assert run_build(catalog, output_dir, ["-w=2"]) == 1
+    assert not (output_dir / "foo_bar.py").exists()
+
+    # JSON schema files keep the module names
+    assert run_build(catalog, output_dir, ["-w=2", "-j"]) == 0
+    assert (output_dir / "foo-bar.json").exists()
+    assert (output_dir / "foo_bar.json").exists()
+
+
+def test_build_shared_types(tmp_path: Path):
+    catalog = tmp_path / "yang"
+    shutil.copytree(EXAMPLES / "with_shared_types", catalog)
+    # A second module importing the same types
+    text = (catalog / "interfaces.yang").read_text()
+    (catalog / "ports.yang").write_text(
+        text.replace("module interfaces", "module ports")
+        .replace("urn:example:interfaces", "urn:example:ports")
+        .replace("prefix if;", "prefix p;")
+    )
+    output_dir = tmp_path / "out"
+    with patch(
+        "pydantify.compiler._compile_types", wraps=_compile_types
+    ) as compile_types:
+        assert (
+            run_build(catalog, output_dir, ["-w=1", "--native", "--shared-types"]) == 0
+        )
+    # Each type module is generated once, not once per importing module
+    assert sorted(c.args[0].name for c in compile_types.call_args_list) == [
+        "common-types.yang",
+        "link-types.yang",
+    ]
+    assert sorted(p.name for p in (output_dir / "yang_types").iterdir()) == [
+        "__init__.py",
+        "common_types.py",
+        "link_types.py",
+    ]
+    for module in ("interfaces", "ports"):
+        text = (output_dir / f"{module}.py").read_text()
+        assert "from .yang_types import common_types, link_types" in text
+
+
+def test_build_shared_types_requires_native(catalog: Path, tmp_path: Path):
+    assert run_build(catalog, tmp_path / "out", ["--shared-types"]) == 2
+
+
+def test_build_package(catalog: Path, tmp_path: Path):
+    output_dir = tmp_path / "out"
+    assert run_build(catalog, output_dir, ["-w=1", "--native", "--package"]) == 0
+    package = output_dir / "openconfig_interfaces"
+    assert sorted(p.name for p in package.iterdir()) == [
+        "__init__.py",
+        "_model.py",
+        "config.py",
+        "hold_time.py",
+        "state.py",
+        "subinterfaces.py",
+    ]
+    assert "def __getattr__(name: str)" in (package / "__init__.py").read_text()
+
+
+def test_build_duplicate_module(catalog: Path, tmp_path: Path):
+    module = "module dup { namespace urn:dup; prefix d; leaf %s { type string; } }"
+    (catalog / "dup.yang").write_text(module % "a")
+    (catalog / "types" / "dup.yang").write_text(module % "a")
+    # Identical copies of a module are fine
+    assert run_build(catalog, tmp_path / "out", ["-w=1"]) == 0
+
+    (catalog / "types" / "dup.yang").write_text(module % "b")
+    with pytest.raises(CompilationError, match="dup.yang.*types/dup.yang"):
+        build(catalog, BuildOptions(output_dir=tmp_path / "out"), workers=1)
+    assert run_build(catalog, tmp_path / "out", ["-w=1"]) == 1
@@ -0,0 +1,99 @@
+import shutil
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def model_dir(tmp_path: Path) -> Path:
+    """Writable copy of the openconfig example, which spans several YANG files."""
+    src = Path(__package__) / "examples/openconfig"
+    dst = tmp_path / "model"
+    shutil.copytree(src, dst)
+    return dst
+
+
+def pyang_must_not_run():
+    raise AssertionError("Pyang was invoked despite an up-to-date build cache.")
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        pytest.param(["-t=openconfig-interfaces/interfaces/interface/config"], id="py"),
+        pytest.param(
+            ["-j", "-t=openconfig-interfaces/interfaces/interface/config"], id="json"
+        ),
+    ],
+)
+def test_unchanged_build_is_restored(
+    model_dir: Path, tmp_path: Path, args: List[str], run_pydantify
+):
+    cache_dir = tmp_path / "cache"
+    input_file = model_dir / "openconfig-interfaces.yang"
+    out1, out2 = tmp_path / "out1", tmp_path / "out2"
+    output_name = "out.json" if "-j" in args else "out.py"
+
+    run_pydantify(input_file, out1, [*args, f"--cache-dir={cache_dir}"])
+    assert len(list((cache_dir / "manifests").iterdir())) == 1
+
+    with patch("pyang.scripts.pyang_tool.run", pyang_must_not_run):
+        run_pydantify(input_file, out2, [*args, f"--cache-dir={cache_dir}"])
+    assert (out1 / output_name).read_text() == (out2 / output_name).read_text()
+
+
+def test_changed_import_invalidates_cache(
+    model_dir: Path, tmp_path: Path, run_pydantify
+):
+    cache_dir = tmp_path / "cache"
+    input_file = model_dir / "openconfig-interfaces.yang"
+    args = [
+        "-t=openconfig-interfaces/interfaces/interface/config",
+        f"--cache-dir={cache_dir}",
+    ]
+    run_pydantify(input_file, tmp_path / "out1", args)
+
+    imported = model_dir / "openconfig-types.yang"
+    imported.write_text(imported.read_text() + "\n// touched\n")
+    with patch("pyang.scripts.pyang_tool.run") as run:
+        run_pydantify(input_file, tmp_path / "out2", args)
+    run.assert_called_once()
+
+
+def test_changed_settings_invalidate_cache(
+    model_dir: Path, tmp_path: Path, run_pydantify
+):
+    cache_dir = tmp_path / "cache"
+    input_file = model_dir / "openconfig-interfaces.yang"
+    run_pydantify(input_file, tmp_path / "out1", [f"--cache-dir={cache_dir}", "-n"])
+    with patch("pyang.scripts.pyang_tool.run") as run:
+        run_pydantify(input_file, tmp_path / "out2", [f"--cache-dir={cache_dir}"])
+    run.assert_called_once()
+
+
+def test_verification_build_copies_yang_files(
+    model_dir: Path, tmp_path: Path, run_pydantify
+):
+    cache_dir = tmp_path / "cache"
+    input_file = model_dir / "openconfig-interfaces.yang"
+    args = ["-V", f"--cache-dir={cache_dir}"]
+    run_pydantify(input_file, tmp_path / "out1", args)
+    with patch("pyang.scripts.pyang_tool.run", pyang_must_not_run):
+        run_pydantify(input_file, tmp_path / "out2", args)
+
+    copied1 = sorted(p.name for p in (tmp_path / "out1").glob("*.yang"))
+    copied2 = sorted(p.name for p in (tmp_path / "out2").glob("*.yang"))
+    assert "openconfig-interfaces.yang" in copied1
+    assert copied1 == copied2
+
+
+def test_failed_build_is_not_cached(model_dir: Path, tmp_path: Path, run_pydantify):
+    cache_dir = tmp_path / "cache"
+    input_file = model_dir / "openconfig-interfaces.yang"
+    interface = "openconfig-interfaces/interfaces/interface"
+    # Both branches would become a field named "config"
+    args = [f"-t={interface}/config", f"-t={interface}/hold-time/config"]
+    run_pydantify(input_file, tmp_path / "out", [*args, f"--cache-dir={cache_dir}"], 1)
+    assert not list(cache_dir.glob("manifests/*"))
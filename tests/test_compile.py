@@ -0,0 +1,211 @@
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from pytest import param
+
+import pydantify
+from pydantify import CompilationError
+
+EXAMPLES = Path(__package__) / "examples"
+
+
+@pytest.mark.parametrize(
+    ("input_file", "args"),
+    [
+        param("minimal/interfaces.yang", [], id="minimal"),
+        param("with_enum/interfaces.yang", ["--standalone"], id="enum standalone"),
+        param(
+            "openconfig/openconfig-interfaces.yang",
+            ["-t=openconfig-interfaces/interfaces/interface/config"],
+            id="openconfig trimmed",
+        ),
+        param(
+            "openconfig/openconfig-interfaces.yang",
+            [
+                "-t=openconfig-interfaces/interfaces/interface/config",
+                "-t=openconfig-interfaces/interfaces/interface/hold-time/s*",
+            ],
+            id="openconfig several trim paths",
+        ),
+    ],
+)
+def test_compile_matches_cli(
+    input_file: str, args: List[str], tmp_path: Path, run_pydantify
+):
+    run_pydantify(EXAMPLES / input_file, tmp_path, args)
+    source = pydantify.compile(
+        EXAMPLES / input_file,
+        standalone="--standalone" in args,
+        trim_path=[a[3:] for a in args if a.startswith("-t=")],
+    )
+    assert source == (tmp_path / "out.py").read_text()
+
+
+@pytest.mark.parametrize("native", [False, True], ids=["default", "native"])
+def test_compile_json_schema(native: bool):
+    schema = pydantify.compile(
+        EXAMPLES / "with_augment/configuration.yang",
+        deviations=[
+            EXAMPLES / "with_augment/namespaces.yang",
+            EXAMPLES / "with_augment/interfaces.yang",
+        ],
+        json_schema=True,
+        native=native,
+    )
+    expected = json.loads((EXAMPLES / "with_augment/expected.json").read_text())
+    assert schema == expected
+
+
+def test_compile_is_isolated():
+    from pydantify.models.base import Node
+    from pydantify.utility.model_generator import ModelGenerator
+
+    Node._name_count = {"InterfacesContainer": 5}
+    ModelGenerator.trim_path = "/some/path"
+
+    first = pydantify.compile(EXAMPLES / "minimal/interfaces.yang")
+    second = pydantify.compile(EXAMPLES / "minimal/interfaces.yang")
+    assert first == second
+    assert "class InterfacesContainer(" in first
+
+    # The caller's state is left untouched
+    assert Node._name_count == {"InterfacesContainer": 5}
+    assert ModelGenerator.trim_path == "/some/path"
+    ModelGenerator.trim_path = None
+
+
+def test_compile_from_threads():
+    input_files = [
+        EXAMPLES / "minimal/interfaces.yang",
+        EXAMPLES / "with_enum/interfaces.yang",
+        EXAMPLES / "with_typedef/interfaces.yang",
+        EXAMPLES / "turing-machine/turing-machine.yang",
+    ]
+    expected = [pydantify.compile(f, native=True) for f in input_files]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(
+            pool.map(lambda f: pydantify.compile(f, native=True), input_files * 3)
+        )
+    assert results == expected * 3
+
+
+def test_compile_invalid_trim_path():
+    with pytest.raises(CompilationError, match="Invalid module"):
+        pydantify.compile(EXAMPLES / "minimal/interfaces.yang", trim_path="/nope")
+
+
+INTERFACE = "openconfig-interfaces/interfaces/interface"
+
+
+@pytest.mark.parametrize(
+    ("trim_path", "fields"),
+    [
+        param(
+            [f"{INTERFACE}/config", f"{INTERFACE}/hold-time"],
+            ["config", "hold-time"],
+            id="several paths",
+        ),
+        param([f"{INTERFACE}/hold-time/*"], ["config", "state"], id="glob"),
+        param(
+            [f"{INTERFACE}/hold-time", f"{INTERFACE}/hold-time/state"],
+            ["hold-time"],
+            id="nested branch dropped",
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "native", [param(False, id="default"), param(True, id="native")]
+)
+def test_compile_trim_paths(trim_path: List[str], fields: List[str], native: bool):
+    schema = pydantify.compile(
+        EXAMPLES / "openconfig/openconfig-interfaces.yang",
+        trim_path=trim_path,
+        json_schema=True,
+        native=native,
+    )
+    assert list(schema["properties"]) == [
+        f"openconfig-interfaces:{field}" for field in fields
+    ]
+
+
+def test_compile_trim_paths_duplicate_names():
+    with pytest.raises(CompilationError, match='several nodes named "config"'):
+        pydantify.compile(
+            EXAMPLES / "openconfig/openconfig-interfaces.yang",
+            trim_path=[f"{INTERFACE}/config", f"{INTERFACE}/hold-time/config"],
+        )
+
+
+def class_state() -> Dict[str, Any]:
+    """Returns a copy of the class attributes of the generator, other than methods."""
+    from pydantify.models.base import Node
+    from pydantify.models.typeresolver import TypeResolver
+    from pydantify.utility.model_generator import ModelGenerator
+    from pydantify.utility.parse_cache import ParseCache
+    from pydantify.utility.yang_sources_tracker import YANGSourcesTracker
+
+    return {
+        f"{cls.__name__}.{name}": (
+            copy.copy(value) if isinstance(value, (dict, list, set)) else value
+        )
+        for cls in (Node, TypeResolver, ModelGenerator, ParseCache, YANGSourcesTracker)
+        for name, value in vars(cls).items()
+        if not name.startswith("__")
+        and not callable(value)
+        and not isinstance(value, (classmethod, staticmethod, property))
+    }
+
+
+def test_compile_options_do_not_leak():
+    input_file = EXAMPLES / "openconfig/openconfig-interfaces.yang"
+    options: Dict[str, Any] = dict(
+        trim_path=f"{INTERFACE}/config",
+        data_type="config",
+        strip_namespace=True,
+        share_groupings=True,
+        serialization_plans=True,
+        defer_build=True,
+        standalone=True,
+    )
+    before = class_state()
+    plain = pydantify.compile(input_file, native=True)
+    configured = pydantify.compile(input_file, native=True, **options)
+    assert configured != plain
+
+    # Back-to-back calls with different options give the same output as before
+    assert pydantify.compile(input_file, native=True) == plain
+    assert pydantify.compile(input_file, native=True, **options) == configured
+    assert class_state() == before
+
+
+def test_compile_invalid_yang(tmp_path: Path):
+    broken = tmp_path / "broken.yang"
+    broken.write_text(
+        "module broken {\n"
+        "  namespace 'urn:broken';\n"
+        "  prefix b;\n"
+        "  leaf x { type no-such-type; }\n"
+        "}\n"
+    )
+    with pytest.raises(CompilationError) as e:
+        pydantify.compile(broken)
+    assert len(e.value.errors) == 1
+    assert "no-such-type" in e.value.errors[0]
+
+
+@pytest.mark.parametrize(
+    "native", [param(False, id="default"), param(True, id="native")]
+)
+def test_compile_share_groupings(native: bool):
+    input_file = EXAMPLES / "openconfig/openconfig-interfaces.yang"
+    separate = pydantify.compile(input_file, native=native)
+    shared = pydantify.compile(input_file, native=native, share_groupings=True)
+    assert isinstance(separate, str) and isinstance(shared, str)
+    # Interfaces and subinterfaces use the same counters grouping
+    assert "class CountersContainer2(" in separate
+    assert "class CountersContainer2(" not in shared
+    assert len(shared) < len(separate)
@@ -0,0 +1,102 @@
+import json
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator, List
+from unittest.mock import patch
+
+import pytest
+from pytest import param
+
+import pydantify
+from pydantify import CompilationError
+from pydantify.daemon import create_server, request
+
+EXAMPLES = Path(__package__) / "examples"
+
+
+def run_client(socket_path: Path, args: List[str]) -> int:
+    args = [sys.argv[0], "client", f"--socket={socket_path}", *args]
+    with patch.object(sys, "argv", args):
+        from pydantify.main import main
+
+        with pytest.raises(SystemExit) as e:
+            main()
+    assert isinstance(e.value.code, int)
+    return e.value.code
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    # Unix socket paths are limited to about 100 characters, pytest's tmp_path may be longer
+    directory = Path(tempfile.mkdtemp(prefix="pydantify-"))
+    server = create_server(directory / "daemon.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield directory / "daemon.sock"
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory)
+
+
+@pytest.mark.parametrize(
+    "input_file, options",
+    [
+        param(
+            EXAMPLES / "with_leafref" / "interfaces.yang",
+            dict(trim_path="/interfaces/interfaces"),
+            id="pydantic",
+        ),
+        param(
+            EXAMPLES / "openconfig" / "openconfig-interfaces.yang",
+            dict(json_schema=True, native=True, data_type="config"),
+            id="json-schema",
+        ),
+    ],
+)
+def test_request(socket_path: Path, input_file: Path, options: dict):
+    output = request(input_file, socket_path=socket_path, **options)
+    assert output == pydantify.compile(input_file, **options)
+
+    # Parsed modules stay in memory between requests
+    assert request(input_file, socket_path=socket_path, **options) == output
+
+
+def test_request_errors(socket_path: Path, tmp_path: Path):
+    broken = tmp_path / "broken.yang"
+    broken.write_text("module broken { namespace urn:broken; prefix b; leaf l; }")
+    with pytest.raises(CompilationError) as e:
+        request(broken, socket_path=socket_path)
+    assert len(e.value.errors) > 0
+
+    with pytest.raises(CompilationError, match="Unknown options: verbose"):
+        request(broken, socket_path=socket_path, verbose=True)
+
+
+def test_request_without_daemon(tmp_path: Path):
+    with pytest.raises(OSError):
+        request(
+            EXAMPLES / "openconfig" / "openconfig-interfaces.yang",
+            socket_path=tmp_path / "missing.sock",
+        )
+
+
+def test_create_server_twice(socket_path: Path):
+    with pytest.raises(OSError, match="already listening"):
+        create_server(socket_path)
+
+
+def test_client(socket_path: Path, tmp_path: Path):
+    input_file = EXAMPLES / "with_leafref" / "interfaces.yang"
+    args = [f"-o={tmp_path}", "-j", "-t=/interfaces/interfaces", str(input_file)]
+    assert run_client(socket_path, args) == 0
+    output = json.loads((tmp_path / "out.json").read_text())
+    assert output == pydantify.compile(
+        input_file, json_schema=True, trim_path="/interfaces/interfaces"
+    )
+
+    assert (
+        run_client(socket_path, [f"-o={tmp_path}", str(tmp_path / "missing.yang")]) == 1
+    )
@@ -25,174 +25,155 @@ def import_from_path(module_name: str, file_path: Path) -> ModuleType:
     return module
 
 
-def run_pydantify(input_file: Path, output_folder: Path, args: List[str] = []):
-    args = [
-        sys.argv[0],
-        *args,
-        f"-i={input_file.parent}",
-        f"-o={output_folder}",
-        str(input_file),
-    ]
-    with patch.object(sys, "argv", args):
-        from pydantify.main import main
-
-        try:
-            main()
-        except SystemExit as e:
-            assert e.code == 0, f"Pyang exited with errors:\n{e}"
-
-
-@pytest.fixture(autouse=True)
-def reset_optparse():
-    from pyang import plugin
-
-    from pydantify.models.base import Node
-
-    # Reset plugins. Otherwise pyang creates cross-test side-effects. TODO: Better way?
-    plugin.plugins = []
-    Node._name_count = dict()
+MODEL_PARAMS = [
+    param(
+        "examples/minimal/interfaces.yang",
+        "examples/minimal/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="minimal",
+    ),
+    param(
+        "examples/with_typedef/interfaces.yang",
+        "examples/with_typedef/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="typedef",
+    ),
+    param(
+        "examples/with_leafref/interfaces.yang",
+        "examples/with_leafref/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="leafref",
+    ),
+    param(
+        "examples/with_restrictions/interfaces.yang",
+        "examples/with_restrictions/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="restrictions",
+    ),
+    param(
+        "examples/with_uses/interfaces.yang",
+        "examples/with_uses/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="uses",
+    ),
+    param(
+        "examples/with_case/interfaces.yang",
+        "examples/with_case/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="case",
+    ),
+    param(
+        "examples/with_complex_case/interfaces.yang",
+        "examples/with_complex_case/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="complex case",
+    ),
+    param(
+        "examples/turing-machine/turing-machine.yang",
+        "examples/turing-machine/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="turing machine",
+    ),
+    param(
+        "examples/with_leaflist/interfaces.yang",
+        "examples/with_leaflist/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="leaf-list",
+    ),
+    param(
+        "examples/with_union/interfaces.yang",
+        "examples/with_union/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="type union",
+    ),
+    param(
+        "examples/with_identity_default/interfaces.yang",
+        "examples/with_identity_default/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="identity default",
+    ),
+    param(
+        "examples/with_enum/interfaces.yang",
+        "examples/with_enum/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="enum",
+    ),
+    param(
+        "examples/with_decimal64/interfaces.yang",
+        "examples/with_decimal64/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="decimal64",
+    ),
+    param(
+        "examples/with_bits/interfaces.yang",
+        "examples/with_bits/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="bits",
+    ),
+    param(
+        "examples/with_leafref2/keychains.yang",
+        "examples/with_leafref2/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="leafref2",
+    ),
+    param(
+        "examples/with_identity_default_list/ciphers.yang",
+        "examples/with_identity_default_list/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="identity default list",
+    ),
+    param(
+        "examples/with_empty/interface.yang",
+        "examples/with_empty/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="empty",
+    ),
+    param(
+        "examples/with_import_uses/configuration.yang",
+        "examples/with_import_uses/sample_data.json",
+        [],
+        {"exclude_defaults": True, "mode": "json"},
+        id="with_import_uses",
+    ),
+    param(
+        "examples/with_augment/configuration.yang",
+        "examples/with_augment/sample_data.json",
+        [
+            "--deviation-module=tests/examples/with_augment/namespaces.yang",
+            "--deviation-module=tests/examples/with_augment/interfaces.yang",
+        ],
+        {"exclude_defaults": True, "mode": "json"},
+        id="with_augment",
+    ),
+    param(
+        "examples/with_shared_grouping/interfaces.yang",
+        "examples/with_shared_grouping/sample_data.json",
+        ["--share-groupings"],
+        {"exclude_defaults": True, "by_alias": True, "mode": "json"},
+        id="shared grouping",
+    ),
+]
 
 
 @pytest.mark.parametrize(
-    ("input_dir", "sample_file", "args", "dump_options"),
-    [
-        param(
-            "examples/minimal/interfaces.yang",
-            "examples/minimal/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="minimal",
-        ),
-        param(
-            "examples/with_typedef/interfaces.yang",
-            "examples/with_typedef/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="typedef",
-        ),
-        param(
-            "examples/with_leafref/interfaces.yang",
-            "examples/with_leafref/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="leafref",
-        ),
-        param(
-            "examples/with_restrictions/interfaces.yang",
-            "examples/with_restrictions/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="restrictions",
-        ),
-        param(
-            "examples/with_uses/interfaces.yang",
-            "examples/with_uses/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="uses",
-        ),
-        param(
-            "examples/with_case/interfaces.yang",
-            "examples/with_case/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="case",
-        ),
-        param(
-            "examples/with_complex_case/interfaces.yang",
-            "examples/with_complex_case/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="complex case",
-        ),
-        param(
-            "examples/turing-machine/turing-machine.yang",
-            "examples/turing-machine/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="turing machine",
-        ),
-        param(
-            "examples/with_leaflist/interfaces.yang",
-            "examples/with_leaflist/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="leaf-list",
-        ),
-        param(
-            "examples/with_union/interfaces.yang",
-            "examples/with_union/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="type union",
-        ),
-        param(
-            "examples/with_identity_default/interfaces.yang",
-            "examples/with_identity_default/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="identity default",
-        ),
-        param(
-            "examples/with_enum/interfaces.yang",
-            "examples/with_enum/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="enum",
-        ),
-        param(
-            "examples/with_decimal64/interfaces.yang",
-            "examples/with_decimal64/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="decimal64",
-        ),
-        param(
-            "examples/with_bits/interfaces.yang",
-            "examples/with_bits/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="bits",
-        ),
-        param(
-            "examples/with_leafref2/keychains.yang",
-            "examples/with_leafref2/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="leafref2",
-        ),
-        param(
-            "examples/with_identity_default_list/ciphers.yang",
-            "examples/with_identity_default_list/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="identity default list",
-        ),
-        param(
-            "examples/with_empty/interface.yang",
-            "examples/with_empty/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="empty",
-        ),
-        param(
-            "examples/with_import_uses/configuration.yang",
-            "examples/with_import_uses/sample_data.json",
-            [],
-            {"exclude_defaults": True, "mode": "json"},
-            id="with_import_uses",
-        ),
-        param(
-            "examples/with_augment/configuration.yang",
-            "examples/with_augment/sample_data.json",
-            [
-                "--deviation-module=tests/examples/with_augment/namespaces.yang",
-                "--deviation-module=tests/examples/with_augment/interfaces.yang",
-            ],
-            {"exclude_defaults": True, "mode": "json"},
-            id="with_augment",
-        ),
-    ],
+    ("input_dir", "sample_file", "args", "dump_options"), MODEL_PARAMS
 )
 def test_model(
     input_dir: str,
@@ -200,6 +181,7 @@ def test_model(
     args: List[str],
     dump_options: dict[str, Any],
     tmp_path: Path,
+    run_pydantify,
 ):
     input_folder = Path(__package__) / input_dir
     sample_data = json.loads((Path(__package__) / sample_file).read_text())
@@ -214,3 +196,154 @@ def test_model(
         **dump_options,
     )
     assert dumped_data == sample_data
+
+
+@pytest.mark.parametrize(
+    ("input_dir", "sample_file", "args", "dump_options"), MODEL_PARAMS
+)
+def test_native_model(
+    input_dir: str,
+    sample_file: str,
+    args: List[str],
+    dump_options: dict[str, Any],
+    tmp_path: Path,
+    run_pydantify,
+):
+    input_folder = Path(__package__) / input_dir
+    sample_data = json.loads((Path(__package__) / sample_file).read_text())
+    # No model classes are built, only their source code is written
+    with (
+        patch("pydantify.models.base.create_model") as base_create,
+        patch("pydantify.models.models.create_model") as models_create,
+    ):
+        run_pydantify(
+            input_file=input_folder,
+            output_folder=tmp_path,
+            args=["--native", *args],
+        )
+    base_create.assert_not_called()
+    models_create.assert_not_called()
+    module = import_from_path("out", tmp_path / "out.py")
+    model = module.Model.model_validate(sample_data)
+    dumped_data = model.model_dump(
+        **dump_options,
+    )
+    assert dumped_data == sample_data
+
+
+def import_package(name: str, directory: Path) -> ModuleType:
+    """Imports an output directory as package, for outputs using relative imports."""
+    package = import_from_path(name, directory / "__init__.py")
+    package.__path__ = [str(directory)]
+    return package
+
+
+def test_shared_types_model(tmp_path: Path, run_pydantify):
+    input_file = Path(__package__) / "examples/with_shared_types/interfaces.yang"
+    sample_data = json.loads((input_file.parent / "sample_data.json").read_text())
+    run_pydantify(input_file, tmp_path, ["--native", "--shared-types"])
+    # The output imports the type modules relative to its package
+    import_package("shared_types_out", tmp_path)
+    module = importlib.import_module("shared_types_out.out")
+    model = module.Model.model_validate(sample_data)
+    interface = model.interfaces.interface[1]
+    assert interface.speed == module.common_types.Speed("auto")
+    assert interface.mtu == 1500
+    dumped_data = model.model_dump(mode="json", by_alias=True, exclude_defaults=True)
+    assert dumped_data == sample_data
+
+
+@pytest.mark.parametrize(
+    ("input_dir", "sample_file", "args"),
+    [
+        param(
+            "examples/with_shared_grouping/interfaces.yang",
+            "examples/with_shared_grouping/sample_data.json",
+            ["--share-groupings"],
+            id="shared grouping",
+        ),
+        param(
+            "examples/with_shared_types/interfaces.yang",
+            "examples/with_shared_types/sample_data.json",
+            ["--shared-types"],
+            id="shared types",
+        ),
+    ],
+)
+def test_package_model(
+    input_dir: str, sample_file: str, args: List[str], tmp_path: Path, run_pydantify
+):
+    input_folder = Path(__package__) / input_dir
+    sample_data = json.loads((Path(__package__) / sample_file).read_text())
+    run_pydantify(input_folder, tmp_path, ["--native", "--package", *args])
+    name = tmp_path.name
+    import_package(name, tmp_path)
+    package = importlib.import_module(f"{name}.out")
+    # Submodules are only imported once one of their classes is used
+    assert not any(m.startswith(f"{name}.out.") for m in sys.modules)
+    model = package.Model.model_validate(sample_data)
+    dumped_data = model.model_dump(mode="json", by_alias=True, exclude_defaults=True)
+    assert dumped_data == sample_data
+
+
+def test_package_imports_used_submodules(tmp_path: Path, run_pydantify):
+    input_file = Path(__package__) / "examples/with_shared_grouping/interfaces.yang"
+    run_pydantify(input_file, tmp_path, ["--native", "--package", "--share-groupings"])
+    package = import_package("lazy_package_out", tmp_path / "out")
+    assert package.MonitorContainer.__module__ == "lazy_package_out.monitor"
+    loaded = sorted(m for m in sys.modules if m.startswith("lazy_package_out."))
+    assert loaded == ["lazy_package_out.monitor"]
+    # Classes of several top-level containers are shared
+    assert package.LocalContainer.__module__ == "lazy_package_out._shared"
+    assert "LocalContainer" in dir(package)
+    with pytest.raises(AttributeError):
+        package.MissingContainer
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        param(["--defer-build"], id="default"),
+        param(["--native", "--defer-build"], id="native"),
+        param(["--native", "--package", "--defer-build"], id="package"),
+    ],
+)
+def test_defer_build(args: List[str], tmp_path: Path, run_pydantify):
+    input_file = Path(__package__) / "examples/with_shared_grouping/interfaces.yang"
+    sample_data = json.loads((input_file.parent / "sample_data.json").read_text())
+    run_pydantify(input_file, tmp_path, args)
+    import_package(tmp_path.name, tmp_path)
+    module = importlib.import_module(f"{tmp_path.name}.out")
+    # Validators are built on first use, or by `warm_up()`
+    assert module.Model.__pydantic_complete__ is False
+    module.warm_up(module.Model, background=False)
+    assert module.Model.__pydantic_complete__ is True
+    thread = module.warm_up()
+    thread.join()
+    assert module.BackupContainer.__pydantic_complete__ is True
+    model = module.Model.model_validate(sample_data)
+    dumped_data = model.model_dump(mode="json", by_alias=True, exclude_defaults=True)
+    assert dumped_data == sample_data
+
+
+def test_defer_build_config_format_changed():
+    from pydantify.exceptions import CompilationError
+    from pydantify.utility.model_generator import ModelGenerator
+
+    source = (
+        "class Model(BaseModel):\n"
+        "    model_config = ConfigDict(\n"
+        "        populate_by_name=True,\n"
+        '        regex_engine="python-re",\n'
+        "    )\n"
+    )
+    assert "        defer_build=True,\n    )\n" in ModelGenerator.defer_build_config(
+        source
+    )
+    changed = source.replace('regex_engine="python-re",', "regex_engine='python-re'")
+    with pytest.raises(CompilationError, match="defer_build"):
+        ModelGenerator.defer_build_config(changed)
+    # Outputs without classes have nothing to defer
+    assert ModelGenerator.defer_build_config("from enum import Enum\n") == (
+        "from enum import Enum\n"
+    )
@@ -70,34 +70,6 @@ class ParsedAST:
         assert len(ast1.body) == len(ast2.body)
 
 
-def run_pydantify(input_file: Path, output_folder: Path, args: List[str] = []):
-    args = [
-        sys.argv[0],
-        *args,
-        f"-i={input_file.parent}",
-        f"-o={output_folder}",
-        str(input_file),
-    ]
-    with patch.object(sys, "argv", args):
-        from pydantify.main import main
-
-        try:
-            main()
-        except SystemExit as e:
-            assert e.code == 0, f"Pyang exited with errors:\n{e}"
-
-
-@pytest.fixture(autouse=True)
-def reset_optparse():
-    from pyang import plugin
-
-    from pydantify.models.base import Node
-
-    # Reset plugins. Otherwise pyang creates cross-test side-effects. TODO: Better way?
-    plugin.plugins = []
-    Node._name_count = dict()
-
-
 @pytest.mark.parametrize(
     ("input_dir", "expected_file", "args"),
     [
@@ -260,9 +232,17 @@ def reset_optparse():
             [],
             id="with_import_uses",
         ),
+        param(
+            "examples/with_shared_grouping/interfaces.yang",
+            "examples/with_shared_grouping/expected.py",
+            ["--share-groupings"],
+            id="shared grouping",
+        ),
     ],
 )
-def test_model(input_dir: str, expected_file: str, args: List[str], tmp_path: Path):
+def test_model(
+    input_dir: str, expected_file: str, args: List[str], tmp_path: Path, run_pydantify
+):
     input_folder = Path(__package__) / input_dir
     expected = Path(__package__) / expected_file
     run_pydantify(
@@ -274,164 +254,170 @@ def test_model(input_dir: str, expected_file: str, args: List[str], tmp_path: Pa
     ParsedAST.assert_python_sources_equal(tmp_path / "out.py", expected)
 
 
-@pytest.mark.parametrize(
-    ("input_dir", "expected_file", "args"),
-    [
-        param(
-            "examples/minimal/interfaces.yang",
-            "examples/minimal/expected.json",
-            ["-j"],
-            id="minimal",
-        ),
-        param(
-            "examples/minimal/interfaces.yang",
-            "examples/minimal/expected_trimmed.json",
-            ["-j", "-t=/interfaces/interfaces/address"],
-            id="minimal_trimmed",
-        ),
-        param(
-            "examples/minimal/interfaces.yang",
-            "examples/minimal/expected_trimmed.json",
-            ["-j", "-t=interfaces/interfaces/address"],
-            id="minimal_trimmed without leading /",
-        ),
-        param(
-            "examples/with_typedef/interfaces.yang",
-            "examples/with_typedef/expected.json",
-            ["-j"],
-            id="typedef",
-        ),
-        param(
-            "examples/with_leafref/interfaces.yang",
-            "examples/with_leafref/expected.json",
-            ["-j"],
-            id="leafref",
-        ),
-        param(
-            "examples/with_restrictions/interfaces.yang",
-            "examples/with_restrictions/expected.json",
-            ["-j"],
-            id="restrictions",
-        ),
-        param(
-            "examples/with_uses/interfaces.yang",
-            "examples/with_uses/expected.json",
-            ["-j"],
-            id="uses",
-        ),
-        param(
-            "examples/with_case/interfaces.yang",
-            "examples/with_case/expected.json",
-            ["-j"],
-            id="case",
-        ),
-        param(
-            "examples/with_complex_case/interfaces.yang",
-            "examples/with_complex_case/expected.json",
-            ["-j"],
-            id="complex case",
-        ),
-        param(
-            "examples/turing-machine/turing-machine.yang",
-            "examples/turing-machine/expected.json",
-            ["-j"],
-            id="turing machine",
-        ),
-        param(
-            "examples/openconfig/openconfig-interfaces.yang",
-            "examples/openconfig/expected.json",
-            [
-                "-j",
-                "-t=openconfig-interfaces/interfaces/interface/config",
-            ],
-            id="openconfig",
-        ),
-        param(
-            "examples/openconfig/openconfig-interfaces.yang",
-            "examples/openconfig/expected_config_only.json",
-            [
-                "-j",
-                "-d=config",
-            ],
-            id="openconfig_config_only",
-        ),
-        param(
-            "examples/openconfig/openconfig-interfaces.yang",
-            "examples/openconfig/expected_state_only.json",
-            [
-                "-j",
-                "-d=state",
-            ],
-            id="openconfig_state_only",
-        ),
-        param(
-            "examples/with_leaflist/interfaces.yang",
-            "examples/with_leaflist/expected.json",
-            ["-j"],
-            id="leaf-list",
-        ),
-        param(
-            "examples/with_union/interfaces.yang",
-            "examples/with_union/expected.json",
-            ["-j"],
-            id="type union",
-        ),
-        param(
-            "examples/with_identity_default/interfaces.yang",
-            "examples/with_identity_default/expected.json",
-            ["-j"],
-            id="identity default",
-        ),
-        param(
-            "examples/with_enum/interfaces.yang",
-            "examples/with_enum/expected.json",
-            ["-j"],
-            id="enum",
-        ),
-        param(
-            "examples/with_decimal64/interfaces.yang",
-            "examples/with_decimal64/expected.json",
-            ["-j"],
-            id="decimal64",
-        ),
-        param(
-            "examples/with_bits/interfaces.yang",
-            "examples/with_bits/expected.json",
-            ["-j"],
-            id="bits",
-        ),
-        param(
-            "examples/with_leafref2/keychains.yang",
-            "examples/with_leafref2/expected.json",
-            ["-j"],
-            id="leafref2",
-        ),
-        param(
-            "examples/with_identity_default_list/ciphers.yang",
-            "examples/with_identity_default_list/expected.json",
-            ["-j"],
-            id="identity default list",
-        ),
-        param(
-            "examples/with_import_uses/configuration.yang",
-            "examples/with_import_uses/expected.json",
-            ["-j"],
-            id="with_import_uses",
-        ),
-        param(
-            "examples/with_augment/configuration.yang",
-            "examples/with_augment/expected.json",
-            [
-                "-j",
-                "--deviation-module=tests/examples/with_augment/namespaces.yang",
-                "--deviation-module=tests/examples/with_augment/interfaces.yang",
-            ],
-            id="with_augment",
-        ),
-    ],
-)
+JSON_SCHEMA_PARAMS = [
+    param(
+        "examples/minimal/interfaces.yang",
+        "examples/minimal/expected.json",
+        ["-j"],
+        id="minimal",
+    ),
+    param(
+        "examples/minimal/interfaces.yang",
+        "examples/minimal/expected_trimmed.json",
+        ["-j", "-t=/interfaces/interfaces/address"],
+        id="minimal_trimmed",
+    ),
+    param(
+        "examples/minimal/interfaces.yang",
+        "examples/minimal/expected_trimmed.json",
+        ["-j", "-t=interfaces/interfaces/address"],
+        id="minimal_trimmed without leading /",
+    ),
+    param(
+        "examples/with_typedef/interfaces.yang",
+        "examples/with_typedef/expected.json",
+        ["-j"],
+        id="typedef",
+    ),
+    param(
+        "examples/with_leafref/interfaces.yang",
+        "examples/with_leafref/expected.json",
+        ["-j"],
+        id="leafref",
+    ),
+    param(
+        "examples/with_restrictions/interfaces.yang",
+        "examples/with_restrictions/expected.json",
+        ["-j"],
+        id="restrictions",
+    ),
+    param(
+        "examples/with_uses/interfaces.yang",
+        "examples/with_uses/expected.json",
+        ["-j"],
+        id="uses",
+    ),
+    param(
+        "examples/with_case/interfaces.yang",
+        "examples/with_case/expected.json",
+        ["-j"],
+        id="case",
+    ),
+    param(
+        "examples/with_complex_case/interfaces.yang",
+        "examples/with_complex_case/expected.json",
+        ["-j"],
+        id="complex case",
+    ),
+    param(
+        "examples/turing-machine/turing-machine.yang",
+        "examples/turing-machine/expected.json",
+        ["-j"],
+        id="turing machine",
+    ),
+    param(
+        "examples/openconfig/openconfig-interfaces.yang",
+        "examples/openconfig/expected.json",
+        [
+            "-j",
+            "-t=openconfig-interfaces/interfaces/interface/config",
+        ],
+        id="openconfig",
+    ),
+    param(
+        "examples/openconfig/openconfig-interfaces.yang",
+        "examples/openconfig/expected_config_only.json",
+        [
+            "-j",
+            "-d=config",
+        ],
+        id="openconfig_config_only",
+    ),
+    param(
+        "examples/openconfig/openconfig-interfaces.yang",
+        "examples/openconfig/expected_state_only.json",
+        [
+            "-j",
+            "-d=state",
+        ],
+        id="openconfig_state_only",
+    ),
+    param(
+        "examples/with_leaflist/interfaces.yang",
+        "examples/with_leaflist/expected.json",
+        ["-j"],
+        id="leaf-list",
+    ),
+    param(
+        "examples/with_union/interfaces.yang",
+        "examples/with_union/expected.json",
+        ["-j"],
+        id="type union",
+    ),
+    param(
+        "examples/with_identity_default/interfaces.yang",
+        "examples/with_identity_default/expected.json",
+        ["-j"],
+        id="identity default",
+    ),
+    param(
+        "examples/with_enum/interfaces.yang",
+        "examples/with_enum/expected.json",
+        ["-j"],
+        id="enum",
+    ),
+    param(
+        "examples/with_decimal64/interfaces.yang",
+        "examples/with_decimal64/expected.json",
+        ["-j"],
+        id="decimal64",
+    ),
+    param(
+        "examples/with_bits/interfaces.yang",
+        "examples/with_bits/expected.json",
+        ["-j"],
+        id="bits",
+    ),
+    param(
+        "examples/with_leafref2/keychains.yang",
+        "examples/with_leafref2/expected.json",
+        ["-j"],
+        id="leafref2",
+    ),
+    param(
+        "examples/with_identity_default_list/ciphers.yang",
+        "examples/with_identity_default_list/expected.json",
+        ["-j"],
+        id="identity default list",
+    ),
+    param(
+        "examples/with_import_uses/configuration.yang",
+        "examples/with_import_uses/expected.json",
+        ["-j"],
+        id="with_import_uses",
+    ),
+    param(
+        "examples/with_augment/configuration.yang",
+        "examples/with_augment/expected.json",
+        [
+            "-j",
+            "--deviation-module=tests/examples/with_augment/namespaces.yang",
+            "--deviation-module=tests/examples/with_augment/interfaces.yang",
+        ],
+        id="with_augment",
+    ),
+    param(
+        "examples/with_shared_grouping/interfaces.yang",
+        "examples/with_shared_grouping/expected.json",
+        ["-j", "--share-groupings"],
+        id="shared grouping",
+    ),
+]
+
+
+@pytest.mark.parametrize(("input_dir", "expected_file", "args"), JSON_SCHEMA_PARAMS)
 def test_json_schema(
-    input_dir: str, expected_file: str, args: List[str], tmp_path: Path
+    input_dir: str, expected_file: str, args: List[str], tmp_path: Path, run_pydantify
 ):
     input_folder = Path(__package__) / input_dir
     expected = Path(__package__) / expected_file
@@ -444,3 +430,132 @@ def test_json_schema(
     expected_json = json.loads(Path(expected).read_text())
     tmp_json = json.loads(Path(tmp_path / "out.json").read_text())
     assert tmp_json == expected_json
+
+
+@pytest.mark.parametrize(("input_dir", "expected_file", "args"), JSON_SCHEMA_PARAMS)
+def test_native_json_schema(
+    input_dir: str, expected_file: str, args: List[str], tmp_path: Path, run_pydantify
+):
+    input_folder = Path(__package__) / input_dir
+    expected = Path(__package__) / expected_file
+    # No model classes are built, the schema is written straight from the nodes
+    with (
+        patch("pydantify.models.base.create_model") as base_create,
+        patch("pydantify.models.models.create_model") as models_create,
+    ):
+        run_pydantify(
+            input_file=input_folder,
+            output_folder=tmp_path,
+            args=["--native", *args],
+        )
+    base_create.assert_not_called()
+    models_create.assert_not_called()
+    expected_json = json.loads(Path(expected).read_text())
+    tmp_json = json.loads(Path(tmp_path / "out.json").read_text())
+    assert tmp_json == expected_json
+
+
+def test_native_json_schema_is_identical(tmp_path: Path, run_pydantify):
+    input_file = Path(__package__) / "examples/openconfig/openconfig-interfaces.yang"
+    run_pydantify(input_file, tmp_path / "default", ["-j"])
+    from pyang import plugin
+
+    from pydantify.models.base import Node
+
+    # Second run in the same test, reset global state in between.
+    plugin.plugins = []
+    Node._name_count = dict()
+    run_pydantify(input_file, tmp_path / "native", ["-j", "--native"])
+    default_output = (tmp_path / "default" / "out.json").read_text()
+    native_output = (tmp_path / "native" / "out.json").read_text()
+    assert native_output == default_output
+
+
+def test_shared_types(tmp_path: Path, run_pydantify):
+    input_file = Path(__package__) / "examples/with_shared_types/interfaces.yang"
+    expected_dir = input_file.parent
+    run_pydantify(input_file, tmp_path, ["--native", "--shared-types"])
+    ParsedAST.assert_python_sources_equal(
+        tmp_path / "out.py", expected_dir / "expected.py"
+    )
+    modules = sorted(p.name for p in (tmp_path / "yang_types").glob("*_types.py"))
+    assert modules == ["common_types.py", "link_types.py"]
+    for module in modules:
+        ParsedAST.assert_python_sources_equal(
+            tmp_path / "yang_types" / module, expected_dir / "expected_types" / module
+        )
+
+
+@pytest.mark.parametrize(
+    "args", [param([], id="default"), param(["--native"], id="native")]
+)
+def test_variants(args: List[str], tmp_path: Path, run_pydantify):
+    input_file = Path(__package__) / "examples/openconfig/openconfig-interfaces.yang"
+    expected_dir = input_file.parent
+    run_pydantify(
+        input_file,
+        tmp_path,
+        [*args, "--variants=full,config,state", "--formats=py,json"],
+    )
+    assert sorted(p.name for p in tmp_path.glob("out*")) == [
+        "out.json",
+        "out.py",
+        "out_config.json",
+        "out_config.py",
+        "out_state.json",
+        "out_state.py",
+    ]
+    for variant in ("config", "state"):
+        expected = expected_dir / f"expected_{variant}_only"
+        output = tmp_path / f"out_{variant}"
+        tmp_json = json.loads(output.with_suffix(".json").read_text())
+        assert tmp_json == json.loads(expected.with_suffix(".json").read_text())
+        if not args:
+            ParsedAST.assert_python_sources_equal(
+                output.with_suffix(".py"), expected.with_suffix(".py")
+            )
+
+    # The full variant matches a separate run
+    from pyang import plugin
+
+    from pydantify.models.base import Node
+
+    plugin.plugins = []
+    Node._name_count = dict()
+    run_pydantify(input_file, tmp_path / "single", [*args, "-j"])
+    single_output = (tmp_path / "single" / "out.json").read_text()
+    assert (tmp_path / "out.json").read_text() == single_output
+
+
+def test_variants_exclude_data_type(tmp_path: Path):
+    input_file = Path(__package__) / "examples/openconfig/openconfig-interfaces.yang"
+    args = [sys.argv[0], "--variants=config", "-d=state", f"-o={tmp_path}"]
+    with patch.object(sys, "argv", [*args, str(input_file)]):
+        from pydantify.main import parse_cli_arguments
+
+        with pytest.raises(SystemExit) as e:
+            parse_cli_arguments()
+    assert e.value.code == 2
+
+
+@pytest.mark.parametrize(
+    ("data_type", "excluded"), [("config", "state"), ("state", "config")]
+)
+def test_data_type_skips_excluded_nodes(
+    data_type: str, excluded: str, tmp_path: Path, run_pydantify
+):
+    input_file = Path(__package__) / "examples/openconfig/openconfig-interfaces.yang"
+    from pydantify.models.base import Node
+
+    built: List[str] = []
+    init = Node.__init__
+
+    def record(self, stm):
+        built.append(f"{stm.keyword} {stm.arg}")
+        init(self, stm)
+
+    with patch.object(Node, "__init__", record):
+        run_pydantify(input_file, tmp_path, [f"-d={data_type}"])
+    assert "container interfaces" in built
+    # The containers of the other data type are never turned into nodes
+    assert f"container {excluded}" not in built
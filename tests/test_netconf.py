@@ -0,0 +1,247 @@
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+import pytest
+from lxml import etree
+from pytest import param
+
+import pydantify
+from pydantify.utility.netconf import (
+    NETCONF_CONFIG,
+    model_dump_xml,
+    model_dump_xml_string,
+    model_validate_xml,
+    model_write_xml,
+)
+
+CONFIG = '<config xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
+
+
+@pytest.mark.parametrize(
+    ("input_file", "deviations", "expected"),
+    [
+        param(
+            "with_leaflist/interfaces.yang",
+            [],
+            CONFIG
+            + '<if:interfaces xmlns:if="http://ultraconfig.com.au/ns/yang/ultraconfig-interfaces">'
+            + "<if:name>GigabitEthernet 0/0/0</if:name>"
+            + "<if:ip>10.10.10.1</if:ip><if:ip>10.10.10.2</if:ip>"
+            + "</if:interfaces>"
+            + '<if:interfaces xmlns:if="http://ultraconfig.com.au/ns/yang/ultraconfig-interfaces">'
+            + "<if:name>GigabitEthernet 0/0/1</if:name><if:ip>192.168.1.1</if:ip>"
+            + "<if:tagged>10</if:tagged><if:tagged>12</if:tagged><if:tagged>13</if:tagged>"
+            + "<if:untagged>14</if:untagged>"
+            + "</if:interfaces></config>",
+            id="leaf-list",
+        ),
+        param(
+            "with_augment/configuration.yang",
+            ["with_augment/namespaces.yang", "with_augment/interfaces.yang"],
+            CONFIG
+            + "<configuration:configuration"
+            + ' xmlns:configuration="http://pydantify.github.io/ns/yang/pydantify-multimodel-configuration">'
+            + "<configuration:devicename>test</configuration:devicename>"
+            + '<ns:namespaces xmlns:ns="http://pydantify.github.io/ns/yang/pydantify-multimodel-namespaces">'
+            + "<ns:name>ns1</ns:name>"
+            + '<if:interfaces xmlns:if="http://pydantify.github.io/ns/yang/pydantify-multimodel-interfaces">'
+            + "<if:name>Eth1</if:name><if:ip>::1</if:ip></if:interfaces>"
+            + '<if:interfaces xmlns:if="http://pydantify.github.io/ns/yang/pydantify-multimodel-interfaces">'
+            + "<if:name>Eth2</if:name></if:interfaces>"
+            + "</ns:namespaces></configuration:configuration></config>",
+            id="augment",
+        ),
+        param(
+            "with_empty/interface.yang",
+            [],
+            CONFIG
+            + '<if:interface xmlns:if="http://ultraconfig.com.au/ns/yang/ultraconfig-interface">'
+            + "<if:primary></if:primary></if:interface></config>",
+            id="empty",
+        ),
+        param(
+            "with_enum/interfaces.yang",
+            [],
+            CONFIG
+            + '<if:interfaces xmlns:if="http://ultraconfig.com.au/ns/yang/ultraconfig-interfaces">'
+            + "<if:name>GigabitEthernet 0/0/0</if:name><if:admin-state>disable</if:admin-state>"
+            + "</if:interfaces>"
+            + '<if:interfaces xmlns:if="http://ultraconfig.com.au/ns/yang/ultraconfig-interfaces">'
+            + "<if:name>GigabitEthernet 0/0/1</if:name></if:interfaces></config>",
+            id="enum",
+        ),
+    ],
+)
+def test_model_dump_xml_string(
+    input_file: str, deviations: List[str], expected: str, load_sample
+):
+    model = load_sample(input_file, deviations)
+    assert model_dump_xml_string(model, root=NETCONF_CONFIG) == expected
+
+
+def test_model_write_xml_file(tmp_path: Path, load_sample):
+    model = load_sample("turing-machine/turing-machine.yang")
+    model_write_xml(model, str(tmp_path / "config.xml"))
+    with open(tmp_path / "stream.xml", "wb") as output:
+        model_write_xml(model, output)
+    expected = model_dump_xml_string(model)
+    assert (tmp_path / "config.xml").read_text() == expected
+    assert (tmp_path / "stream.xml").read_text() == expected
+    assert expected.startswith(
+        '<tm:turing-machine xmlns:tm="http://example.net/turing-machine">'
+    )
+
+
+def test_model_dump_xml_single_top_level_node(load_sample):
+    model = load_sample("with_leaflist/interfaces.yang")
+    with pytest.raises(ValueError, match="2 top-level nodes"):
+        model_dump_xml(model)
+    element = model_dump_xml(model, root=NETCONF_CONFIG)
+    assert [len(e.findall("{*}ip")) for e in element] == [2, 1]
+
+
+@pytest.mark.parametrize(
+    ("input_file", "deviations"),
+    [
+        param("with_leaflist/interfaces.yang", [], id="leaf-list"),
+        param(
+            "with_augment/configuration.yang",
+            ["with_augment/namespaces.yang", "with_augment/interfaces.yang"],
+            id="augment",
+        ),
+        param("with_empty/interface.yang", [], id="empty"),
+        param("with_enum/interfaces.yang", [], id="enum"),
+        param("turing-machine/turing-machine.yang", [], id="turing machine"),
+    ],
+)
+def test_model_validate_xml(
+    input_file: str, deviations: List[str], tmp_path: Path, load_sample
+):
+    model = load_sample(input_file, deviations)
+    data = model_dump_xml_string(model, root="data")
+    reply = (
+        '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">'
+        + data
+        + "</rpc-reply>"
+    )
+    assert model_validate_xml(type(model), reply.encode()) == model
+    (tmp_path / "reply.xml").write_text(reply)
+    assert model_validate_xml(type(model), str(tmp_path / "reply.xml")) == model
+
+
+def test_model_validate_xml_skips_unknown_nodes(load_sample):
+    model = load_sample("with_leaflist/interfaces.yang")
+    namespace = "http://ultraconfig.com.au/ns/yang/ultraconfig-interfaces"
+    reply = (
+        "<data>"
+        + f'<interfaces xmlns="{namespace}">'
+        + "<name>GigabitEthernet 0/0/0</name><ip>10.10.10.1</ip>"
+        + "<counters><in>1</in></counters>"
+        + '<ip xmlns="urn:other">10.10.10.3</ip>'
+        + "<ip>10.10.10.2</ip>"
+        + "</interfaces>"
+        + '<system xmlns="urn:other"><interfaces>x</interfaces></system>'
+        + "</data>"
+    )
+    parsed = model_validate_xml(type(model), reply.encode())
+    assert parsed == type(model).model_validate(
+        {
+            "interfaces": [
+                {"name": "GigabitEthernet 0/0/0", "ip": ["10.10.10.1", "10.10.10.2"]}
+            ]
+        }
+    )
+
+
+def test_model_validate_xml_limits_depth(load_sample):
+    model = load_sample("with_leaflist/interfaces.yang")
+    namespace = "http://ultraconfig.com.au/ns/yang/ultraconfig-interfaces"
+    reply = (
+        f'<data><interfaces xmlns="{namespace}"><name>eth0</name>'
+        + "<a>" * 300
+        + "</a>" * 300
+        + "</interfaces></data>"
+    )
+    with pytest.raises(etree.XMLSyntaxError):
+        model_validate_xml(type(model), reply.encode())
+    parsed = model_validate_xml(type(model), reply.encode(), huge_tree=True)
+    assert parsed == type(model).model_validate({"interfaces": [{"name": "eth0"}]})
+
+
+ROUTING_YANG = """module routing {
+  namespace "urn:routing";
+  prefix rt;
+  container routing {
+    list route {
+      key "destination";
+      leaf next-hop { type string; }
+      leaf destination { type string; }
+      choice target {
+        case interface { leaf interface { type string; } }
+        case blackhole { leaf blackhole { type empty; } }
+      }
+    }
+  }
+}
+"""
+ROUTING_TAGS_YANG = """module routing-tags {
+  namespace "urn:routing-tags";
+  prefix tag;
+  import routing { prefix rt; }
+  augment "/rt:routing/rt:route" { leaf tag { type uint32; } }
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "native", [param(False, id="default"), param(True, id="native")]
+)
+def test_serialization_plans(native: bool, tmp_path: Path):
+    (tmp_path / "routing.yang").write_text(ROUTING_YANG)
+    (tmp_path / "routing-tags.yang").write_text(ROUTING_TAGS_YANG)
+    module = ModuleType(f"netconf_routing_{native}")
+    sys.modules[module.__name__] = module
+    source = pydantify.compile(
+        tmp_path / "routing.yang",
+        deviations=[tmp_path / "routing-tags.yang"],
+        serialization_plans=True,
+        native=native,
+    )
+    exec(source, module.__dict__)
+    assert module.RouteListEntry.serialization_plan[0] == [
+        "routing:destination",
+        "urn:routing",
+        "rt",
+        "leaf",
+    ]
+    model = module.Model.model_validate(
+        {
+            "routing:routing": {
+                "routing:route": [
+                    {
+                        "routing:next-hop": "10.0.0.1",
+                        "routing:destination": "10.1.0.0/16",
+                        "routing-tags:tag": 7,
+                        "routing:target": {"routing:interface": "eth0"},
+                    },
+                    {
+                        "routing:destination": "10.2.0.0/16",
+                        "routing:target": {"routing:blackhole": [None]},
+                    },
+                ]
+            }
+        }
+    )
+    xml = model_dump_xml_string(model)
+    assert xml == (
+        '<rt:routing xmlns:rt="urn:routing"><rt:route>'
+        + "<rt:destination>10.1.0.0/16</rt:destination><rt:next-hop>10.0.0.1</rt:next-hop>"
+        + "<rt:interface>eth0</rt:interface>"
+        + '<tag:tag xmlns:tag="urn:routing-tags">7</tag:tag>'
+        + "</rt:route><rt:route>"
+        + "<rt:destination>10.2.0.0/16</rt:destination><rt:blackhole></rt:blackhole>"
+        + "</rt:route></rt:routing>"
+    )
+    assert model_validate_xml(module.Model, xml.encode()) == model
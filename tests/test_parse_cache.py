@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pydantify.utility.parse_cache import ParseCache
+
+
+@pytest.mark.parametrize(
+    ("input_file", "args"),
+    [
+        pytest.param(
+            "examples/openconfig/openconfig-interfaces.yang",
+            ["-t=openconfig-interfaces/interfaces/interface/config"],
+            id="openconfig",
+        ),
+        pytest.param(
+            "examples/with_augment/configuration.yang",
+            [
+                "--deviation-module=tests/examples/with_augment/namespaces.yang",
+                "--deviation-module=tests/examples/with_augment/interfaces.yang",
+            ],
+            id="with_augment",
+        ),
+    ],
+)
+def test_cached_parse_trees(
+    input_file: str, args: List[str], tmp_path: Path, run_pydantify
+):
+    input_path = Path(__package__) / input_file
+    cache_dir = tmp_path / "cache"
+
+    run_pydantify(input_path, tmp_path / "uncached", args)
+    # JSON output bypasses the build cache of the Python output, but shares parsed modules.
+    run_pydantify(input_path, tmp_path / "cold", [*args, f"--cache-dir={cache_dir}"])
+    assert ParseCache.misses > 0
+    run_pydantify(
+        input_path, tmp_path / "warm", [*args, "-j", f"--cache-dir={cache_dir}"]
+    )
+    assert ParseCache.misses == 0 and ParseCache.hits > 0
+    run_pydantify(input_path, tmp_path / "warm", [*args, f"--cache-dir={cache_dir}"])
+
+    expected = (tmp_path / "uncached" / "out.py").read_text()
+    assert (tmp_path / "cold" / "out.py").read_text() == expected
+    assert (tmp_path / "warm" / "out.py").read_text() == expected
+
+
+def test_parser_is_restored(tmp_path: Path, run_pydantify):
+    from pyang import yang_parser
+
+    original = yang_parser.YangParser
+    run_pydantify(
+        Path(__package__) / "examples/minimal/interfaces.yang",
+        tmp_path,
+        [f"--cache-dir={tmp_path / 'cache'}"],
+    )
+    assert yang_parser.YangParser is original
+
+
+def test_memory_keeps_newest_tree_per_file(tmp_path: Path, monkeypatch):
+    import pydantify
+
+    monkeypatch.setattr(ParseCache, "keep_in_memory", True)
+    module = tmp_path / "edited.yang"
+    memory = ParseCache._ParseCache__memory  # type: ignore[attr-defined]
+    for leaf in ["a", "b", "c", "a"]:
+        module.write_text(
+            "module edited {\n"
+            "  namespace 'urn:edited';\n"
+            "  prefix e;\n"
+            f"  leaf {leaf} {{ type string; }}\n"
+            "}\n"
+        )
+        assert f"{leaf}: Annotated" in pydantify.compile(module)
+        assert [ref for ref in memory if ref.endswith("edited.yang")] == [str(module)]
+    assert ParseCache.misses == 1
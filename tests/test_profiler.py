@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+from pytest import param
+
+from pydantify.utility.profiler import Profiler
+
+EXAMPLES = Path(__package__) / "examples"
+
+
+@pytest.fixture(autouse=True)
+def reset_profiler():
+    yield
+    Profiler.stop()
+    Profiler.output_file = None
+    Profiler.memory_report_file = None
+
+
+@pytest.mark.parametrize(
+    "args, phases",
+    [
+        param(
+            [],
+            ["create_model", "datamodel-code-generator", "format", "helper code"],
+            id="pydantic",
+        ),
+        param(["-j"], ["create_model", "json schema"], id="json-schema"),
+        param(["--native"], ["native emit", "helper code"], id="native"),
+        param(["-t=openconfig-interfaces/interfaces"], ["trim"], id="trimmed"),
+    ],
+)
+def test_profile(tmp_path: Path, args: List[str], phases: List[str], run_pydantify):
+    profile = tmp_path / "profile.json"
+    input_file = EXAMPLES / "openconfig/openconfig-interfaces.yang"
+    run_pydantify(input_file, tmp_path, [f"--profile={profile}", *args])
+
+    report = json.loads(profile.read_text())
+    common = ["startup", "imports", "cli", "pyang parse", "pyang validate"]
+    assert set([*common, "node tree", "generate", *phases]) <= report["phases"].keys()
+    assert "statements" not in report
+    assert report["total"] >= report["phases"]["generate"]["total"]
+
+    trace = json.loads((tmp_path / "profile.trace.json").read_text())
+    assert {e["ph"] for e in trace["traceEvents"]} == {"X"}
+    assert {e["name"] for e in trace["traceEvents"]} == report["phases"].keys()
+
+
+def test_profile_statements(tmp_path: Path, run_pydantify):
+    profile = tmp_path / "profile.json"
+    input_file = EXAMPLES / "openconfig/openconfig-interfaces.yang"
+    run_pydantify(
+        input_file, tmp_path, [f"--profile={profile}", "--profile-statements"]
+    )
+
+    report = json.loads(profile.read_text())
+    assert {"container", "list", "leaf"} <= report["statements"].keys()
+    # Statements are nested in the node tree phase
+    node_tree = report["phases"]["node tree"]
+    assert node_tree["self"] < node_tree["total"]
+
+
+def test_memory_report(tmp_path: Path, run_pydantify):
+    report_file = tmp_path / "memory.json"
+    input_file = EXAMPLES / "openconfig/openconfig-interfaces.yang"
+    run_pydantify(input_file, tmp_path, [f"--memory-report={report_file}"])
+    assert not (tmp_path / "memory.trace.json").exists()
+
+    report = json.loads(report_file.read_text())
+    for phase in ("pyang parse", "pyang validate", "create_model", "generate"):
+        assert report["phases"][phase]["peak"] > 0
+        assert "retained" in report["phases"][phase]
+    assert report["peak"] == max(p.get("peak", 0) for p in report["phases"].values())
+    assert report["containers"].keys() == {"interfaces"}
+    assert report["containers"]["interfaces"]["retained"] > 0
+
+
+def test_memory_peaks():
+    Profiler.start(memory=True)
+    with Profiler.phase("outer"):
+        with Profiler.phase("inner"):
+            data = bytearray(10_000_000)
+            del data
+        kept = bytearray(1_000_000)
+    del kept
+
+    phases = Profiler.report()["phases"]
+    assert phases["inner"]["peak"] >= 10_000_000
+    assert abs(phases["inner"]["retained"]) < 100_000
+    # The peak of nested phases counts for the enclosing phase too
+    assert phases["outer"]["peak"] >= 10_000_000
+    assert phases["outer"]["retained"] >= 1_000_000
+
+
+def test_report():
+    Profiler.start(origin=0)
+    Profiler.record("outer", 0, 100)
+    Profiler.record("inner", 10, 40)
+    Profiler.record("inner", 50, 60)
+    Profiler.record("outer", 60, 70)  # Nested call of the same phase
+    Profiler.record("after", 100, 150)
+
+    phases = Profiler.report()["phases"]
+    assert phases["outer"] == {"calls": 2, "total": 100e-9, "self": 60e-9}
+    assert phases["inner"] == {"calls": 2, "total": 40e-9, "self": 40e-9}
+    assert phases["after"]["self"] == 50e-9
+    assert Profiler.report()["total"] == 150e-9
+
+
+def test_disabled():
+    with Profiler.phase("phase"):
+        pass
+    Profiler.start()
+    assert Profiler.report() == {"total": 0.0, "phases": {}}
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+import pytest
+import requests
+
+from pydantify.utility import RestconfClient, RestconfJob, RestconfRequest
+
+
+class RestconfHandler(BaseHTTPRequestHandler):
+    """Stands in for a device: records the requests and answers 204, or 503 while asked to."""
+
+    protocol_version = "HTTP/1.1"
+    server: "RestconfServer"
+
+    def reply(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests.append(
+                (self.command, self.path, body, self.client_address[1])
+            )
+            failures = self.server.failures.get(self.path, 0)
+            self.server.failures[self.path] = max(failures - 1, 0)
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(
+                self.server.max_in_flight, self.server.in_flight
+            )
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        if failures:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+        elif self.command == "GET":
+            payload = b'{"ietf-restconf:data": {}}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/yang-data+json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        else:
+            self.send_response(204)
+        self.end_headers()
+
+    do_GET = do_PUT = do_POST = do_PATCH = do_DELETE = reply
+
+    def log_message(self, *_):
+        pass
+
+
+class RestconfServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RestconfHandler)
+        self.lock = threading.Lock()
+        self.requests: List[Tuple[str, str, bytes, int]] = []
+        self.failures: Dict[str, int] = dict()
+        """Number of times each path answers 503 before succeeding."""
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/restconf/data"
+
+
+@pytest.fixture
+def servers():
+    servers = [RestconfServer() for _ in range(3)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def server(servers: List[RestconfServer]):
+    return servers[0]
+
+
+def test_client_methods(server: RestconfServer, load_sample):
+    model = load_sample("with_leaflist/interfaces.yang")
+    with RestconfClient(("user", "pw"), backoff=0) as client:
+        assert client.session.verify is True
+        assert client.get(server.url).json() == {"ietf-restconf:data": {}}
+        for send in (client.put, client.post, client.patch):
+            assert send(f"{server.url}/interfaces", model).status_code == 204
+        assert client.delete(f"{server.url}/interfaces").status_code == 204
+    assert [r[0] for r in server.requests] == ["GET", "PUT", "POST", "PATCH", "DELETE"]
+    payload = model.model_dump_json(exclude_defaults=True, by_alias=True).encode()
+    assert {r[2] for r in server.requests[1:4]} == {payload}
+    assert len({r[3] for r in server.requests}) == 1, "connection not reused"
+
+
+def test_client_retries(server: RestconfServer):
+    server.failures = {"/restconf/data/a": 2, "/restconf/data/b": 5}
+    with RestconfClient(retries=3, backoff=0) as client:
+        assert client.patch(f"{server.url}/a", "{}").status_code == 204
+        assert client.patch(f"{server.url}/b", "{}").status_code == 503
+        server.failures = {"/restconf/data/c": 1}
+        assert client.post(f"{server.url}/c", "{}").status_code == 503
+    assert [r[1][15:] for r in server.requests] == ["a"] * 3 + ["b"] * 4 + ["c"]
+
+
+def test_client_map(server: RestconfServer):
+    server.failures = {"/restconf/data/3": 1}
+    requests_sent = (
+        RestconfRequest("PATCH", f"{server.url}/{i}", '{"i": %d}' % i)
+        for i in range(50)
+    )
+    unreachable = ("GET", "http://127.0.0.1:1/restconf/data")
+    with RestconfClient(workers=4, connections_per_host=2, backoff=0) as client:
+        results = list(client.map([*requests_sent, unreachable]))
+    assert len(results) == 51
+    failed = [r for r in results if r.error]
+    assert [r.request for r in failed] == [RestconfRequest(*unreachable)]
+    assert isinstance(failed[0].error, requests.ConnectionError)
+    assert {r.response.status_code for r in results if r.response is not None} == {204}
+    assert len(server.requests) == 51
+    assert len({r[3] for r in server.requests}) <= 2
+
+
+@pytest.mark.parametrize(
+    ("devices", "concurrency", "per_device", "expected"),
+    [(3, 16, 2, [2, 2, 2]), (1, 3, 8, [3, 0, 0])],
+    ids=["per device", "global"],
+)
+def test_client_push(
+    servers: List[RestconfServer],
+    devices: int,
+    concurrency: int,
+    per_device: int,
+    expected: List[int],
+    load_sample,
+):
+    model = load_sample("with_leaflist/interfaces.yang")
+    urls = [s.url.removesuffix("/restconf/data") for s in servers[:devices]]
+    jobs = [RestconfJob(u, "interfaces:interfaces", model) for u in urls * 8]
+    jobs.append(RestconfJob("http://127.0.0.1:1", "interfaces:interfaces", model))
+    for server in servers:
+        server.delay = 0.02
+
+    async def push():
+        with RestconfClient(workers=16, backoff=0) as client:
+            push = client.push(jobs, concurrency=concurrency, per_device=per_device)
+            return [result async for result in push]
+
+    results = asyncio.run(push())
+    assert len(results) == len(jobs)
+    assert [r.job for r in results if r.error] == jobs[-1:]
+    assert {r.response.status_code for r in results if r.response is not None} == {204}
+    assert [s.max_in_flight for s in servers] == expected
+    assert servers[0].requests[0][1] == "/restconf/data/interfaces:interfaces"
@@ -0,0 +1,83 @@
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import pydantify
+from pydantify.watch import Watcher, WatchTarget
+
+EXAMPLES = Path(__package__) / "examples"
+
+
+@pytest.fixture(autouse=True)
+def reset_watcher():
+    yield
+    Watcher.targets = []
+
+
+@pytest.fixture
+def catalog(tmp_path: Path) -> Path:
+    directory = tmp_path / "yang"
+    shutil.copytree(EXAMPLES / "openconfig", directory)
+    return directory
+
+
+def touch(file: Path):
+    """Edits a YANG file without changing its meaning."""
+    file.write_text(file.read_text() + "\n// edited\n")
+
+
+def test_watch_cli(catalog: Path, tmp_path: Path, run_pydantify):
+    input_file = catalog / "openconfig-interfaces.yang"
+    # Stop watching right after the first build
+    with patch("pydantify.watch.time.sleep", side_effect=KeyboardInterrupt):
+        run_pydantify(input_file, tmp_path / "out", ["--watch", "-j"])
+
+    assert len(Watcher.targets) == 1
+    output = json.loads((tmp_path / "out" / "out.json").read_text())
+    assert output == pydantify.compile(input_file, json_schema=True)
+    sources = Watcher.targets[0].sources.keys()
+    assert input_file in sources
+    assert catalog / "openconfig-types.yang" in sources
+
+
+def test_watch_rebuilds_dependents_only(catalog: Path, tmp_path: Path):
+    Watcher.targets = [
+        WatchTarget(
+            input_file=catalog / f"{module}.yang",
+            output_file=tmp_path / f"{module}.py",
+            options=dict(native=True),
+        )
+        for module in ("openconfig-interfaces", "ietf-interfaces")
+    ]
+    Watcher.build(Watcher.targets)
+    assert Watcher.poll() == []
+
+    # Only imported by openconfig-interfaces
+    touch(catalog / "openconfig-types.yang")
+    assert [t.output_file.name for t in Watcher.poll()] == ["openconfig-interfaces.py"]
+    assert Watcher.poll() == []
+
+    # Imported (transitively) by both
+    touch(catalog / "ietf-yang-types.yang")
+    assert len(Watcher.poll()) == 2
+
+
+def test_watch_recovers_from_errors(catalog: Path, tmp_path: Path):
+    input_file = catalog / "ietf-interfaces.yang"
+    output_file = tmp_path / "out.py"
+    Watcher.targets = [WatchTarget(input_file=input_file, output_file=output_file)]
+    Watcher.build(Watcher.targets)
+    expected = output_file.read_text()
+
+    text = input_file.read_text()
+    input_file.write_text(text.replace("container interfaces {", "container {", 1))
+    assert Watcher.build(Watcher.targets) == 1
+    assert Watcher.poll() == []
+
+    input_file.write_text(text)
+    output_file.unlink()
+    assert len(Watcher.poll()) == 1
+    assert output_file.read_text() == expected